@@ -1,90 +1,908 @@
-from flask import Flask, request, jsonify, session
+from flask import Flask, request, jsonify, session, Response, g, has_request_context
+from flask.sessions import SessionInterface, SessionMixin
+from flask.json.provider import JSONProvider
+from werkzeug.datastructures import CallbackDict
+from itsdangerous import Signer, BadSignature
 from flask_cors import CORS
 import redis
 import mysql.connector
-import json
-from datetime import datetime
+from mysql.connector import errorcode
+import hashlib
+import base64
+import uuid
+from datetime import datetime, timedelta
 import os
-from kafka import KafkaProducer, KafkaConsumer
+from kafka import KafkaProducer, KafkaConsumer, TopicPartition
 from functools import wraps
-from werkzeug.security import generate_password_hash, check_password_hash
-from threading import Thread
+from serialization import dumps, dumps_bytes, loads, encode_cache_value, decode_cache_value
+from password_hashing import (
+    hash_password, verify_and_rehash, password_pool, PasswordHashBusy
+)
+from threading import Thread, Condition, Lock
+from queue import Queue, Full
+import atexit
+from collections import deque, OrderedDict
+import time
+from contextlib import nullcontext
+
+try:
+    from prometheus_client import (
+        Histogram, Counter, CollectorRegistry, REGISTRY, generate_latest, multiprocess, CONTENT_TYPE_LATEST
+    )
+except ImportError:  # prometheus_client 미설치 시 /metrics 비활성화
+    Histogram = None
+
+class FastJSONProvider(JSONProvider):
+    """jsonify 도 serialization 계층(orjson/표준 json)을 사용"""
+    def dumps(self, obj, **kwargs):
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        return loads(s)
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app, supports_credentials=True)  # 세션을 위한 credentials 지원
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'your-secret-key-here')  # 세션을 위한 시크릿 키
 
 # # 스레드 풀 생성
 # thread_pool = ThreadPoolExecutor(max_workers=5)
 
-# MariaDB 연결 함수
-def get_db_connection():
-    return mysql.connector.connect(
-        host=os.getenv('MYSQL_HOST', 'my-mariadb'),
-        user=os.getenv('MYSQL_USER', 'testuser'),
-        password=os.getenv('MYSQL_PASSWORD'),
+# 요청/구간별 지연시간 계측 - /metrics (Prometheus 텍스트 형식) 와 Server-Timing 응답 헤더
+# 둘 다 끄면 timed() 가 공용 no-op 컨텍스트를 돌려주므로 계측 비용이 거의 없음
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1' and Histogram is not None
+SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', '0') == '1'
+TIMING_ENABLED = METRICS_ENABLED or SERVER_TIMING_ENABLED
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+if METRICS_ENABLED:
+    REQUEST_LATENCY = Histogram(
+        'http_request_duration_seconds', 'HTTP 요청 처리 시간',
+        ['route', 'method', 'status'], buckets=LATENCY_BUCKETS)
+    STAGE_LATENCY = Histogram(
+        'app_stage_duration_seconds', '요청 내 구간별 처리 시간 (db_connect, db_query, redis, kafka_enqueue)',
+        ['stage'], buckets=LATENCY_BUCKETS)
+    CACHE_EVENTS = Counter('app_cache_events_total', '캐시 적중/미스 및 Redis 이벤트 수', ['event'])
+
+_NOOP_TIMER = nullcontext()
+
+class StageTimer:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record_stage(self.stage, time.perf_counter() - self.start)
+
+def timed(stage):
+    """with timed('db_query'): ... 로 구간 시간 기록"""
+    return StageTimer(stage) if TIMING_ENABLED else _NOOP_TIMER
+
+def record_stage(stage, elapsed):
+    if METRICS_ENABLED:
+        STAGE_LATENCY.labels(stage).observe(elapsed)
+    if SERVER_TIMING_ENABLED and has_request_context():
+        timings = g.setdefault('stage_timings', {})
+        total, count = timings.get(stage, (0.0, 0))
+        timings[stage] = (total + elapsed, count + 1)
+
+@app.before_request
+def start_request_timer():
+    if TIMING_ENABLED:
+        g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_timing(response):
+    start = g.get('request_start')
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    if METRICS_ENABLED:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_LATENCY.labels(route, request.method, str(response.status_code)).observe(elapsed)
+    if SERVER_TIMING_ENABLED:
+        parts = [f'{stage};dur={total * 1000:.2f};desc="{count}x"'
+                 for stage, (total, count) in g.get('stage_timings', {}).items()]
+        parts.append(f"total;dur={elapsed * 1000:.2f}")
+        response.headers['Server-Timing'] = ', '.join(parts)
+    return response
+
+# MariaDB 커넥션 풀
+class PoolTimeoutError(Exception):
+    """풀에서 대기 시간 내에 커넥션을 얻지 못한 경우"""
+    pass
+
+class PooledConnection:
+    """풀에서 빌려온 커넥션 래퍼 - close() 시 실제로 닫지 않고 풀에 반환"""
+    def __init__(self, pool, conn, created_at):
+        self._pool = pool
+        self._conn = conn
+        self._created_at = created_at
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._conn.cursor(*args, **kwargs)
+        return TimedCursor(cursor) if TIMING_ENABLED else cursor
+
+    def close(self, discard=False):
+        if self._conn is not None:
+            self._pool.release(self._conn, self._created_at, discard=discard)
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 연결 자체가 끊긴 오류라면 풀에 되돌리지 않고 폐기
+        discard = exc_type is not None and issubclass(
+            exc_type, (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError))
+        self.close(discard=discard)
+        return False
+
+class TimedCursor:
+    """쿼리 실행/결과 읽기 시간을 db_query 구간으로 기록하는 커서 래퍼"""
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, *args, **kwargs):
+        with timed('db_query'):
+            return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        with timed('db_query'):
+            return self._cursor.executemany(*args, **kwargs)
+
+    def fetchone(self):
+        with timed('db_query'):
+            return self._cursor.fetchone()
+
+    def fetchmany(self, *args, **kwargs):
+        with timed('db_query'):
+            return self._cursor.fetchmany(*args, **kwargs)
+
+    def fetchall(self):
+        with timed('db_query'):
+            return self._cursor.fetchall()
+
+class DBConnectionPool:
+    """크기 제한이 있는 스레드 안전 MariaDB 커넥션 풀"""
+    def __init__(self, size=10, timeout=5.0, recycle=3600, ping_interval=10, **connect_args):
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_interval = ping_interval
+        self._connect_args = connect_args
+        self._idle = deque()  # (conn, created_at, last_used)
+        self._cond = Condition(Lock())
+        self._open = 0
+        self._checked_out = 0
+        self._created = 0
+        self._recycled = 0
+        self._timeouts = 0
+        self._acquires = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def _connect(self):
+        conn = mysql.connector.connect(**self._connect_args)
+        with self._cond:
+            self._created += 1
+        return conn, time.monotonic()
+
+    def _recycle(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._recycled += 1
+        return self._connect()
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        entry = None
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(f"DB 커넥션 풀 대기 시간 초과 ({self.timeout}s, size={self.size})")
+                self._cond.wait(remaining)
+            self._checked_out += 1
+            waited = time.monotonic() - start
+            self._acquires += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+
+        try:
+            if entry is None:
+                conn, created_at = self._connect()
+            else:
+                conn, created_at, last_used = entry
+                now = time.monotonic()
+                if self.recycle and now - created_at > self.recycle:
+                    # 오래된 커넥션은 교체 (서버 wait_timeout 대비)
+                    conn, created_at = self._recycle(conn)
+                elif now - last_used > self.ping_interval:
+                    # 한동안 쉬던 커넥션만 헬스 체크
+                    try:
+                        conn.ping(reconnect=False)
+                    except Exception:
+                        conn, created_at = self._recycle(conn)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, conn, created_at)
+
+    def release(self, conn, created_at, discard=False):
+        if not discard:
+            try:
+                # 커밋되지 않은 트랜잭션이 다음 사용자에게 넘어가지 않도록 정리
+                if conn.in_transaction:
+                    conn.rollback()
+            except Exception:
+                discard = True
+        if discard:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        with self._cond:
+            self._checked_out -= 1
+            if discard:
+                self._open -= 1
+                self._recycled += 1
+            else:
+                self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+
+    def warm(self, count):
+        """워커 시작 시 커넥션을 미리 열어 첫 요청의 핸드셰이크 비용 제거"""
+        conns = []
+        try:
+            for _ in range(min(count, self.size)):
+                conns.append(self.acquire())
+        except Exception as e:
+            print(f"DB pool warm-up error: {str(e)}")
+        finally:
+            for conn in conns:
+                conn.close()
+
+    def reset_after_fork(self):
+        """fork 로 부모에게서 물려받은 커넥션은 닫지 않고 버림 (소켓은 부모 소유)"""
+        with self._cond:
+            self._idle.clear()
+            self._open = 0
+            self._checked_out = 0
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self.size,
+                'open': self._open,
+                'checked_out': self._checked_out,
+                'idle': len(self._idle),
+                'created_total': self._created,
+                'recycled_total': self._recycled,
+                'timeouts_total': self._timeouts,
+                'acquire_count': self._acquires,
+                'wait_time_avg_ms': round(self._wait_time_total / self._acquires * 1000, 3) if self._acquires else 0.0,
+                'wait_time_max_ms': round(self._wait_time_max * 1000, 3),
+                'wait_timeout_s': self.timeout
+            }
+
+db_pool = DBConnectionPool(
+    size=int(os.getenv('DB_POOL_SIZE', 10)),
+    timeout=float(os.getenv('DB_POOL_TIMEOUT', 5)),
+    recycle=int(os.getenv('DB_POOL_RECYCLE', 3600)),
+    ping_interval=float(os.getenv('DB_POOL_PING_INTERVAL', 10)),
+    host=os.getenv('MYSQL_HOST', 'my-mariadb'),
+    user=os.getenv('MYSQL_USER', 'testuser'),
+    password=os.getenv('MYSQL_PASSWORD'),
+    database="testdb",
+    connect_timeout=30
+)
+
+# 읽기 복제본 (MYSQL_REPLICA_HOSTS) - 읽기 쿼리를 분산하고 장애/지연 시 primary 로 fallback
+MYSQL_REPLICA_HOSTS = [h.strip() for h in os.getenv('MYSQL_REPLICA_HOSTS', '').split(',') if h.strip()]
+REPLICA_MAX_LAG_S = float(os.getenv('REPLICA_MAX_LAG_S', 5))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('REPLICA_LAG_CHECK_INTERVAL', 5))
+REPLICA_RETRY_S = float(os.getenv('REPLICA_RETRY_S', 10))
+READ_YOUR_WRITES_S = float(os.getenv('READ_YOUR_WRITES_S', 5))
+
+class Replica:
+    def __init__(self, host, pool):
+        self.host = host
+        self.pool = pool
+        self.down_until = 0.0
+        self.checked_at = 0.0
+        self.lag = None
+        self.lagging = False
+        self.errors = 0
+
+    def record_lag(self, status):
+        """SHOW SLAVE STATUS 결과로 지연 상태를 갱신하고 지연 여부 반환 (status 가 None 이면 복제본 아님)"""
+        self.lag = status.get('Seconds_Behind_Master') if status else None
+        # 복제 상태가 있는데 지연 값이 없으면 복제가 멈춘 상태
+        self.lagging = status is not None and (self.lag is None or self.lag > REPLICA_MAX_LAG_S)
+        if self.lagging:
+            print(f"Replica {self.host} lagging ({self.lag}s), reads go to primary")
+        return self.lagging
+
+class ReplicaRouter:
+    """복제본을 순서대로 돌아가며 사용 - 연결 실패 시 REPLICA_RETRY_S 동안 제외, 지연은 주기적으로 확인"""
+    def __init__(self, replicas):
+        self.replicas = replicas
+        self._lock = Lock()
+        self._next = 0
+        self.replica_reads = 0
+        self.fallbacks = 0
+
+    def acquire(self):
+        """건강한 복제본 커넥션, 없으면 None (호출자가 primary 사용)"""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+        now = time.monotonic()
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            if replica.down_until > now:
+                continue
+            try:
+                conn = replica.pool.acquire()
+            except Exception as e:
+                replica.errors += 1
+                replica.down_until = now + REPLICA_RETRY_S
+                print(f"Replica {replica.host} unavailable: {str(e)}")
+                continue
+            if self._lagging(replica, conn, now):
+                conn.close()
+                continue
+            self.replica_reads += 1
+            return conn
+        self.fallbacks += 1
+        return None
+
+    def _lagging(self, replica, conn, now):
+        if now - replica.checked_at < REPLICA_LAG_CHECK_INTERVAL:
+            return replica.lagging
+        replica.checked_at = now
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SHOW SLAVE STATUS")
+            status = cursor.fetchone()
+            cursor.close()
+        except Exception as e:
+            # 권한(REPLICATION CLIENT) 부족 등으로 확인할 수 없으면 지연 없음으로 간주
+            print(f"Replica {replica.host} lag check error: {str(e)}")
+            replica.lagging = False
+            return False
+        return replica.record_lag(status)
+
+    def warm(self, count):
+        for replica in self.replicas:
+            replica.pool.warm(count)
+
+    def reset_after_fork(self):
+        for replica in self.replicas:
+            replica.pool.reset_after_fork()
+
+    def stats(self):
+        now = time.monotonic()
+        return {
+            'replica_reads': self.replica_reads,
+            'fallbacks': self.fallbacks,
+            'replicas': [{
+                'host': replica.host,
+                'available': replica.down_until <= now and not replica.lagging,
+                'lag_s': replica.lag,
+                'errors': replica.errors,
+                'pool': replica.pool.stats()
+            } for replica in self.replicas]
+        }
+
+replica_router = ReplicaRouter([
+    Replica(host, DBConnectionPool(
+        size=int(os.getenv('DB_REPLICA_POOL_SIZE', os.getenv('DB_POOL_SIZE', 10))),
+        timeout=float(os.getenv('DB_REPLICA_POOL_TIMEOUT', 1)),
+        recycle=int(os.getenv('DB_POOL_RECYCLE', 3600)),
+        ping_interval=float(os.getenv('DB_POOL_PING_INTERVAL', 10)),
+        host=host,
+        user=os.getenv('MYSQL_REPLICA_USER', os.getenv('MYSQL_USER', 'testuser')),
+        password=os.getenv('MYSQL_REPLICA_PASSWORD', os.getenv('MYSQL_PASSWORD')),
         database="testdb",
-        connect_timeout=30
-    )
+        connect_timeout=5
+    )) for host in MYSQL_REPLICA_HOSTS
+]) if MYSQL_REPLICA_HOSTS else None
+
+def primary_required():
+    """이 세션이 최근에 쓰기를 했으면 복제 지연과 무관하게 자기 쓰기를 읽도록 primary 사용"""
+    return has_request_context() and session.get('primary_until', 0) > time.time()
+
+def mark_recent_write():
+    """쓰기 후 READ_YOUR_WRITES_S 동안 읽기를 primary 로 고정 (세션 저장은 절반 주기마다 한 번만)"""
+    if replica_router is None or not has_request_context():
+        return
+    now = time.time()
+    if session.get('primary_until', 0) - now < READ_YOUR_WRITES_S / 2:
+        session['primary_until'] = now + READ_YOUR_WRITES_S
+
+# MariaDB 연결 함수 (풀에서 커넥션 대여, close() 시 반환)
+# read_only=True 이면 가능한 경우 복제본에서 대여
+def get_db_connection(read_only=False):
+    with timed('db_connect'):
+        if read_only and replica_router is not None and not primary_required():
+            conn = replica_router.acquire()
+            if conn is not None:
+                return conn
+        return db_pool.acquire()
 
-# Redis 연결 함수
-def get_redis_connection():
+# Redis 서킷 브레이커 - 장애 시 쿨다운 동안 Redis 호출을 건너뜀
+class CircuitBreaker:
+    """연속 실패가 threshold 에 도달하면 cooldown 동안 open 상태 유지
+
+    쿨다운 후에는 시험 호출 하나만 허용하고(half-open), 클라이언트를 받고도 명령을 보내지 않아
+    결과가 기록되지 않은 시험 기회는 다시 cooldown 이 지나면 새로 내준다.
+    """
+    def __init__(self, threshold=3, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._half_open_trial = False
+        self._trial_started_at = None
+        self.trips = 0
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.cooldown:
+                return False
+            # 쿨다운이 끝나면 한 번만 시험 호출 허용 (half-open)
+            if self._half_open_trial and now - self._trial_started_at < self.cooldown:
+                return False
+            self._half_open_trial = True
+            self._trial_started_at = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._half_open_trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            # half-open 시험 호출 실패 또는 연속 실패 임계치 도달 시 다시 open
+            if self._half_open_trial or (self._opened_at is None and self._failures >= self.threshold):
+                self.trips += 1
+                self._opened_at = time.monotonic()
+                self._half_open_trial = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at < self.cooldown:
+                return 'open'
+            return 'half_open'
+
+redis_breaker = CircuitBreaker(
+    threshold=int(os.getenv('REDIS_BREAKER_THRESHOLD', 3)),
+    cooldown=float(os.getenv('REDIS_BREAKER_COOLDOWN', 30))
+)
+
+# Redis 사용 통계 카운터
+cache_metrics = {
+    'search_hits': 0,
+    'search_misses': 0,
+    'search_stale': 0,
+    'search_loads': 0,
+    'search_singleflight_waits': 0,
+    'search_singleflight_timeouts': 0,
+    'feed_hits': 0,
+    'feed_misses': 0,
+    'redis_errors': 0,
+    'redis_skipped': 0
+}
+_cache_metrics_lock = Lock()
+
+def incr_cache_metric(name, amount=1):
+    with _cache_metrics_lock:
+        cache_metrics[name] = cache_metrics.get(name, 0) + amount
+    if METRICS_ENABLED:
+        CACHE_EVENTS.labels(name).inc(amount)
+
+class BreakerRedis(redis.Redis):
+    """명령 실행 결과를 서킷 브레이커에 기록하는 Redis 클라이언트"""
+    def execute_command(self, *args, **options):
+        try:
+            with timed('redis'):
+                result = super().execute_command(*args, **options)
+        except (redis.ConnectionError, redis.TimeoutError):
+            incr_cache_metric('redis_errors')
+            redis_breaker.record_failure()
+            raise
+        redis_breaker.record_success()
+        return result
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return BreakerPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+class BreakerPipeline(redis.client.Pipeline):
+    """파이프라인 실행 결과도 서킷 브레이커에 기록"""
+    def execute(self, raise_on_error=True):
+        try:
+            with timed('redis'):
+                result = super().execute(raise_on_error)
+        except (redis.ConnectionError, redis.TimeoutError):
+            incr_cache_metric('redis_errors')
+            redis_breaker.record_failure()
+            raise
+        redis_breaker.record_success()
+        return result
+
+# 프로세스 전역 Redis 커넥션 풀 / 클라이언트 (시작 시 한 번만 생성)
+redis_pool = redis.ConnectionPool(
+    host=os.getenv('REDIS_HOST', 'my-redis-master'),
+    port=6379,
+    password=os.getenv('REDIS_PASSWORD'),
+    decode_responses=True,
+    db=0,
+    max_connections=int(os.getenv('REDIS_POOL_SIZE', 20)),
+    socket_connect_timeout=5,
+    socket_timeout=5,
+    retry_on_timeout=True
+)
+redis_client_shared = BreakerRedis(connection_pool=redis_pool)
+# 검색 캐시처럼 바이트(압축/msgpack) 값을 다루는 용도 - 응답을 문자열로 디코딩하지 않음
+redis_pool_binary = redis.ConnectionPool(
+    host=os.getenv('REDIS_HOST', 'my-redis-master'),
+    port=6379,
+    password=os.getenv('REDIS_PASSWORD'),
+    decode_responses=False,
+    db=0,
+    max_connections=int(os.getenv('REDIS_POOL_SIZE', 20)),
+    socket_connect_timeout=5,
+    socket_timeout=5,
+    retry_on_timeout=True
+)
+redis_client_binary = BreakerRedis(connection_pool=redis_pool_binary)
+
+# Redis 연결 함수 (브레이커가 열려 있으면 None 반환)
+def get_redis_connection(binary=False):
+    if not redis_breaker.allow():
+        incr_cache_metric('redis_skipped')
+        return None
+    return redis_client_binary if binary else redis_client_shared
+
+# 워커 프로세스 내 L1 검색 캐시 (Redis 앞단의 LRU)
+SEARCH_INVALIDATION_CHANNEL = 'search:invalidate'
+
+class LocalLRUCache:
+    """항목 수/바이트 수 제한과 짧은 TTL 을 가진 스레드 안전 LRU"""
+    def __init__(self, max_entries=1000, max_bytes=16 * 1024 * 1024, ttl=5.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = Lock()
+        self._items = OrderedDict()  # key -> (expires_at, version, value, size)
+        self._bytes = 0
+        self._min_version = 0  # 무효화로 알려진 최신 messages 버전 - 이보다 오래된 결과는 저장하지 않음
+        self._subscribed = False
+        self._pid = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        self._ensure_subscriber()
+        with self._lock:
+            # 무효화 채널을 구독하지 못하는 동안에는 일관성을 보장할 수 없으므로 사용하지 않음
+            if not self._subscribed:
+                self.misses += 1
+                return None
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            if item[0] < time.monotonic():
+                self._remove(key)
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1], item[2]
+
+    def put(self, key, version, value, size):
+        if not self.enabled or size > self.max_bytes:
+            return
+        with self._lock:
+            if not self._subscribed or version < self._min_version:
+                return
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (time.monotonic() + self.ttl, version, value, size)
+            self._bytes += size
+            while len(self._items) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._items))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        item = self._items.pop(key)
+        self._bytes -= item[3]
+
+    def invalidate(self, query=None, version=None):
+        with self._lock:
+            if version is not None:
+                self._min_version = max(self._min_version, version)
+            if query is None:
+                self._items.clear()
+                self._bytes = 0
+            else:
+                for key in [k for k in self._items if k[0] == query]:
+                    self._remove(key)
+            self.invalidations += 1
+
+    def _ensure_subscriber(self):
+        # 워커(프로세스)마다 무효화 구독 스레드 하나 - fork 이후에도 새로 시작
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._items.clear()
+            self._bytes = 0
+            self._subscribed = False
+            Thread(target=self._listen, name='search-l1-invalidator', daemon=True).start()
+            self._pid = os.getpid()
+
+    def _set_subscribed(self, subscribed):
+        with self._lock:
+            self._subscribed = subscribed
+            if not subscribed:
+                self._items.clear()
+                self._bytes = 0
+
+    def _listen(self):
+        while True:
+            pubsub = None
+            try:
+                pubsub = redis_client_shared.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(SEARCH_INVALIDATION_CHANNEL)
+                self._set_subscribed(True)
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message['type'] == 'message':
+                        data = message['data']
+                        if data.startswith('q:'):
+                            self.invalidate(query=data[2:])
+                        elif data.startswith('v:'):
+                            self.invalidate(version=int(data[2:]))
+                        else:
+                            self.invalidate()
+            except Exception as e:
+                print(f"Search L1 invalidation listener error: {str(e)}")
+                self._set_subscribed(False)
+                time.sleep(1)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'subscribed': self._subscribed,
+                'entries': len(self._items),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_s': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expired': self.expired,
+                'invalidations': self.invalidations
+            }
+
+search_l1_cache = LocalLRUCache(
+    max_entries=int(os.getenv('SEARCH_L1_MAX_ENTRIES', 1000)),
+    max_bytes=int(os.getenv('SEARCH_L1_MAX_BYTES', 16 * 1024 * 1024)),
+    ttl=float(os.getenv('SEARCH_L1_TTL', 5))
+)
+
+def publish_search_invalidation(query=None, version=None):
+    """모든 워커의 L1 캐시 무효화 (query 가 없으면 전체, version 은 새 messages 버전)"""
+    search_l1_cache.invalidate(query, version)
+    if query is not None:
+        message = f"q:{query}"
+    elif version is not None:
+        message = f"v:{version}"
+    else:
+        message = 'all'
     try:
-        redis_client = redis.Redis(
-            host=os.getenv('REDIS_HOST', 'my-redis-master'),
-            port=6379,
-            password=os.getenv('REDIS_PASSWORD'),
-            decode_responses=True,
-            db=0,
-            socket_connect_timeout=5,
-            socket_timeout=5,
-            retry_on_timeout=True
-        )
-        # 연결 테스트
-        redis_client.ping()
-        return redis_client
+        redis_client = get_redis_connection()
+        if redis_client:
+            redis_client.publish(SEARCH_INVALIDATION_CHANNEL, message)
     except Exception as e:
-        print(f"Redis connection error: {str(e)}")
-        return None
+        print(f"Redis invalidation publish error: {str(e)}")
 
 # Redis 검색 캐시 함수들
-def get_search_cache(query):
-    """Redis에서 검색 결과 캐시 가져오기"""
+# 캐시 값에 계산 당시의 messages 버전을 함께 저장하고, 메시지가 저장되면 버전만 올려 O(1)로 무효화
+MESSAGES_VERSION_KEY = 'messages:version'
+SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', 300))
+SEARCH_LOCK_TTL_MS = int(os.getenv('SEARCH_LOCK_TTL_MS', 5000))
+SEARCH_LOCK_WAIT_MS = int(os.getenv('SEARCH_LOCK_WAIT_MS', 2000))
+SEARCH_LOCK_POLL_MS = 50
+
+# 락 소유자(token)일 때만 삭제
+RELEASE_LOCK_SCRIPT = redis_client_shared.register_script("""
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+""")
+
+def get_search_cache(query, page_key):
+    """L1 → Redis 순으로 검색 결과 캐시 가져오기 - (결과 또는 None, 현재 messages 버전) 반환"""
+    l1_item = search_l1_cache.get((query, page_key))
+    if l1_item is not None:
+        return l1_item[1], l1_item[0]
     try:
-        redis_client = get_redis_connection()
+        redis_client = get_redis_connection(binary=True)
         if redis_client:
             cache_key = f"search:{query}"
-            cached_result = redis_client.get(cache_key)
+            # 버전 조회와 캐시 조회를 한 번의 왕복으로 처리
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.get(MESSAGES_VERSION_KEY)
+            pipe.hget(cache_key, page_key)
+            version, cached_result = pipe.execute()
+            version = int(version or 0)
             if cached_result:
-                print(f"Cache hit for query: {query}")
-                return json.loads(cached_result)
-        return None
+                cached = decode_cache_value(cached_result)
+                if cached.get('v') == version:
+                    print(f"Cache hit for query: {query} ({page_key})")
+                    incr_cache_metric('search_hits')
+                    search_l1_cache.put((query, page_key), version, cached['data'], len(cached_result))
+                    return cached['data'], version
+                incr_cache_metric('search_stale')
+            incr_cache_metric('search_misses')
+            return None, version
+        return None, None
     except Exception as e:
         print(f"Redis cache get error: {str(e)}")
-        return None
+        return None, None
 
-def set_search_cache(query, results, expire_time=300):
+def set_search_cache(query, page_key, results, version, expire_time=SEARCH_CACHE_TTL):
     """Redis에 검색 결과 캐시 저장 (기본 5분)"""
+    if version is None:
+        return
     try:
-        redis_client = get_redis_connection()
+        redis_client = get_redis_connection(binary=True)
         if redis_client:
             cache_key = f"search:{query}"
-            redis_client.setex(cache_key, expire_time, json.dumps(results))
-            print(f"Cache set for query: {query}, expire: {expire_time}s")
+            payload = encode_cache_value({'v': version, 'data': results})
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.hset(cache_key, page_key, payload)
+            pipe.expire(cache_key, expire_time)
+            pipe.execute()
+            search_l1_cache.put((query, page_key), version, results, len(payload))
+            print(f"Cache set for query: {query} ({page_key}), expire: {expire_time}s")
     except Exception as e:
         print(f"Redis cache set error: {str(e)}")
 
+def bump_messages_version():
+    """메시지 변경 시 검색 캐시 세대 증가 (기존 캐시는 즉시 stale 처리)"""
+    try:
+        redis_client = get_redis_connection()
+        if redis_client:
+            version = redis_client.incr(MESSAGES_VERSION_KEY)
+            publish_search_invalidation(version=version)
+            return version
+    except Exception as e:
+        print(f"Redis version bump error: {str(e)}")
+    return None
+
+def load_search_single_flight(query, page_key, version, loader):
+    """동일 검색어/페이지의 동시 캐시 미스는 한 요청만 DB를 조회하고 나머지는 캐시를 기다림"""
+    if version is None:
+        return loader()
+    redis_client = get_redis_connection()
+    if not redis_client:
+        return loader()
+
+    lock_key = f"lock:search:{query}:{page_key}"
+    token = uuid.uuid4().hex
+    try:
+        acquired = redis_client.set(lock_key, token, nx=True, px=SEARCH_LOCK_TTL_MS)
+    except Exception as e:
+        print(f"Redis search lock error: {str(e)}")
+        return loader()
+
+    if acquired:
+        incr_cache_metric('search_loads')
+        try:
+            results = loader()
+            set_search_cache(query, page_key, results, version)
+            return results
+        finally:
+            try:
+                RELEASE_LOCK_SCRIPT(keys=[lock_key], args=[token])
+            except Exception as e:
+                print(f"Redis search unlock error: {str(e)}")
+
+    # 다른 요청이 조회 중 - 캐시가 채워질 때까지 잠시 대기
+    incr_cache_metric('search_singleflight_waits')
+    deadline = time.monotonic() + SEARCH_LOCK_WAIT_MS / 1000.0
+    while time.monotonic() < deadline:
+        time.sleep(SEARCH_LOCK_POLL_MS / 1000.0)
+        cached, _ = get_search_cache(query, page_key)
+        if cached is not None:
+            return cached
+    incr_cache_metric('search_singleflight_timeouts')
+    return loader()
+
+def iter_search_cache_keys(redis_client, count=500):
+    # KEYS 대신 SCAN 으로 조금씩 순회 (Redis 블로킹 방지)
+    return redis_client.scan_iter(match="search:*", count=count)
+
 def clear_search_cache():
     """검색 캐시 전체 삭제"""
     try:
         redis_client = get_redis_connection()
         if redis_client:
-            # search: 패턴의 모든 키 삭제
-            pattern = "search:*"
-            keys = redis_client.keys(pattern)
-            if keys:
-                redis_client.delete(*keys)
-                print(f"Cleared {len(keys)} search cache keys")
+            # 버전을 먼저 올려 즉시 무효화한 뒤 남은 키는 SCAN 으로 배치 삭제
+            version = redis_client.incr(MESSAGES_VERSION_KEY)
+            publish_search_invalidation(version=version)
+            batch = []
+            cleared = 0
+            for key in iter_search_cache_keys(redis_client):
+                batch.append(key)
+                if len(batch) >= 500:
+                    cleared += redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                cleared += redis_client.unlink(*batch)
+            print(f"Cleared {cleared} search cache keys")
     except Exception as e:
         print(f"Redis cache clear error: {str(e)}")
 
@@ -94,24 +912,38 @@ def get_cache_stats():
         redis_client = get_redis_connection()
         if redis_client:
             pattern = "search:*"
-            keys = redis_client.keys(pattern)
+            total_keys = sum(1 for _ in iter_search_cache_keys(redis_client))
             cache_info = {
-                'total_cache_keys': len(keys),
+                'total_cache_keys': total_keys,
                 'cache_pattern': pattern,
+                'messages_version': int(redis_client.get(MESSAGES_VERSION_KEY) or 0),
                 'redis_status': 'connected'
             }
-            return cache_info
         else:
-            return {'redis_status': 'disconnected'}
+            cache_info = {'redis_status': 'disconnected'}
     except Exception as e:
-        return {'redis_status': 'error', 'error': str(e)}
+        cache_info = {'redis_status': 'error', 'error': str(e)}
+    cache_info['counters'] = get_redis_counters()
+    cache_info['l1'] = search_l1_cache.stats()
+    cache_info['sessions'] = session_interface.stats()
+    cache_info['redis_logs'] = redis_log_buffer.stats()
+    cache_info['log_tail'] = log_tail_hub.stats()
+    return cache_info
+
+def get_redis_counters():
+    """Redis 캐시 적중/오류/브레이커 카운터"""
+    with _cache_metrics_lock:
+        counters = dict(cache_metrics)
+    counters['breaker_state'] = redis_breaker.state
+    counters['breaker_trips'] = redis_breaker.trips
+    return counters
 
 # Kafka Producer 설정
-def get_kafka_producer():
+def get_kafka_producer(**overrides):
     try:
-        return KafkaProducer(
+        config = dict(
             bootstrap_servers=os.getenv('KAFKA_SERVERS', 'my-kafka:9092'),
-            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+            value_serializer=dumps_bytes,
             security_protocol='SASL_PLAINTEXT',
             sasl_mechanism='SCRAM-SHA-256',
             sasl_plain_username=os.getenv('KAFKA_USERNAME', 'user1'),
@@ -121,10 +953,25 @@ def get_kafka_producer():
             retries=3,
             acks='all'
         )
+        config.update(overrides)
+        return KafkaProducer(**config)
     except Exception as e:
         print(f"Kafka producer creation error: {str(e)}")
         return None
 
+# Kafka Consumer 설정
+def get_kafka_consumer(*topics, **overrides):
+    config = dict(
+        bootstrap_servers=os.getenv('KAFKA_SERVERS', 'my-kafka:9092'),
+        value_deserializer=loads,
+        security_protocol='SASL_PLAINTEXT',
+        sasl_mechanism='SCRAM-SHA-256',
+        sasl_plain_username=os.getenv('KAFKA_USERNAME', 'user1'),
+        sasl_plain_password=os.getenv('KAFKA_PASSWORD', '')
+    )
+    config.update(overrides)
+    return KafkaConsumer(*topics, **config)
+
 # Kafka 연결 테스트 함수
 def test_kafka_connection():
     """Kafka 연결 상태 테스트"""
@@ -146,49 +993,478 @@ def test_kafka_connection():
     except Exception as e:
         return {'status': 'error', 'message': f'Kafka connection failed: {str(e)}'}
 
-# 로깅 함수
+# 실시간 로그 스트림 (SSE /logs/stream 의 원본) - Redis Stream, 항목은 {type, data}
+LOG_STREAM_KEY = 'logs:stream'
+LOG_STREAM_MAXLEN = int(os.getenv('LOG_STREAM_MAXLEN', 10000))
+
+def queue_log_stream_events(pipe, log_type, entries):
+    """파이프라인에 XADD 추가 - MAXLEN ~ 로 대략적인 길이만 유지하여 trim 비용 최소화"""
+    for entry in entries:
+        pipe.xadd(LOG_STREAM_KEY, {'type': log_type, 'data': dumps(entry)},
+                  maxlen=LOG_STREAM_MAXLEN, approximate=True)
+
+# Redis 작업 로그 버퍼 - 요청 스레드는 버퍼에 넣기만 하고 백그라운드 스레드가 모아서 기록
+class RedisLogBuffer:
+    """flush_interval 마다(또는 batch_size 가 차면) LPUSH + LTRIM 을 한 번의 파이프라인으로 실행"""
+    def __init__(self, key, max_entries=100, buffer_size=10000, flush_interval=0.2, batch_size=500, stream_type=None):
+        self.key = key
+        self.stream_type = stream_type  # 지정하면 같은 파이프라인에서 로그 스트림에도 XADD
+        self.max_entries = max_entries
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._cond = Condition()
+        self._buffer = deque()
+        self._pid = None
+        self._thread = None
+        self._closing = False
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.flushes = 0
+        self.errors = 0
+
+    def _ensure_started(self):
+        # fork 이후 자식 프로세스에서는 버퍼/스레드를 새로 만든다
+        if self._pid == os.getpid():
+            return
+        with self._cond:
+            if self._pid == os.getpid():
+                return
+            self._buffer = deque()
+            self._closing = False
+            self._thread = Thread(target=self._run, name='redis-log-buffer', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def submit(self, entry):
+        self._ensure_started()
+        with self._cond:
+            if len(self._buffer) >= self.buffer_size:
+                self.dropped += 1
+                return False
+            self._buffer.append(entry)
+            self.enqueued += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if len(self._buffer) < self.batch_size and not self._closing:
+                    self._cond.wait(self.flush_interval)
+                batch = [self._buffer.popleft() for _ in range(min(len(self._buffer), self.batch_size))]
+                done = self._closing and not self._buffer
+            if batch:
+                self._flush(batch)
+            if done:
+                break
+
+    def _flush(self, batch):
+        # 목록은 최근 max_entries 개만 유지되므로 그보다 오래된 항목은 보내지 않음
+        entries = batch[-self.max_entries:]
+        try:
+            redis_client = get_redis_connection()
+            if not redis_client:
+                self.dropped += len(batch)
+                return
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.lpush(self.key, *[dumps(entry) for entry in entries])
+            pipe.ltrim(self.key, 0, self.max_entries - 1)
+            if self.stream_type:
+                queue_log_stream_events(pipe, self.stream_type, batch)
+            pipe.execute()
+            self.written += len(entries)
+            self.flushes += 1
+        except Exception as e:
+            self.errors += 1
+            self.dropped += len(batch)
+            print(f"Redis logging error: {str(e)}")
+
+    def close(self, timeout=5):
+        """남은 로그를 기록하고 스레드 종료 (프로세스 종료 시 호출)"""
+        if self._pid != os.getpid() or self._thread is None:
+            return
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        self._thread = None
+        self._pid = None
+
+    def stats(self):
+        with self._cond:
+            buffered = len(self._buffer)
+        return {
+            'buffered': buffered,
+            'buffer_size': self.buffer_size,
+            'flush_interval_ms': int(self.flush_interval * 1000),
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'written': self.written,
+            'flushes': self.flushes,
+            'errors': self.errors
+        }
+
+redis_log_buffer = RedisLogBuffer(
+    'api_logs',
+    max_entries=100,  # 최근 100개 로그만 유지
+    buffer_size=int(os.getenv('REDIS_LOG_BUFFER_SIZE', 10000)),
+    flush_interval=int(os.getenv('REDIS_LOG_FLUSH_INTERVAL_MS', 200)) / 1000.0,
+    batch_size=int(os.getenv('REDIS_LOG_BATCH_SIZE', 500)),
+    stream_type='redis'
+)
+atexit.register(redis_log_buffer.close)
+
+# 로깅 함수 (버퍼에 넣고 즉시 반환)
 def log_to_redis(action, details):
-    try:
-        redis_client = get_redis_connection()
-        if redis_client:
-            log_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'action': action,
-                'details': details
-            }
-            redis_client.lpush('api_logs', json.dumps(log_entry))
-            redis_client.ltrim('api_logs', 0, 99)  # 최근 100개 로그만 유지
-            redis_client.close()
-        else:
-            print("Redis 연결 불가로 로깅 건너뜀")
-    except Exception as e:
-        print(f"Redis logging error: {str(e)}")
+    log_entry = {
+        'timestamp': datetime.now().isoformat(),
+        'action': action,
+        'details': details
+    }
+    if not redis_log_buffer.submit(log_entry):
+        print(f"Redis log buffer full, dropped: {action}")
 
-# API 통계 로깅을 비동기로 처리하는 함수
-def async_log_api_stats(endpoint, method, status, user_id):
-    def _log():
+# Kafka 로그 전송기 - 워커당 하나의 장수 Producer 를 제한된 큐로 공급
+class KafkaLogShipper:
+    """요청 스레드는 큐에 넣기만 하고, 백그라운드 스레드 하나가 Producer 로 배치 전송"""
+    _STOP = object()
+
+    def __init__(self, topic, queue_size=10000, policy='drop', block_timeout=0.05, producer_config=None):
+        self.topic = topic
+        self.queue_size = queue_size
+        self.policy = policy  # 'drop': 큐가 가득 차면 버림, 'block': block_timeout 까지 대기 후 버림
+        self.block_timeout = block_timeout
+        self.producer_config = producer_config or {}
+        self._lock = Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self._producer = None
+        self.enqueued = 0
+        self.dropped = 0
+        self.sent = 0
+        self.errors = 0
+
+    def _ensure_started(self):
+        # fork 이후 자식 프로세스에서는 스레드/Producer 를 새로 만든다
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = Queue(maxsize=self.queue_size)
+            self._producer = None
+            self._thread = Thread(target=self._run, name='kafka-log-shipper', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def submit(self, value):
+        self._ensure_started()
         try:
-            producer = get_kafka_producer()
-            if producer:
-                log_data = {
-                    'timestamp': datetime.now().isoformat(),
-                    'endpoint': endpoint,
-                    'method': method,
-                    'status': status,
-                    'user_id': user_id,
-                    'message': f"{user_id}가 {method} {endpoint} 호출 ({status})"
-                }
-                producer.send('api-logs', log_data)
-                producer.flush()
-                producer.close()
-                print(f"Kafka log sent: {endpoint} {method} {status}")
+            if self.policy == 'block':
+                self._queue.put(value, timeout=self.block_timeout)
             else:
-                print("Kafka producer not available, skipping log")
+                self._queue.put_nowait(value)
+            self.enqueued += 1
+            return True
+        except Full:
+            self.dropped += 1
+            return False
+
+    def _on_send_error(self, exc):
+        self.errors += 1
+        print(f"Kafka logging error: {str(exc)}")
+
+    def _on_send_success(self, metadata):
+        self.sent += 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            if self._producer is None:
+                # 최초 전송 시 한 번만 Producer 생성 (SASL 핸드셰이크/메타데이터 조회)
+                self._producer = get_kafka_producer(**self.producer_config)
+                if self._producer is None:
+                    self.dropped += 1
+                    continue
+            try:
+                future = self._producer.send(self.topic, item)
+                future.add_callback(self._on_send_success)
+                future.add_errback(self._on_send_error)
+            except Exception as e:
+                self.errors += 1
+                print(f"Kafka logging error: {str(e)}")
+        if self._producer is not None:
+            self._producer.flush(timeout=10)
+            self._producer.close(timeout=10)
+            self._producer = None
+
+    def close(self, timeout=10):
+        """남은 로그를 flush 하고 Producer 종료 (프로세스 종료 시 호출)"""
+        if self._pid != os.getpid() or self._thread is None:
+            return
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except Full:
+            print("Kafka log queue full on shutdown, remaining logs dropped")
+            return
+        self._thread.join(timeout)
+        self._thread = None
+        self._pid = None
+
+    def stats(self):
+        return {
+            'queue_size': self.queue_size,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'policy': self.policy,
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'sent': self.sent,
+            'errors': self.errors,
+            'producer_ready': self._producer is not None
+        }
+
+# 통계 로그는 유실 허용 범위가 넓어 기본값은 리더 확인(acks=1)
+KAFKA_LOG_ACKS = os.getenv('KAFKA_ACKS', '1')
+kafka_log_shipper = KafkaLogShipper(
+    'api-logs',
+    queue_size=int(os.getenv('KAFKA_LOG_QUEUE_SIZE', 10000)),
+    policy=os.getenv('KAFKA_LOG_QUEUE_POLICY', 'drop'),
+    block_timeout=float(os.getenv('KAFKA_LOG_BLOCK_TIMEOUT', 0.05)),
+    producer_config={
+        # 처리량 위주 설정: 짧게 모아서 압축 배치 전송
+        'linger_ms': int(os.getenv('KAFKA_LINGER_MS', 20)),
+        'batch_size': int(os.getenv('KAFKA_BATCH_SIZE', 65536)),
+        'compression_type': os.getenv('KAFKA_COMPRESSION', 'gzip'),
+        'acks': KAFKA_LOG_ACKS if KAFKA_LOG_ACKS == 'all' else int(KAFKA_LOG_ACKS)
+    }
+)
+atexit.register(kafka_log_shipper.close)
+
+# API 통계 로깅을 비동기로 처리하는 함수 (큐에 넣고 즉시 반환)
+def async_log_api_stats(endpoint, method, status, user_id):
+    log_data = {
+        'timestamp': datetime.now().isoformat(),
+        'endpoint': endpoint,
+        'method': method,
+        'status': status,
+        'user_id': user_id,
+        'message': f"{user_id}가 {method} {endpoint} 호출 ({status})"
+    }
+    with timed('kafka_enqueue'):
+        submitted = kafka_log_shipper.submit(log_data)
+    if not submitted:
+        print(f"Kafka log queue full, dropped: {endpoint} {method} {status}")
+
+# Redis 서버 측 세션 - 쿠키에는 서명된 세션 ID 만 두고 내용은 Redis 에 저장
+SESSION_KEY_PREFIX = 'session:'
+USER_SESSIONS_PREFIX = 'user_sessions:'
+SESSION_TTL = int(os.getenv('SESSION_TTL', 3600))
+SESSION_REFRESH_INTERVAL = int(os.getenv('SESSION_REFRESH_INTERVAL', 300))
+SESSION_LOCAL_TTL = float(os.getenv('SESSION_LOCAL_TTL', 5))
+SESSION_LOCAL_MAX_ENTRIES = int(os.getenv('SESSION_LOCAL_MAX_ENTRIES', 10000))
+
+class RedisSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.user_at_open = self.get('user_id')
+
+class RedisSessionInterface(SessionInterface):
+    """세션을 Redis 에 한 번의 파이프라인(SET EX)으로 저장하고, 검증된 세션은 워커 로컬에 잠깐 캐시
+
+    만료 시간 연장(sliding expiry)은 세션마다 SESSION_REFRESH_INTERVAL 초에 한 번만 Redis 에 쓴다.
+    로그아웃/강제 종료는 Redis 키를 지우므로 다른 워커에도 SESSION_LOCAL_TTL 초 안에 반영된다.
+    """
+    session_class = RedisSession
+
+    def __init__(self):
+        self._lock = Lock()
+        self._local = OrderedDict()  # sid -> [expires_at, data, refreshed_at]
+        self.local_hits = 0
+        self.local_misses = 0
+        self.refreshes = 0
+
+    def signer(self, app):
+        return Signer(app.secret_key, salt='redis-session')
+
+    def load_sid(self, app, cookie_value):
+        if not cookie_value:
+            return None
+        try:
+            return self.signer(app).unsign(cookie_value).decode('utf-8')
+        except BadSignature:
+            return None
+
+    # 워커 로컬 검증 캐시
+    def cached(self, sid):
+        with self._lock:
+            item = self._local.get(sid)
+            if item is None or item[0] < time.monotonic():
+                self.local_misses += 1
+                return None
+            self._local.move_to_end(sid)
+            self.local_hits += 1
+            return dict(item[1])
+
+    def remember(self, sid, data, refreshed=False):
+        now = time.monotonic()
+        with self._lock:
+            item = self._local.pop(sid, None)
+            refreshed_at = now if refreshed or item is None else item[2]
+            self._local[sid] = [now + SESSION_LOCAL_TTL, dict(data), refreshed_at]
+            while len(self._local) > SESSION_LOCAL_MAX_ENTRIES:
+                self._local.popitem(last=False)
+
+    def forget(self, *sids):
+        with self._lock:
+            for sid in sids:
+                self._local.pop(sid, None)
+
+    def needs_refresh(self, sid):
+        """마지막 만료 연장 후 SESSION_REFRESH_INTERVAL 이 지났으면 True (연장 시각도 갱신)"""
+        now = time.monotonic()
+        with self._lock:
+            item = self._local.get(sid)
+            if item is not None and now - item[2] < SESSION_REFRESH_INTERVAL:
+                return False
+            if item is not None:
+                item[2] = now
+            self.refreshes += 1
+            return True
+
+    def queue_save(self, pipe, sid, data):
+        pipe.set(f"{SESSION_KEY_PREFIX}{sid}", dumps(data), ex=SESSION_TTL)
+        if data.get('user_id'):
+            user_key = f"{USER_SESSIONS_PREFIX}{data['user_id']}"
+            pipe.sadd(user_key, sid)
+            pipe.expire(user_key, SESSION_TTL)
+
+    def queue_refresh(self, pipe, sid, data):
+        pipe.expire(f"{SESSION_KEY_PREFIX}{sid}", SESSION_TTL)
+        if data.get('user_id'):
+            pipe.expire(f"{USER_SESSIONS_PREFIX}{data['user_id']}", SESSION_TTL)
+
+    def queue_delete(self, pipe, sid, user_id):
+        pipe.delete(f"{SESSION_KEY_PREFIX}{sid}")
+        if user_id:
+            pipe.srem(f"{USER_SESSIONS_PREFIX}{user_id}", sid)
+
+    def open_session(self, app, request):
+        sid = self.load_sid(app, request.cookies.get(self.get_cookie_name(app)))
+        if sid is None:
+            return self.session_class(sid=uuid.uuid4().hex, new=True)
+
+        data = self.cached(sid)
+        if data is not None:
+            return self.session_class(data, sid=sid)
+        try:
+            redis_client = get_redis_connection()
+            stored = redis_client.get(f"{SESSION_KEY_PREFIX}{sid}") if redis_client else None
         except Exception as e:
-            print(f"Kafka logging error: {str(e)}")
-    
-    # 새로운 스레드에서 로깅 실행
-    Thread(target=_log).start()
+            print(f"Redis session load error: {str(e)}")
+            stored = None
+        if stored is None:
+            return self.session_class(sid=uuid.uuid4().hex, new=True)
+        data = loads(stored)
+        self.remember(sid, data)
+        return self.session_class(data, sid=sid)
+
+    def save_session(self, app, session, response):
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        cookie_name = self.get_cookie_name(app)
+        data = dict(session)
+
+        try:
+            # 클라이언트는 실제로 명령을 보내는 경로에서만 가져옴 (브레이커 half-open 시험 기회 보존)
+            if not session.modified:
+                # 변경이 없으면 쓰기 없음 - 만료 연장만 간격을 두고 수행
+                if not session.new and data and self.needs_refresh(session.sid):
+                    redis_client = get_redis_connection()
+                    if redis_client:
+                        pipe = redis_client.pipeline(transaction=False)
+                        self.queue_refresh(pipe, session.sid, data)
+                        pipe.execute()
+                return
+
+            if not data:
+                if not session.new:
+                    redis_client = get_redis_connection()
+                    if redis_client:
+                        pipe = redis_client.pipeline(transaction=False)
+                        self.queue_delete(pipe, session.sid, session.user_at_open)
+                        pipe.execute()
+                    self.forget(session.sid)
+                    response.delete_cookie(cookie_name, domain=domain, path=path)
+                return
+
+            redis_client = get_redis_connection()
+            if not redis_client:
+                print("Redis 연결 불가로 세션 저장 건너뜀")
+                return
+            pipe = redis_client.pipeline(transaction=False)
+            if not session.new and data.get('user_id') != session.user_at_open:
+                # 로그인 사용자가 바뀌면 세션 ID 재발급 (세션 고정 방지)
+                self.queue_delete(pipe, session.sid, session.user_at_open)
+                self.forget(session.sid)
+                session.sid = uuid.uuid4().hex
+            self.queue_save(pipe, session.sid, data)
+            pipe.execute()
+            self.remember(session.sid, data, refreshed=True)
+        except Exception as e:
+            print(f"Redis session save error: {str(e)}")
+            return
+
+        response.set_cookie(
+            cookie_name,
+            self.signer(app).sign(session.sid.encode('utf-8')).decode('utf-8'),
+            max_age=SESSION_TTL,
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
+
+    def revoke_user(self, user_id):
+        """사용자의 모든 세션(다른 기기 포함) 삭제 - 삭제한 세션 수 반환"""
+        redis_client = get_redis_connection()
+        if not redis_client:
+            return 0
+        user_key = f"{USER_SESSIONS_PREFIX}{user_id}"
+        sids = redis_client.smembers(user_key)
+        pipe = redis_client.pipeline(transaction=False)
+        for sid in sids:
+            pipe.delete(f"{SESSION_KEY_PREFIX}{sid}")
+        pipe.delete(user_key)
+        pipe.execute()
+        self.forget(*sids)
+        return len(sids)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'local_entries': len(self._local),
+                'local_hits': self.local_hits,
+                'local_misses': self.local_misses,
+                'refreshes': self.refreshes,
+                'ttl_s': SESSION_TTL,
+                'refresh_interval_s': SESSION_REFRESH_INTERVAL,
+                'local_ttl_s': SESSION_LOCAL_TTL
+            }
+
+session_interface = RedisSessionInterface()
+app.session_interface = session_interface
 
 # 로그인 데코레이터
 def login_required(f):
@@ -199,52 +1475,585 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# 메시지 쓰기 모드 - sync: 요청 안에서 DB 커밋, async: messages-ingest 토픽에 넣고 202 반환 (write-behind)
+MESSAGES_WRITE_MODE = os.getenv('MESSAGES_WRITE_MODE', 'sync')
+MESSAGES_INGEST_TOPIC = 'messages-ingest'
+MESSAGES_INGEST_ACK_TIMEOUT = float(os.getenv('MESSAGES_INGEST_ACK_TIMEOUT', 10))
+_ingest_producer = None
+_ingest_producer_pid = None
+_ingest_producer_lock = Lock()
+
+def get_ingest_producer():
+    """write-behind 용 워커별 Producer - 유실되면 안 되므로 acks=all"""
+    global _ingest_producer, _ingest_producer_pid
+    if _ingest_producer is not None and _ingest_producer_pid == os.getpid():
+        return _ingest_producer
+    with _ingest_producer_lock:
+        if _ingest_producer is None or _ingest_producer_pid != os.getpid():
+            _ingest_producer = get_kafka_producer(acks='all', linger_ms=5)
+            _ingest_producer_pid = os.getpid()
+    return _ingest_producer
+
+def enqueue_message(message, user_id, idempotency_key):
+    """메시지를 messages-ingest 토픽에 발행하고 브로커 확인까지 대기"""
+    producer = get_ingest_producer()
+    if producer is None:
+        raise RuntimeError("Kafka producer not available")
+    record = {
+        'idempotency_key': idempotency_key,
+        'message': message,
+        'user_id': user_id,
+        'created_at': datetime.now().isoformat()
+    }
+    # 같은 키는 같은 파티션으로 - 재전송 시 순서 유지
+    producer.send(MESSAGES_INGEST_TOPIC, record, key=idempotency_key.encode('utf-8')).get(
+        timeout=MESSAGES_INGEST_ACK_TIMEOUT)
+
 # MariaDB 엔드포인트
 @app.route('/db/message', methods=['POST'])
 @login_required
 def save_to_db():
     try:
         user_id = session['user_id']
-        db = get_db_connection()
         data = request.json
-        cursor = db.cursor()
-        sql = "INSERT INTO messages (message, created_at) VALUES (%s, %s)"
-        cursor.execute(sql, (data['message'], datetime.now()))
-        db.commit()
-        cursor.close()
-        db.close()
-        
+        if MESSAGES_WRITE_MODE == 'async':
+            # 클라이언트가 Idempotency-Key 를 주면 재시도해도 한 번만 저장됨
+            idempotency_key = request.headers.get('Idempotency-Key') or uuid.uuid4().hex
+            enqueue_message(data['message'], user_id, idempotency_key[:64])
+            mark_recent_write()
+            async_log_api_stats('/db/message', 'POST', 'accepted', user_id)
+            return jsonify({"status": "accepted", "idempotency_key": idempotency_key[:64]}), 202
+
+        # Idempotency-Key 를 주면 재시도해도 한 번만 저장됨 (messages.idempotency_key UNIQUE 키, 없으면 NULL)
+        idempotency_key = (request.headers.get('Idempotency-Key') or '')[:64] or None
+        # DATETIME 컬럼은 초 단위 - 피드 항목이 DB 에서 읽은 행과 같은 값을 갖도록 미리 자름
+        created_at = datetime.now().replace(microsecond=0)
+        with get_db_connection() as db:
+            cursor = db.cursor()
+            sql = "INSERT INTO messages (message, created_at, user_id, idempotency_key) VALUES (%s, %s, %s, %s)"
+            try:
+                cursor.execute(sql, (data['message'], created_at, user_id, idempotency_key))
+                message_id = cursor.lastrowid
+                db.commit()
+            except mysql.connector.IntegrityError as e:
+                if e.errno != errorcode.ER_DUP_ENTRY:
+                    raise
+                # 같은 키로 이미 저장된 요청의 재시도 - 다시 저장하지 않고 성공으로 응답
+                mark_recent_write()
+                async_log_api_stats('/db/message', 'POST', 'duplicate', user_id)
+                return jsonify({"status": "success", "idempotency_key": idempotency_key, "duplicate": True})
+            finally:
+                cursor.close()
+        mark_recent_write()
+        push_user_feed({'id': message_id, 'message': data['message'], 'created_at': created_at, 'user_id': user_id})
+
+        # 검색 캐시 무효화 (버전 증가)
+        bump_messages_version()
+
         # 로깅
         log_to_redis('db_insert', f"Message saved: {data['message'][:30]}...")
         
         async_log_api_stats('/db/message', 'POST', 'success', user_id)
-        return jsonify({"status": "success"})
+        return jsonify({"status": "success", "idempotency_key": idempotency_key})
     except Exception as e:
         async_log_api_stats('/db/message', 'POST', 'error', user_id)
         log_to_redis('db_insert_error', str(e))
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# 대량 메시지 저장 설정
+BULK_INSERT_CHUNK_SIZE = int(os.getenv('BULK_INSERT_CHUNK_SIZE', 500))
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', 10000))
+BULK_MAX_ERRORS_REPORTED = 100
+
+def iter_bulk_items():
+    """요청 본문에서 (index, message, error) 를 순서대로 생성 - JSON 배열 또는 NDJSON 스트림"""
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        # NDJSON 은 한 줄씩 읽어 본문 전체를 메모리에 올리지 않음
+        index = 0
+        for line in request.stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield (index,) + validate_bulk_item(loads(line))
+            except ValueError as e:
+                yield index, None, f"잘못된 JSON: {str(e)}"
+            index += 1
+    else:
+        items = request.get_json(silent=True)
+        if not isinstance(items, list):
+            raise ValueError("요청 본문은 JSON 배열 또는 NDJSON 이어야 합니다")
+        for index, item in enumerate(items):
+            yield (index,) + validate_bulk_item(item)
+
+def validate_bulk_item(item):
+    # 문자열 또는 {"message": "..."} 형식 허용
+    message = item.get('message') if isinstance(item, dict) else item
+    if not isinstance(message, str) or not message.strip():
+        return None, "message 는 비어 있지 않은 문자열이어야 합니다"
+    return message, None
+
+@app.route('/db/messages/bulk', methods=['POST'])
+@login_required
+def save_bulk_to_db():
+    user_id = session['user_id']
+    inserted = 0
+    failed = 0
+    errors = []
+    try:
+        sql = "INSERT INTO messages (message, created_at, user_id) VALUES (%s, %s, %s)"
+        with get_db_connection() as db:
+            cursor = db.cursor()
+            try:
+                db.start_transaction()
+                chunk = []
+                for index, message, error in iter_bulk_items():
+                    if index >= BULK_MAX_ITEMS:
+                        raise ValueError(f"한 번에 최대 {BULK_MAX_ITEMS}개까지 저장할 수 있습니다")
+                    if error:
+                        failed += 1
+                        if len(errors) < BULK_MAX_ERRORS_REPORTED:
+                            errors.append({'index': index, 'error': error})
+                        continue
+                    chunk.append((message, datetime.now(), user_id))
+                    if len(chunk) >= BULK_INSERT_CHUNK_SIZE:
+                        # executemany 가 다중 VALUES INSERT 한 문장으로 변환
+                        cursor.executemany(sql, chunk)
+                        inserted += len(chunk)
+                        chunk = []
+                if chunk:
+                    cursor.executemany(sql, chunk)
+                    inserted += len(chunk)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                cursor.close()
+    except ValueError as e:
+        async_log_api_stats('/db/messages/bulk', 'POST', 'error', user_id)
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        async_log_api_stats('/db/messages/bulk', 'POST', 'error', user_id)
+        log_to_redis('db_bulk_insert_error', str(e))
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+    if inserted:
+        # 배치 단위로 한 번만 캐시 무효화/로깅
+        mark_recent_write()
+        invalidate_user_feeds([user_id])
+        bump_messages_version()
+        log_to_redis('db_bulk_insert', f"Bulk saved: {inserted} messages ({failed} failed)")
+    async_log_api_stats('/db/messages/bulk', 'POST', 'success' if not failed else 'partial', user_id)
+    return jsonify({
+        'status': 'success' if not failed else 'partial',
+        'inserted': inserted,
+        'failed': failed,
+        'errors': errors
+    })
+
+# 메시지 목록 페이지 크기 제한
+MESSAGES_DEFAULT_PAGE_SIZE = int(os.getenv('MESSAGES_DEFAULT_PAGE_SIZE', 20))
+MESSAGES_MAX_PAGE_SIZE = int(os.getenv('MESSAGES_MAX_PAGE_SIZE', 100))
+
+def parse_page_size(value):
+    """limit 파라미터를 1..MESSAGES_MAX_PAGE_SIZE 범위로 보정"""
+    try:
+        limit = int(value) if value is not None else MESSAGES_DEFAULT_PAGE_SIZE
+    except ValueError:
+        limit = MESSAGES_DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MESSAGES_MAX_PAGE_SIZE))
+
+def encode_cursor(row, time_key='created_at'):
+    """마지막 행의 (시각, id) 를 불투명한 커서 문자열로 인코딩 - 시각이 NULL 인 이전 행은 id 만 담음"""
+    timestamp = row[time_key]
+    raw = f"{timestamp.isoformat() if timestamp else ''}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+    created_at, row_id = raw.rsplit('|', 1)
+    return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+
+def keyset_condition(time_column, after, nullable=True):
+    """(시각, id) 내림차순 키셋 조건 - (sql, params)
+
+    nullable 이면 DESC 정렬에서 맨 뒤에 오는 NULL 시각 행까지 이어서 읽는다.
+    인덱스에서 NULL 은 가장 작은 값이라 같은 범위 스캔의 연장이다.
+    """
+    after_time, after_id = after
+    if after_time is None:
+        return f"({time_column} IS NULL AND id < %s)", [after_id]
+    condition = f"{time_column} < %s OR ({time_column} = %s AND id < %s)"
+    if nullable:
+        condition += f" OR {time_column} IS NULL"
+    return f"({condition})", [after_time, after_time, after_id]
+
+def build_messages_page_query(after, limit, user=None):
+    """(created_at, id) 복합 인덱스를 타는 키셋 페이지 쿼리 - 깊은 페이지도 범위 스캔
+
+    user 가 있으면 (user_id, created_at, id) 인덱스로 해당 사용자의 메시지만 조회
+    """
+    sql = "SELECT id, message, created_at, user_id FROM messages"
+    conditions = []
+    params = []
+    if user:
+        conditions.append("user_id = %s")
+        params.append(user)
+    if after:
+        condition, condition_params = keyset_condition('created_at', after)
+        conditions.append(condition)
+        params.extend(condition_params)
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY created_at DESC, id DESC LIMIT %s"
+    params.append(limit + 1)
+    return sql, params
+
+def split_page(rows, limit, time_key='created_at'):
+    """limit + 1 개 조회 결과를 (페이지, next_cursor) 로 분리"""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1], time_key=time_key)
+    return rows, None
+
+# 사용자별 최근 메시지 피드 - 첫 페이지는 MariaDB 없이 Redis 에서 응답
+# feed:user:{user}      ZSET  member = 12자리 id, score = created_at(초)
+#                             → 같은 초 안에서는 member 사전순 = id 순이라 DB 의 (created_at, id) 정렬과 같음
+# feed:user:{user}:msgs HASH  member → 메시지 JSON
+# feed:user:{user}:ver  쓰기마다 증가 - 재구성 도중 쓰기가 있었으면 재구성 결과를 버림
+USER_FEED_SIZE = int(os.getenv('USER_FEED_SIZE', 200))
+USER_FEED_TTL = int(os.getenv('USER_FEED_TTL', 86400))
+
+# 피드가 있을 때만 새 메시지를 넣고 USER_FEED_SIZE 개로 자름 (없으면 다음 조회 때 DB 에서 재구성)
+USER_FEED_PUSH_SCRIPT = redis_client_shared.register_script("""
+redis.call('incr', KEYS[3])
+redis.call('expire', KEYS[3], ARGV[5])
+if redis.call('exists', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('zadd', KEYS[1], ARGV[2], ARGV[1])
+redis.call('hset', KEYS[2], ARGV[1], ARGV[3])
+local keep = tonumber(ARGV[4])
+local stale = redis.call('zrange', KEYS[1], 0, -(keep + 1))
+if #stale > 0 then
+    redis.call('zremrangebyrank', KEYS[1], 0, -(keep + 1))
+    redis.call('hdel', KEYS[2], unpack(stale))
+end
+redis.call('expire', KEYS[1], ARGV[5])
+redis.call('expire', KEYS[2], ARGV[5])
+return 1
+""")
+
+# 조회 시점의 버전이 그대로이고 피드가 아직 없을 때만 채움
+USER_FEED_REBUILD_SCRIPT = redis_client_shared.register_script("""
+if (redis.call('get', KEYS[3]) or '') ~= ARGV[1] or redis.call('exists', KEYS[1]) == 1 then
+    return 0
+end
+for i = 3, #ARGV, 3 do
+    redis.call('zadd', KEYS[1], ARGV[i], ARGV[i + 1])
+    redis.call('hset', KEYS[2], ARGV[i + 1], ARGV[i + 2])
+end
+redis.call('expire', KEYS[1], ARGV[2])
+redis.call('expire', KEYS[2], ARGV[2])
+return 1
+""")
+
+# 피드가 있으면 {1, 최신 메시지...}, 없으면 {0, 현재 버전}
+USER_FEED_READ_SCRIPT = redis_client_shared.register_script("""
+local ids = redis.call('zrevrange', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #ids == 0 then
+    return {0, redis.call('get', KEYS[3]) or ''}
+end
+local result = redis.call('hmget', KEYS[2], unpack(ids))
+table.insert(result, 1, 1)
+return result
+""")
+
+def user_feed_keys(user):
+    return [f"feed:user:{user}", f"feed:user:{user}:msgs", f"feed:user:{user}:ver"]
+
+def user_feed_entry(row):
+    """(score, member, body) - DB 행과 저장 직후의 행 모두 같은 형식"""
+    return int(row['created_at'].timestamp()), f"{row['id']:012d}", dumps(row)
+
+def user_feed_rebuild_args(rows, version):
+    args = [version, USER_FEED_TTL]
+    for row in rows[:USER_FEED_SIZE]:
+        args.extend(user_feed_entry(row))
+    return args
+
+def parse_user_feed(result):
+    """USER_FEED_READ_SCRIPT 결과 - (행 목록 또는 None, 재구성용 버전)"""
+    if int(result[0]) == 0:
+        return None, result[1]
+    rows = []
+    for body in result[1:]:
+        if body is None:
+            # 피드와 본문 해시가 어긋난 경우 - DB 로 대체
+            return None, None
+        row = loads(body)
+        row['created_at'] = datetime.fromisoformat(row['created_at'])
+        rows.append(row)
+    return rows, None
+
+def push_user_feed(row):
+    try:
+        redis_client = get_redis_connection()
+        if redis_client:
+            score, member, body = user_feed_entry(row)
+            USER_FEED_PUSH_SCRIPT(keys=user_feed_keys(row['user_id']),
+                                  args=[member, score, body, USER_FEED_SIZE, USER_FEED_TTL])
+    except Exception as e:
+        print(f"User feed update error: {str(e)}")
+
+def invalidate_user_feeds(users):
+    """id 를 알 수 없는 대량/비동기 저장 후 - 피드를 지우고 다음 조회 때 재구성"""
+    if not users:
+        return
+    try:
+        redis_client = get_redis_connection()
+        if redis_client:
+            pipe = redis_client.pipeline()
+            for user in users:
+                feed_key, msgs_key, ver_key = user_feed_keys(user)
+                pipe.incr(ver_key)
+                pipe.expire(ver_key, USER_FEED_TTL)
+                pipe.delete(feed_key, msgs_key)
+            pipe.execute()
+    except Exception as e:
+        print(f"User feed invalidation error: {str(e)}")
+
+def load_user_feed_page(user, limit):
+    """사용자 메시지 첫 페이지 - (메시지, next_cursor), 피드를 쓸 수 없으면 None"""
+    if limit >= USER_FEED_SIZE:
+        return None
+    redis_client = get_redis_connection()
+    if not redis_client:
+        return None
+    keys = user_feed_keys(user)
+    try:
+        rows, version = parse_user_feed(USER_FEED_READ_SCRIPT(keys=keys, args=[limit + 1]))
+    except Exception as e:
+        print(f"User feed read error: {str(e)}")
+        return None
+    if rows is not None:
+        incr_cache_metric('feed_hits')
+        return split_page(rows, limit)
+    incr_cache_metric('feed_misses')
+    if version is None:
+        return None
+
+    # 재구성은 복제 지연이 없는 primary 기준으로 (버전 비교가 놓친 쓰기를 복제본이 아직 모를 수 있음)
+    sql, params = build_messages_page_query(None, USER_FEED_SIZE - 1, user=user)
+    with get_db_connection() as db:
+        cursor = db.cursor(dictionary=True)
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        cursor.close()
+    if rows:
+        try:
+            USER_FEED_REBUILD_SCRIPT(keys=keys, args=user_feed_rebuild_args(rows, version))
+        except Exception as e:
+            print(f"User feed rebuild error: {str(e)}")
+    return split_page(rows[:limit + 1], limit)
+
+# 대용량 조회 스트리밍 응답 - ?stream=1 이면 기존과 같은 JSON 을 행 단위로, ?format=ndjson 이면 한 줄에 한 행
+STREAM_MAX_ROWS = int(os.getenv('STREAM_MAX_ROWS', 100000))
+STREAM_FETCH_SIZE = int(os.getenv('STREAM_FETCH_SIZE', 500))
+
+def stream_format(req=None):
+    """스트리밍 요청이면 'json' 또는 'ndjson', 아니면 None (req 는 Flask/Quart 요청 객체)"""
+    req = req or request
+    if req.args.get('format') == 'ndjson' or req.accept_mimetypes.best == 'application/x-ndjson':
+        return 'ndjson'
+    if req.args.get('stream') == '1':
+        return 'json'
+    return None
+
+def parse_stream_limit(value, default):
+    """스트리밍 모드의 limit - 페이지 크기 제한 대신 STREAM_MAX_ROWS 까지 허용"""
+    try:
+        limit = int(value) if value is not None else default
+    except ValueError:
+        limit = default
+    return max(1, min(limit, STREAM_MAX_ROWS))
+
+def iter_query_rows(sql, params, read_only=True):
+    """unbuffered 커서로 쿼리를 실행하고 행을 하나씩 돌려주는 제너레이터 반환
+
+    실행 오류는 호출 시점에 바로 발생하고, 결과는 STREAM_FETCH_SIZE 씩 소켓에서 읽어
+    결과 전체를 메모리에 올리지 않는다.
+    """
+    db = get_db_connection(read_only=read_only)
+    try:
+        cursor = db.cursor(dictionary=True, buffered=False)
+        cursor.execute(sql, params)
+    except Exception:
+        db.close(discard=True)
+        raise
+    return _iter_cursor(db, cursor)
+
+def _iter_cursor(db, cursor):
+    completed = False
+    try:
+        while True:
+            rows = cursor.fetchmany(STREAM_FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                yield row
+        completed = True
+    finally:
+        if completed:
+            cursor.close()
+            db.close()
+        else:
+            # 클라이언트 연결 종료 등으로 중간에 멈추면 읽지 않은 결과가 남은 커넥션은 폐기
+            db.close(discard=True)
+
+class StreamPageWriter:
+    """limit + 1 개를 읽는 쿼리 결과를 스트리밍 응답 조각으로 변환 (Flask/Quart 경로 공용)
+
+    json 은 {"status", "data": [...], "count", marker_key, **extra} 형식을 앞에서부터 써 내려가고,
+    ndjson 은 행만 한 줄씩 쓴다 (다음 페이지 정보 없음).
+    """
+    def __init__(self, limit, fmt, transform=None, next_marker=None, marker_key='next_cursor', extra=None):
+        self.limit = limit
+        self.fmt = fmt
+        self.transform = transform
+        self.next_marker = next_marker
+        self.marker_key = marker_key
+        self.extra = extra
+        self.count = 0
+        self.last = None
+        self.mimetype = 'application/x-ndjson' if fmt == 'ndjson' else 'application/json'
+
+    def head(self):
+        return '{"status": "success", "data": [' if self.fmt == 'json' else ''
+
+    def row(self, row):
+        """행 하나의 조각 - 다음 페이지 여부 확인용 한 행(limit 초과)은 빈 문자열"""
+        self.count += 1
+        if self.count > self.limit:
+            return ''
+        item = dumps(self.transform(row) if self.transform else row)
+        self.last = row
+        if self.fmt == 'json':
+            return item if self.count == 1 else ',' + item
+        return item + '\n'
+
+    def tail(self):
+        if self.fmt != 'json':
+            return ''
+        has_more = self.count > self.limit and self.next_marker
+        tail = {
+            'count': min(self.count, self.limit),
+            self.marker_key: self.next_marker(self.last) if has_more else None
+        }
+        tail.update(self.extra or {})
+        return '], ' + dumps(tail)[1:]
+
+def stream_page_response(rows, limit, fmt, transform=None, next_marker=None, marker_key='next_cursor', extra=None):
+    """iter_query_rows 결과를 StreamPageWriter 형식의 스트리밍 응답으로 반환"""
+    writer = StreamPageWriter(limit, fmt, transform, next_marker, marker_key, extra)
+
+    def generate():
+        try:
+            head = writer.head()
+            if head:
+                yield head
+            for row in rows:
+                # limit 을 넘는 행도 끝까지 읽어 커넥션을 재사용
+                chunk = writer.row(row)
+                if chunk:
+                    yield chunk
+            tail = writer.tail()
+            if tail:
+                yield tail
+        except Exception as e:
+            # 헤더가 이미 전송되어 상태 코드를 바꿀 수 없으므로 응답을 끊어 불완전함을 알림
+            print(f"Streaming response error: {str(e)}")
+            raise
+        finally:
+            rows.close()
+
+    response = Response(generate(), mimetype=writer.mimetype)
+    response.headers['X-Accel-Buffering'] = 'no'  # ingress(nginx) 버퍼링 끄기
+    return response
+
 @app.route('/db/messages', methods=['GET'])
 @login_required
 def get_from_db():
     try:
         user_id = session['user_id']
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM messages ORDER BY created_at DESC")
-        messages = cursor.fetchall()
-        cursor.close()
-        db.close()
-        
+        fmt = stream_format()
+        if fmt:
+            limit = parse_stream_limit(request.args.get('limit'), MESSAGES_DEFAULT_PAGE_SIZE)
+        else:
+            limit = parse_page_size(request.args.get('limit'))
+        cursor_param = request.args.get('cursor')
+        try:
+            after = decode_cursor(cursor_param) if cursor_param else None
+        except (ValueError, UnicodeDecodeError):
+            return jsonify({"status": "error", "message": "잘못된 cursor 값입니다"}), 400
+
+        # ?user= 이면 해당 사용자의 메시지만 (첫 페이지는 Redis 피드에서)
+        feed_user = request.args.get('user')
+        sql, params = build_messages_page_query(after, limit, user=feed_user)
+        if fmt:
+            response = stream_page_response(iter_query_rows(sql, params), limit, fmt, next_marker=encode_cursor)
+            async_log_api_stats('/db/messages', 'GET', 'success', user_id)
+            return response
+
+        page = load_user_feed_page(feed_user, limit) if feed_user and after is None else None
+        if page is None:
+            with get_db_connection(read_only=True) as db:
+                cursor = db.cursor(dictionary=True)
+                cursor.execute(sql, params)
+                messages = cursor.fetchall()
+                cursor.close()
+            page = split_page(messages, limit)
+        messages, next_cursor = page
+
         # 비동기 로깅으로 변경
         async_log_api_stats('/db/messages', 'GET', 'success', user_id)
-        
-        return jsonify(messages)
+
+        return jsonify({
+            'status': 'success',
+            'data': messages,
+            'count': len(messages),
+            'next_cursor': next_cursor
+        })
     except Exception as e:
         if 'user_id' in session:
             async_log_api_stats('/db/messages', 'GET', 'error', session['user_id'])
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# Prometheus 메트릭 (PROMETHEUS_MULTIPROC_DIR 가 있으면 모든 gunicorn 워커 합산)
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    if not METRICS_ENABLED:
+        return jsonify({"status": "error", "message": "메트릭이 비활성화되어 있습니다"}), 404
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+# DB 커넥션 풀 상태 조회 (파드별 풀 크기 조정용)
+@app.route('/db/pool/stats', methods=['GET'])
+def get_db_pool_statistics():
+    """DB 커넥션 풀 통계 조회"""
+    try:
+        stats = db_pool.stats()
+        if replica_router is not None:
+            stats['replicas'] = replica_router.stats()
+        return jsonify(stats)
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
 # Redis 로그 조회
 @app.route('/logs/redis', methods=['GET'])
 def get_redis_logs():
@@ -252,13 +2061,191 @@ def get_redis_logs():
         redis_client = get_redis_connection()
         if redis_client:
             logs = redis_client.lrange('api_logs', 0, -1)
-            redis_client.close()
-            return jsonify([json.loads(log) for log in logs])
+            return jsonify([loads(log) for log in logs])
         else:
             return jsonify({"status": "error", "message": "Redis 연결 불가"}), 500
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# 실시간 로그 tail (SSE) - 워커당 XREAD 스레드 하나가 모든 연결에 이벤트를 나눠 줌
+# 연결마다 gthread 스레드를 하나씩 점유하므로 워커 스레드의 1/4 까지만 허용 (나머지는 일반 요청용)
+LOG_TAIL_MAX_CLIENTS = max(1, min(int(os.getenv('LOG_TAIL_MAX_CLIENTS', 50)),
+                                  int(os.getenv('GUNICORN_THREADS', 4)) // 4))
+LOG_TAIL_CLIENT_QUEUE = int(os.getenv('LOG_TAIL_CLIENT_QUEUE', 500))
+LOG_TAIL_HEARTBEAT_S = 15
+LOG_TAIL_BLOCK_MS = 5000
+
+def parse_stream_id(stream_id):
+    ms, seq = stream_id.split('-')
+    return int(ms), int(seq)
+
+class LogTailSubscriber:
+    """SSE 연결 하나의 이벤트 큐 - 가득 차면 오래된 이벤트부터 버리고 개수를 알림 (느린 클라이언트 격리)"""
+    def __init__(self, types, max_queue):
+        self.types = types
+        self.max_queue = max_queue
+        self.after_id = None  # 재연결 backfill 로 이미 보낸 마지막 ID
+        self._cond = Condition()
+        self._events = deque()
+        self._dropped = 0
+
+    def push(self, event):
+        with self._cond:
+            if len(self._events) >= self.max_queue:
+                self._events.popleft()
+                self._dropped += 1
+            self._events.append(event)
+            self._cond.notify()
+
+    def wait(self, timeout):
+        """쌓인 이벤트와 버려진 개수를 꺼냄 - 없으면 timeout 까지 대기"""
+        with self._cond:
+            if not self._events:
+                self._cond.wait(timeout)
+            events = list(self._events)
+            self._events.clear()
+            dropped, self._dropped = self._dropped, 0
+        return events, dropped
+
+class LogTailHub:
+    def __init__(self, key, max_clients, client_queue):
+        self.key = key
+        self.max_clients = max_clients
+        self.client_queue = client_queue
+        self._lock = Condition()
+        self._subscribers = set()
+        self._pid = None
+        self.delivered = 0
+        self.rejected = 0
+
+    def _ensure_started(self):
+        # fork 이후 자식 프로세스에서 구독 스레드를 새로 시작
+        if self._pid == os.getpid():
+            return
+        self._subscribers = set()
+        Thread(target=self._run, name='log-tail-hub', daemon=True).start()
+        self._pid = os.getpid()
+
+    def subscribe(self, types):
+        with self._lock:
+            self._ensure_started()
+            if len(self._subscribers) >= self.max_clients:
+                self.rejected += 1
+                return None
+            subscriber = LogTailSubscriber(types, self.client_queue)
+            self._subscribers.add(subscriber)
+            self._lock.notify()
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def _run(self):
+        # 블로킹 XREAD 전용 연결 (공용 풀의 socket_timeout 보다 오래 대기)
+        client = redis.Redis(
+            host=os.getenv('REDIS_HOST', 'my-redis-master'),
+            port=6379,
+            password=os.getenv('REDIS_PASSWORD'),
+            decode_responses=True,
+            db=0,
+            socket_connect_timeout=5,
+            socket_timeout=LOG_TAIL_BLOCK_MS / 1000.0 + 5
+        )
+        last_id = None
+        while True:
+            with self._lock:
+                while not self._subscribers:
+                    # 구독자가 없으면 읽지 않음 - 새 구독자는 Last-Event-ID 로 필요한 만큼 backfill
+                    last_id = None
+                    self._lock.wait()
+            try:
+                if last_id is None:
+                    latest = client.xrevrange(self.key, count=1)
+                    last_id = latest[0][0] if latest else '0-0'
+                response = client.xread({self.key: last_id}, count=500, block=LOG_TAIL_BLOCK_MS)
+            except Exception as e:
+                print(f"Log tail read error: {str(e)}")
+                time.sleep(1)
+                continue
+            for _, entries in response or []:
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    self._fan_out((entry_id, fields.get('type'), fields.get('data')))
+
+    def _fan_out(self, event):
+        with self._lock:
+            subscribers = [s for s in self._subscribers if event[1] in s.types]
+        for subscriber in subscribers:
+            subscriber.push(event)
+        self.delivered += len(subscribers)
+
+    def stats(self):
+        with self._lock:
+            clients = len(self._subscribers)
+        return {
+            'clients': clients,
+            'max_clients': self.max_clients,
+            'delivered': self.delivered,
+            'rejected': self.rejected
+        }
+
+log_tail_hub = LogTailHub(LOG_STREAM_KEY, LOG_TAIL_MAX_CLIENTS, LOG_TAIL_CLIENT_QUEUE)
+
+def format_sse(event_id, event_type, data):
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+@app.route('/logs/stream', methods=['GET'])
+@login_required
+def stream_logs():
+    """Redis 작업 로그(redis)와 API 로그(kafka)를 Server-Sent Events 로 실시간 전송"""
+    types = set(filter(None, request.args.get('types', 'redis,kafka').split(',')))
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        after = parse_stream_id(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({"status": "error", "message": "잘못된 Last-Event-ID 입니다"}), 400
+
+    subscriber = log_tail_hub.subscribe(types)
+    if subscriber is None:
+        return jsonify({"status": "error", "message": "실시간 로그 연결 수가 한도에 도달했습니다"}), 503
+
+    backfill = []
+    if after:
+        # 재연결 - 구독을 먼저 등록한 뒤 놓친 구간을 스트림에서 읽으므로 빈틈이 없음
+        try:
+            redis_client = get_redis_connection()
+            if redis_client:
+                backfill = redis_client.xrange(LOG_STREAM_KEY, min=f"({last_event_id}", count=LOG_TAIL_CLIENT_QUEUE)
+        except Exception as e:
+            print(f"Log tail backfill error: {str(e)}")
+        subscriber.after_id = parse_stream_id(backfill[-1][0]) if backfill else after
+
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            for entry_id, fields in backfill:
+                if fields.get('type') in types:
+                    yield format_sse(entry_id, fields.get('type'), fields.get('data'))
+            while True:
+                events, dropped = subscriber.wait(LOG_TAIL_HEARTBEAT_S)
+                if dropped:
+                    yield f"event: dropped\ndata: {dropped}\n\n"
+                if not events and not dropped:
+                    # 프록시 유휴 타임아웃 방지 및 끊긴 연결 감지
+                    yield ": keepalive\n\n"
+                for entry_id, event_type, data in events:
+                    if subscriber.after_id and parse_stream_id(entry_id) <= subscriber.after_id:
+                        continue
+                    yield format_sse(entry_id, event_type, data)
+        finally:
+            log_tail_hub.unsubscribe(subscriber)
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 # Redis 캐시 관리 엔드포인트들
 @app.route('/cache/stats', methods=['GET'])
 @login_required
@@ -289,6 +2276,7 @@ def delete_search_cache(query):
         if redis_client:
             cache_key = f"search:{query}"
             deleted = redis_client.delete(cache_key)
+            publish_search_invalidation(query)
             if deleted:
                 return jsonify({"status": "success", "message": f"'{query}' 검색 캐시가 삭제되었습니다"})
             else:
@@ -298,6 +2286,139 @@ def delete_search_cache(query):
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# 사용자명 존재 여부 블룸 필터 (Redis 비트맵) - "없음" 판정은 DB 조회 없이 확정
+USERNAME_BLOOM_KEY = 'users:bloom'
+USERNAME_BLOOM_READY_KEY = 'users:bloom:ready'
+USERNAME_BLOOM_BITS = int(os.getenv('USERNAME_BLOOM_BITS', 1 << 24))  # 2MB, 약 100만 명까지 오탐률 1% 미만
+USERNAME_BLOOM_HASHES = int(os.getenv('USERNAME_BLOOM_HASHES', 7))
+USERNAME_BLOOM_LOCK_KEY = f"{USERNAME_BLOOM_READY_KEY}:lock"
+USERNAME_BLOOM_LOCK_TTL_MS = 60000
+USERNAME_BLOOM_BUILD_CHUNK = 5000
+USERNAME_BLOOM_RETRY_S = 30  # 다른 워커가 생성 중이거나 실패했을 때 다시 시도하는 간격
+
+def username_bloom_offsets(username):
+    # 64비트 해시 두 개로 k 개의 위치 생성 (Kirsch-Mitzenmacher)
+    digest = hashlib.blake2b(username.encode('utf-8'), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'big')
+    h2 = int.from_bytes(digest[8:], 'big') | 1
+    return [(h1 + i * h2) % USERNAME_BLOOM_BITS for i in range(USERNAME_BLOOM_HASHES)]
+
+def add_usernames_to_bloom(redis_client, usernames):
+    pipe = redis_client.pipeline(transaction=False)
+    for username in usernames:
+        for offset in username_bloom_offsets(username):
+            pipe.setbit(USERNAME_BLOOM_KEY, offset, 1)
+    pipe.execute()
+
+def build_username_bloom(redis_client):
+    """users 테이블 전체로 블룸 필터 생성 - 여러 워커가 동시에 만들지 않도록 Redis 락 사용
+
+    unbuffered 커서로 USERNAME_BLOOM_BUILD_CHUNK 개씩 읽어 사용자 수와 무관하게 메모리 사용이 일정하다.
+    생성 중에 가입한 사용자는 remember_username 이 같은 비트맵에 추가하므로 빠지지 않는다.
+    """
+    token = uuid.uuid4().hex
+    if not redis_client.set(USERNAME_BLOOM_LOCK_KEY, token, nx=True, px=USERNAME_BLOOM_LOCK_TTL_MS):
+        return False
+    try:
+        # 복제본 지연으로 최근 가입자가 빠지지 않도록 primary 에서 읽음
+        rows = iter_query_rows("SELECT username FROM users", (), read_only=False)
+        try:
+            chunk = []
+            for row in rows:
+                chunk.append(row['username'])
+                if len(chunk) >= USERNAME_BLOOM_BUILD_CHUNK:
+                    add_usernames_to_bloom(redis_client, chunk)
+                    chunk = []
+                    # 사용자가 많아 오래 걸려도 락이 만료되어 다른 워커가 중복 생성하지 않도록 연장
+                    redis_client.pexpire(USERNAME_BLOOM_LOCK_KEY, USERNAME_BLOOM_LOCK_TTL_MS)
+            if chunk:
+                add_usernames_to_bloom(redis_client, chunk)
+        finally:
+            rows.close()
+        redis_client.set(USERNAME_BLOOM_READY_KEY, 1)
+        print("Username bloom filter built")
+        return True
+    finally:
+        RELEASE_LOCK_SCRIPT(keys=[USERNAME_BLOOM_LOCK_KEY], args=[token])
+
+_username_bloom_build_lock = Lock()
+_username_bloom_thread = None
+_username_bloom_next_attempt = 0.0
+
+def _run_username_bloom_build():
+    try:
+        redis_client = get_redis_connection()
+        if redis_client and not redis_client.exists(USERNAME_BLOOM_READY_KEY):
+            build_username_bloom(redis_client)
+    except Exception as e:
+        print(f"Username bloom filter build error: {str(e)}")
+
+def start_username_bloom_build():
+    """블룸 필터가 없으면 백그라운드 스레드에서 생성 (워커 시작 시, 또는 준비 안 된 필터를 만났을 때)
+
+    프로세스당 스레드 하나, USERNAME_BLOOM_RETRY_S 마다 한 번만 시도하고 요청 스레드는 기다리지 않는다.
+    """
+    global _username_bloom_thread, _username_bloom_next_attempt
+    with _username_bloom_build_lock:
+        if _username_bloom_thread is not None and _username_bloom_thread.is_alive():
+            return
+        if time.monotonic() < _username_bloom_next_attempt:
+            return
+        _username_bloom_next_attempt = time.monotonic() + USERNAME_BLOOM_RETRY_S
+        _username_bloom_thread = Thread(target=_run_username_bloom_build, name='username-bloom', daemon=True)
+        _username_bloom_thread.start()
+
+def username_maybe_exists(username):
+    """False 면 확실히 없음, True 면 있을 수 있음, None 이면 블룸 필터 사용 불가 (DB 로 확인)"""
+    try:
+        redis_client = get_redis_connection()
+        if not redis_client:
+            return None
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.exists(USERNAME_BLOOM_READY_KEY)
+        for offset in username_bloom_offsets(username):
+            pipe.getbit(USERNAME_BLOOM_KEY, offset)
+        ready, *bits = pipe.execute()
+        if not ready:
+            # 준비될 때까지는 인덱스 조회로 응답하고 생성은 백그라운드에서
+            start_username_bloom_build()
+            return None
+        return all(bits)
+    except Exception as e:
+        print(f"Username bloom filter error: {str(e)}")
+        return None
+
+def remember_username(username):
+    try:
+        redis_client = get_redis_connection()
+        if redis_client:
+            add_usernames_to_bloom(redis_client, [username])
+    except Exception as e:
+        print(f"Username bloom filter error: {str(e)}")
+
+# 사용자명 사용 가능 여부 확인 (회원가입 폼용)
+@app.route('/register/check', methods=['GET'])
+def check_username():
+    try:
+        username = request.args.get('username', '')
+        if not username:
+            return jsonify({"status": "error", "message": "사용자명은 필수입니다"}), 400
+
+        maybe_exists = username_maybe_exists(username)
+        if maybe_exists is False:
+            return jsonify({"status": "success", "username": username, "available": True, "source": "bloom"})
+
+        # 블룸 필터 양성(오탐 가능) 또는 사용 불가 시에만 UNIQUE 인덱스로 확인
+        # 복제본 지연으로 잘못 "사용 가능" 이 나와도 가입 INSERT 가 중복을 거절함
+        with get_db_connection(read_only=True) as db:
+            cursor = db.cursor()
+            cursor.execute("SELECT 1 FROM users WHERE username = %s LIMIT 1", (username,))
+            exists = cursor.fetchone() is not None
+            cursor.close()
+        return jsonify({"status": "success", "username": username, "available": not exists, "source": "db"})
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
 # 회원가입 엔드포인트
 @app.route('/register', methods=['POST'])
 def register():
@@ -309,28 +2430,93 @@ def register():
         if not username or not password:
             return jsonify({"status": "error", "message": "사용자명과 비밀번호는 필수입니다"}), 400
             
-        # 비밀번호 해시화
-        hashed_password = generate_password_hash(password)
-        
-        db = get_db_connection()
-        cursor = db.cursor()
+        # 비밀번호 해시화 (해시 프로세스 풀에서 실행)
+        hashed_password = password_pool.run(hash_password, password)
         
-        # 사용자명 중복 체크
-        cursor.execute("SELECT username FROM users WHERE username = %s", (username,))
-        if cursor.fetchone():
-            return jsonify({"status": "error", "message": "이미 존재하는 사용자명입니다"}), 400
-        
-        # 사용자 정보 저장
-        sql = "INSERT INTO users (username, password) VALUES (%s, %s)"
-        cursor.execute(sql, (username, hashed_password))
-        db.commit()
-        cursor.close()
-        db.close()
+        # 중복 여부는 users.username UNIQUE 인덱스가 판단 (INSERT 한 번, 동시 가입에도 안전)
+        with get_db_connection() as db:
+            cursor = db.cursor()
+            try:
+                cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", (username, hashed_password))
+                db.commit()
+            except mysql.connector.IntegrityError as e:
+                if e.errno != errorcode.ER_DUP_ENTRY:
+                    raise
+                remember_username(username)
+                return jsonify({"status": "error", "message": "이미 존재하는 사용자명입니다"}), 400
+            finally:
+                cursor.close()
         
+        remember_username(username)
         return jsonify({"status": "success", "message": "회원가입이 완료되었습니다"})
+    except PasswordHashBusy as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# 로그인 시도 제한 - 사용자별/IP별 실패 횟수가 한도를 넘으면 해시 검증 전에 거절
+LOGIN_ATTEMPT_WINDOW = int(os.getenv('LOGIN_ATTEMPT_WINDOW', 300))
+LOGIN_MAX_ATTEMPTS_USER = int(os.getenv('LOGIN_MAX_ATTEMPTS_USER', 5))
+LOGIN_MAX_ATTEMPTS_IP = int(os.getenv('LOGIN_MAX_ATTEMPTS_IP', 50))
+# 백엔드는 프론트엔드 nginx 뒤에서만 노출되므로 nginx 가 덮어쓰는 X-Real-IP 를 클라이언트 주소로 사용
+CLIENT_IP_HEADER = os.getenv('CLIENT_IP_HEADER', 'X-Real-IP')
+
+def client_ip():
+    return (CLIENT_IP_HEADER and request.headers.get(CLIENT_IP_HEADER)) or request.remote_addr
+
+def find_user(username, read_only=False):
+    with get_db_connection(read_only=read_only) as db:
+        cursor = db.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
+        user = cursor.fetchone()
+        cursor.close()
+    return user
+
+def login_attempt_keys(username, ip):
+    return f"login_attempts:user:{username}", f"login_attempts:ip:{ip}"
+
+def login_blocked_for(username, ip):
+    """한도를 넘었으면 남은 차단 시간(초), 아니면 0 - Redis 장애 시에는 제한하지 않음"""
+    try:
+        redis_client = get_redis_connection()
+        if not redis_client:
+            return 0
+        user_key, ip_key = login_attempt_keys(username, ip)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get(user_key)
+        pipe.ttl(user_key)
+        pipe.get(ip_key)
+        pipe.ttl(ip_key)
+        user_count, user_ttl, ip_count, ip_ttl = pipe.execute()
+        if int(user_count or 0) >= LOGIN_MAX_ATTEMPTS_USER:
+            return max(user_ttl, 1)
+        if int(ip_count or 0) >= LOGIN_MAX_ATTEMPTS_IP:
+            return max(ip_ttl, 1)
+    except Exception as e:
+        print(f"Login limiter error: {str(e)}")
+    return 0
+
+def record_login_failure(username, ip):
+    try:
+        redis_client = get_redis_connection()
+        if redis_client:
+            pipe = redis_client.pipeline(transaction=False)
+            for key in login_attempt_keys(username, ip):
+                # 첫 실패에서만 창(window) 시작
+                pipe.set(key, 0, ex=LOGIN_ATTEMPT_WINDOW, nx=True)
+                pipe.incr(key)
+            pipe.execute()
+    except Exception as e:
+        print(f"Login limiter error: {str(e)}")
+
+def clear_login_failures(username):
+    try:
+        redis_client = get_redis_connection()
+        if redis_client:
+            redis_client.delete(f"login_attempts:user:{username}")
+    except Exception as e:
+        print(f"Login limiter error: {str(e)}")
+
 # 로그인 엔드포인트
 @app.route('/login', methods=['POST'])
 def login():
@@ -342,32 +2528,38 @@ def login():
         if not username or not password:
             return jsonify({"status": "error", "message": "사용자명과 비밀번호는 필수입니다"}), 400
         
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
-        user = cursor.fetchone()
-        cursor.close()
-        db.close()
+        ip = client_ip()
+        retry_after = login_blocked_for(username, ip)
+        if retry_after:
+            response = jsonify({"status": "error", "message": "로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요"})
+            response.headers['Retry-After'] = str(retry_after)
+            return response, 429
+        
+        user = find_user(username, read_only=True)
+        if user is None and replica_router is not None:
+            # 방금 가입해 복제본에 아직 없는 사용자일 수 있으므로 primary 에서 다시 확인
+            user = find_user(username)
         
-        if user and check_password_hash(user['password'], password):
+        verified, new_hash = password_pool.run(verify_and_rehash, user['password'], password) if user else (False, None)
+        if not verified:
+            record_login_failure(username, ip)
+        else:
+            clear_login_failures(username)
+            if new_hash:
+                # 예전 방식/비용의 해시는 로그인 성공 시 현재 설정으로 교체
+                with get_db_connection() as db:
+                    cursor = db.cursor()
+                    cursor.execute("UPDATE users SET password = %s WHERE username = %s AND password = %s",
+                                   (new_hash, username, user['password']))
+                    db.commit()
+                    cursor.close()
+
+            # 세션은 응답 시 Redis 에 한 번의 파이프라인으로 저장됨 - 브레이커가 열려 있으면 저장할 수 없음
+            # (클라이언트를 미리 가져오지 않아 half-open 시험 기회는 save_session 의 실제 쓰기가 사용)
+            if redis_breaker.state == 'open':
+                return jsonify({"status": "error", "message": "세션 저장소(Redis) 연결 불가"}), 503
             session['user_id'] = username  # 세션에 사용자 정보 저장
-            
-            # Redis 세션 저장 (선택적)
-            try:
-                redis_client = get_redis_connection()
-                if redis_client:
-                    session_data = {
-                        'user_id': username,
-                        'login_time': datetime.now().isoformat()
-                    }
-                    redis_client.set(f"session:{username}", json.dumps(session_data))
-                    redis_client.expire(f"session:{username}", 3600)
-                    redis_client.close()
-                else:
-                    print("Redis 연결 불가로 세션 저장 건너뜀")
-            except Exception as redis_error:
-                print(f"Redis session error: {str(redis_error)}")
-                # Redis 오류는 무시하고 계속 진행
+            session['login_time'] = datetime.now().isoformat()
             
             return jsonify({
                 "status": "success", 
@@ -377,6 +2569,8 @@ def login():
         
         return jsonify({"status": "error", "message": "잘못된 인증 정보"}), 401
         
+    except PasswordHashBusy as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
     except Exception as e:
         print(f"Login error: {str(e)}")  # 서버 로그에 에러 출력
         return jsonify({"status": "error", "message": "로그인 처리 중 오류가 발생했습니다"}), 500
@@ -388,22 +2582,17 @@ def logout():
         if 'user_id' in session:
             username = session['user_id']
             
-            # Redis 세션 삭제 시도 (Redis 오류는 무시하고 계속 진행)
-            try:
-                redis_client = get_redis_connection()
-                if redis_client:
-                    redis_client.delete(f"session:{username}")
-                    redis_client.close()
-                    print(f"Redis session deleted for user: {username}")
-                else:
-                    print("Redis 연결 불가로 세션 삭제 건너뜀")
-            except Exception as redis_error:
-                print(f"Redis session cleanup error (ignored): {str(redis_error)}")
-                # Redis 오류는 무시하고 계속 진행
+            # all=1 이면 다른 기기의 세션까지 모두 삭제 (Redis 오류는 무시하고 계속 진행)
+            if request.args.get('all') == '1':
+                try:
+                    revoked = session_interface.revoke_user(username)
+                    print(f"Revoked {revoked} sessions for user: {username}")
+                except Exception as redis_error:
+                    print(f"Redis session revoke error (ignored): {str(redis_error)}")
             
-            # Flask 세션에서 사용자 정보 제거 (이 부분은 반드시 실행되어야 함)
-            session.pop('user_id', None)
-            print(f"Flask session cleared for user: {username}")
+            # 현재 세션 비우기 - 응답 시 Redis 키와 쿠키가 삭제됨
+            session.clear()
+            print(f"Session cleared for user: {username}")
             
         return jsonify({"status": "success", "message": "로그아웃 성공"})
         
@@ -413,6 +2602,75 @@ def logout():
         # (Redis가 없어도 로그아웃은 가능해야 함)
         return jsonify({"status": "success", "message": "로그아웃 완료 (일부 정리 작업 실패)"}), 200
 
+# 전문 검색 설정 - InnoDB 기본 최소 토큰 길이(innodb_ft_min_token_size=3)보다 짧은 검색어는 LIKE 로 처리
+SEARCH_FULLTEXT_MIN_LENGTH = int(os.getenv('SEARCH_FULLTEXT_MIN_LENGTH', 3))
+FULLTEXT_OPERATORS = '+-<>()~*"@'
+
+def build_boolean_query(query):
+    """검색어를 BOOLEAN MODE 질의로 변환 (모든 단어 필수 + 접두어 일치)"""
+    terms = []
+    for term in query.split():
+        term = term.strip(FULLTEXT_OPERATORS)
+        if term:
+            terms.append(f"+{term}*")
+    return ' '.join(terms)
+
+def serialize_rows(rows):
+    """캐시/응답용으로 datetime 컬럼을 ISO 문자열로 변환"""
+    for row in rows:
+        for key, value in row.items():
+            if isinstance(value, datetime):
+                row[key] = value.isoformat()
+    return rows
+
+def build_search_query(query, mode, limit, offset):
+    """mode 에 따라 FULLTEXT 또는 LIKE 검색 쿼리 생성 - (sql, params)"""
+    if mode == 'fulltext':
+        sql = (
+            "SELECT id, message, created_at, user_id, "
+            "MATCH(message) AGAINST (%s IN BOOLEAN MODE) AS score "
+            "FROM messages WHERE MATCH(message) AGAINST (%s IN BOOLEAN MODE) "
+            "ORDER BY score DESC, created_at DESC, id DESC LIMIT %s OFFSET %s"
+        )
+        boolean_query = build_boolean_query(query)
+        return sql, (boolean_query, boolean_query, limit + 1, offset)
+    sql = (
+        "SELECT id, message, created_at, user_id FROM messages WHERE message LIKE %s "
+        "ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s"
+    )
+    return sql, (f"%{query}%", limit + 1, offset)
+
+def fetch_search_results(query, mode, limit, offset):
+    """mode 에 따라 FULLTEXT 또는 LIKE 로 검색"""
+    sql, params = build_search_query(query, mode, limit, offset)
+    with get_db_connection() as db:
+        cursor = db.cursor(dictionary=True)
+        cursor.execute(sql, params)
+        results = cursor.fetchall()
+        cursor.close()
+    return results
+
+def build_search_response(results, mode, limit, offset):
+    results = serialize_rows(results)
+    has_more = len(results) > limit
+    return {
+        'status': 'success',
+        'data': results[:limit],
+        'count': min(len(results), limit),
+        'mode': mode,
+        'next_offset': offset + limit if has_more else None
+    }
+
+def resolve_search_mode(query, requested):
+    """auto 모드에서는 짧은 검색어(또는 토큰이 없는 검색어)만 LIKE 로 fallback"""
+    if requested in ('fulltext', 'like'):
+        mode = requested
+    else:
+        mode = 'like' if len(query.strip()) < SEARCH_FULLTEXT_MIN_LENGTH else 'fulltext'
+    if mode == 'fulltext' and not build_boolean_query(query):
+        mode = 'like'
+    return mode
+
 # 메시지 검색 (DB에서 검색)
 @app.route('/db/messages/search', methods=['GET'])
 @login_required
@@ -420,29 +2678,47 @@ def search_messages():
     try:
         query = request.args.get('q', '')
         user_id = session['user_id']
-        
+        fmt = stream_format()
+        if fmt:
+            limit = parse_stream_limit(request.args.get('limit'), MESSAGES_DEFAULT_PAGE_SIZE)
+        else:
+            limit = parse_page_size(request.args.get('limit'))
+        try:
+            offset = max(0, int(request.args.get('offset', 0)))
+        except ValueError:
+            offset = 0
+        mode = resolve_search_mode(query, request.args.get('mode', 'auto'))
+        page_key = f"{mode}:{offset}:{limit}"
+
+        if fmt:
+            # 대용량 내보내기는 캐시하지 않고 DB 에서 바로 스트리밍
+            sql, params = build_search_query(query, mode, limit, offset)
+            response = stream_page_response(
+                iter_query_rows(sql, params), limit, fmt,
+                next_marker=lambda row: offset + limit,
+                marker_key='next_offset',
+                extra={'mode': mode}
+            )
+            async_log_api_stats('/db/messages/search', 'GET', 'success', user_id)
+            return response
+
         # Redis에서 검색 캐시 확인
-        cached_results = get_search_cache(query)
+        cached_results, version = get_search_cache(query, page_key)
         if cached_results:
             async_log_api_stats('/db/messages/search', 'GET', 'cache_hit', user_id)
             return jsonify(cached_results)
 
-        # DB에서 검색
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        sql = "SELECT * FROM messages WHERE message LIKE %s ORDER BY created_at DESC"
-        cursor.execute(sql, (f"%{query}%",))
-        results = cursor.fetchall()
-        cursor.close()
-        db.close()
-        
-        # Redis에 검색 결과 캐시
-        set_search_cache(query, results)
+        def load_from_db():
+            # DB에서 검색
+            return build_search_response(fetch_search_results(query, mode, limit, offset), mode, limit, offset)
+
+        # 캐시 미스 - 단일 조회(single-flight)로 DB 조회 후 Redis에 캐시
+        response = load_search_single_flight(query, page_key, version, load_from_db)
 
         # 검색 이력을 Kafka에 저장
         async_log_api_stats('/db/messages/search', 'GET', 'success', user_id)
-        
-        return jsonify(results)
+
+        return jsonify(response)
     except Exception as e:
         if 'user_id' in session:
             async_log_api_stats('/db/messages/search', 'GET', 'error', session['user_id'])
@@ -459,6 +2735,15 @@ def test_kafka_connection_endpoint():
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# Kafka 로그 전송 큐 상태
+@app.route('/logs/kafka/producer/stats', methods=['GET'])
+def get_kafka_producer_statistics():
+    """Kafka 로그 전송기 통계 조회"""
+    try:
+        return jsonify(kafka_log_shipper.stats())
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
 # Kafka 로그 조회 엔드포인트 (개선된 버전)
 @app.route('/logs/kafka', methods=['GET'])
 @login_required
@@ -478,19 +2763,46 @@ def get_kafka_logs():
         if request.args.get('end_date'):
             end_time = datetime.fromisoformat(request.args.get('end_date'))
         
-        logs = get_kafka_logs_with_filter(
-            limit=limit,
-            endpoint=endpoint,
-            status=status,
-            user_id=user_id,
-            start_time=start_time,
-            end_time=end_time
-        )
-        
+        fmt = stream_format()
+        if fmt and request.args.get('source') != 'kafka':
+            conditions, params = api_log_filter_conditions(endpoint, status, user_id, start_time, end_time)
+            return stream_api_logs(conditions, params, limit, request.args.get('cursor'), fmt, {
+                'filters': {
+                    'endpoint': endpoint,
+                    'status': status,
+                    'user_id': user_id,
+                    'start_date': request.args.get('start_date'),
+                    'end_date': request.args.get('end_date')
+                }
+            })
+
+        next_cursor = None
+        if request.args.get('source') == 'kafka':
+            # 색인 저장소에 아직 적재되지 않은 로그까지 토픽에서 직접 조회
+            logs = get_kafka_logs_with_filter(
+                limit=limit,
+                endpoint=endpoint,
+                status=status,
+                user_id=user_id,
+                start_time=start_time,
+                end_time=end_time
+            )
+        else:
+            logs, next_cursor = query_api_logs(
+                limit=limit,
+                endpoint=endpoint,
+                status=status,
+                user_id=user_id,
+                start_time=start_time,
+                end_time=end_time,
+                cursor=request.args.get('cursor')
+            )
+
         return jsonify({
             'status': 'success',
             'data': logs,
             'count': len(logs),
+            'next_cursor': next_cursor,
             'filters': {
                 'endpoint': endpoint,
                 'status': status,
@@ -529,12 +2841,33 @@ def search_kafka_logs_endpoint():
             return jsonify({"status": "error", "message": "검색어를 입력해주세요"}), 400
         
         limit = int(request.args.get('limit', 50))
-        results = search_kafka_logs(query, limit)
-        
+        next_cursor = None
+        if request.args.get('source') == 'kafka':
+            results = search_kafka_logs(query, limit)
+        else:
+            start_time = None
+            end_time = None
+            if request.args.get('start_date'):
+                start_time = datetime.fromisoformat(request.args.get('start_date'))
+            if request.args.get('end_date'):
+                end_time = datetime.fromisoformat(request.args.get('end_date'))
+            fmt = stream_format()
+            if fmt:
+                conditions, params = api_log_search_conditions(query, start_time, end_time)
+                return stream_api_logs(conditions, params, limit, request.args.get('cursor'), fmt, {'query': query})
+            results, next_cursor = search_api_logs(
+                query,
+                limit=limit,
+                start_time=start_time,
+                end_time=end_time,
+                cursor=request.args.get('cursor')
+            )
+
         return jsonify({
             'status': 'success',
             'data': results,
             'count': len(results),
+            'next_cursor': next_cursor,
             'query': query
         })
     except Exception as e:
@@ -594,7 +2927,7 @@ def get_error_logs():
     """최근 에러 로그 조회"""
     try:
         limit = int(request.args.get('limit', 20))
-        logs = get_kafka_logs_with_filter(limit=limit, status='error')
+        logs, _ = query_api_logs(limit=limit, status='error')
         
         return jsonify({
             'status': 'success',
@@ -605,165 +2938,373 @@ def get_error_logs():
         print(f"Error logs retrieval error: {str(e)}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
-# Kafka 로그 관리 및 통계 함수들
+# 색인된 API 로그 저장소 (log_ingestor.py 가 api-logs 를 api_logs 테이블에 적재)
+LOGS_MAX_PAGE_SIZE = int(os.getenv('LOGS_MAX_PAGE_SIZE', 500))
+API_LOG_COLUMNS = "id, logged_at, endpoint, method, status, user_id, message"
+
+def format_api_log_row(row):
+    """api_logs 행을 기존 Kafka 로그 응답 형식으로 변환"""
+    return {
+        'timestamp': row['logged_at'].isoformat(),
+        'endpoint': row['endpoint'],
+        'method': row['method'],
+        'status': row['status'],
+        'user_id': row['user_id'],
+        'message': row['message']
+    }
+
+def format_api_log_rows(rows):
+    return [format_api_log_row(row) for row in rows]
+
+def build_api_log_query(conditions, params, limit, cursor, max_limit=LOGS_MAX_PAGE_SIZE):
+    """조건 + 키셋 커서로 api_logs 한 페이지 쿼리 생성 - (sql, params, limit)"""
+    limit = max(1, min(int(limit), max_limit))
+    conditions = list(conditions)
+    params = list(params)
+    if cursor:
+        condition, condition_params = keyset_condition('logged_at', decode_cursor(cursor), nullable=False)
+        conditions.append(condition)
+        params += condition_params
+    sql = f"SELECT {API_LOG_COLUMNS} FROM api_logs"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY logged_at DESC, id DESC LIMIT %s"
+    params.append(limit + 1)
+    return sql, params, limit
+
+def run_api_log_query(conditions, params, limit, cursor):
+    """api_logs 한 페이지 조회 - (로그, next_cursor)"""
+    sql, params, limit = build_api_log_query(conditions, params, limit, cursor)
+    with get_db_connection(read_only=True) as db:
+        cursor_obj = db.cursor(dictionary=True)
+        cursor_obj.execute(sql, params)
+        rows = cursor_obj.fetchall()
+        cursor_obj.close()
+    rows, next_cursor = split_page(rows, limit, time_key='logged_at')
+    return format_api_log_rows(rows), next_cursor
+
+def time_range_conditions(start_time, end_time):
+    # logged_at 범위 조건 - 각 복합 인덱스의 두 번째 컬럼으로 범위를 좁힘
+    conditions = []
+    params = []
+    if start_time:
+        conditions.append("logged_at >= %s")
+        params.append(start_time)
+    if end_time:
+        conditions.append("logged_at <= %s")
+        params.append(end_time)
+    return conditions, params
+
+def api_log_filter_conditions(endpoint=None, status=None, user_id=None, start_time=None, end_time=None):
+    conditions, params = time_range_conditions(start_time, end_time)
+    for column, value in (('endpoint', endpoint), ('status', status), ('user_id', user_id)):
+        if value:
+            conditions.insert(0, f"{column} = %s")
+            params.insert(0, value)
+    return conditions, params
+
+def api_log_search_conditions(query, start_time=None, end_time=None):
+    conditions, params = time_range_conditions(start_time, end_time)
+    boolean_query = build_boolean_query(query)
+    if len(query.strip()) >= SEARCH_FULLTEXT_MIN_LENGTH and boolean_query:
+        conditions.insert(0, "MATCH(endpoint, user_id, message) AGAINST (%s IN BOOLEAN MODE)")
+        params.insert(0, boolean_query)
+    else:
+        conditions.insert(0, "message LIKE %s")
+        params.insert(0, f"%{query}%")
+    return conditions, params
+
+def query_api_logs(limit=100, endpoint=None, status=None, user_id=None, start_time=None, end_time=None, cursor=None):
+    """필터링된 API 로그 조회 (최신순, 키셋 페이지네이션)"""
+    conditions, params = api_log_filter_conditions(endpoint, status, user_id, start_time, end_time)
+    return run_api_log_query(conditions, params, limit, cursor)
+
+def search_api_logs(query, limit=50, start_time=None, end_time=None, cursor=None):
+    """API 로그 키워드 검색 - 전문 검색 인덱스 사용, 짧은 검색어는 LIKE"""
+    conditions, params = api_log_search_conditions(query, start_time, end_time)
+    return run_api_log_query(conditions, params, limit, cursor)
+
+def stream_api_logs(conditions, params, limit, cursor, fmt, extra):
+    """api_logs 조회 결과를 스트리밍 응답으로 반환 (limit 은 STREAM_MAX_ROWS 까지)"""
+    sql, params, limit = build_api_log_query(conditions, params, limit, cursor, max_limit=STREAM_MAX_ROWS)
+    return stream_page_response(
+        iter_query_rows(sql, params), limit, fmt,
+        transform=format_api_log_row,
+        next_marker=lambda row: encode_cursor(row, time_key='logged_at'),
+        extra=extra
+    )
+
+# Kafka 로그 관리 및 통계 함수들 (source=kafka 일 때 토픽 직접 조회)
+def kafka_log_matches(log_data, endpoint=None, status=None, user_id=None, start_time=None, end_time=None):
+    """토픽에서 읽은 로그가 필터 조건에 맞는지 검사"""
+    if endpoint and log_data.get('endpoint') != endpoint:
+        return False
+    if status and log_data.get('status') != status:
+        return False
+    if user_id and log_data.get('user_id') != user_id:
+        return False
+    if start_time or end_time:
+        log_timestamp = datetime.fromisoformat(log_data.get('timestamp', ''))
+        if start_time and log_timestamp < start_time:
+            return False
+        if end_time and log_timestamp > end_time:
+            return False
+    return True
+
+def kafka_log_contains(log_data, query):
+    searchable_text = f"{log_data.get('endpoint', '')} {log_data.get('message', '')} {log_data.get('user_id', '')}"
+    return query.lower() in searchable_text.lower()
+
+def format_kafka_log(log_data):
+    return {
+        'timestamp': log_data.get('timestamp'),
+        'endpoint': log_data.get('endpoint'),
+        'method': log_data.get('method'),
+        'status': log_data.get('status'),
+        'user_id': log_data.get('user_id'),
+        'message': log_data.get('message')
+    }
+
+# Kafka 토픽 직접 조회 (?source=kafka) - 컨슈머 그룹 없이 모든 파티션을 직접 할당하고
+# end_offsets 부터 창(window) 단위로 거꾸로 읽어 최신 로그부터 찾음
+KAFKA_LOG_TOPIC = 'api-logs'
+KAFKA_SCAN_WINDOW = int(os.getenv('KAFKA_SCAN_WINDOW', 500))  # 파티션별 첫 창 크기, 창마다 두 배
+KAFKA_SCAN_MAX_WINDOW = int(os.getenv('KAFKA_SCAN_MAX_WINDOW', 8000))
+KAFKA_SCAN_MAX_RECORDS = int(os.getenv('KAFKA_SCAN_MAX_RECORDS', 200000))  # 요청 하나가 읽는 최대 레코드 수
+KAFKA_SCAN_TIMEOUT_S = float(os.getenv('KAFKA_SCAN_TIMEOUT_S', 10))
+KAFKA_PARTITIONS_REFRESH_S = 60
+
+def to_timestamp_ms(value):
+    return int(value.timestamp() * 1000)
+
+def kafka_scan_range(lows, highs, start_offsets=None, end_offsets=None):
+    """offsets_for_times 결과로 파티션별 읽기 범위 [low, high) 를 좁힘 (None 이면 해당 시각 이후 레코드 없음)"""
+    for tp, found in (start_offsets or {}).items():
+        lows[tp] = found.offset if found is not None else highs[tp]
+    for tp, found in (end_offsets or {}).items():
+        if found is not None:
+            highs[tp] = max(lows[tp], min(highs[tp], found.offset))
+    return lows, highs
+
+class KafkaLogScan:
+    """최신 로그부터 찾는 역방향 조회 상태 - 동기(kafka-python)/비동기(aiokafka) 컨슈머가 같이 사용
+
+    매 단계 모든 파티션의 [high - window, high) 를 동시에 읽고, 파티션에서 읽은 가장 오래된 레코드가
+    지금까지 찾은 limit 번째 로그보다 오래되었으면 그 파티션은 더 읽지 않는다 (파티션 안의 타임스탬프는 증가 순).
+    """
+    def __init__(self, predicate, limit, lows, highs):
+        self.predicate = predicate
+        self.limit = limit
+        self.lows = lows
+        self.highs = highs
+        self.window = KAFKA_SCAN_WINDOW
+        self.matches = []  # (레코드 타임스탬프, 로그)
+        self.scanned = 0
+
+    def next_windows(self):
+        """다음에 읽을 {파티션: (start, end)} - 비어 있으면 조회 종료"""
+        if self.limit <= 0 or self.scanned >= KAFKA_SCAN_MAX_RECORDS:
+            return {}
+        windows = {tp: (max(self.lows[tp], high - self.window), high)
+                   for tp, high in self.highs.items() if high > self.lows[tp]}
+        self.window = min(self.window * 2, KAFKA_SCAN_MAX_WINDOW)
+        return windows
+
+    def add(self, windows, records):
+        """next_windows 로 읽은 {파티션: 레코드 목록} 반영"""
+        oldest = {}
+        for tp, (start, end) in windows.items():
+            batch = records.get(tp, [])
+            self.scanned += len(batch)
+            self.highs[tp] = start
+            for record in batch:
+                if self.predicate(record.value):
+                    self.matches.append((record.timestamp, record.value))
+            if batch:
+                oldest[tp] = batch[0].timestamp
+        self.matches.sort(key=lambda match: match[0], reverse=True)
+        del self.matches[self.limit:]
+        if len(self.matches) >= self.limit:
+            cutoff = self.matches[-1][0]
+            for tp, timestamp in oldest.items():
+                if timestamp <= cutoff:
+                    self.lows[tp] = self.highs[tp]
+
+    def results(self):
+        return [format_kafka_log(log) for _, log in self.matches]
+
+class KafkaLogReader:
+    """워커당 하나의 장수 컨슈머 - 요청마다 부트스트랩/SASL 인증/그룹 참여를 반복하지 않음
+
+    kafka-python 컨슈머는 스레드 안전하지 않으므로 조회는 lock 으로 한 번에 하나씩 실행한다.
+    """
+    def __init__(self, topic):
+        self.topic = topic
+        self._lock = Lock()
+        self._consumer = None
+        self._pid = None
+        self._partitions = []
+        self._partitions_at = 0.0
+
+    def _get_consumer(self):
+        # fork 된 워커는 부모의 소켓을 쓰지 않고 새로 연결
+        if self._consumer is None or self._pid != os.getpid():
+            self._consumer = get_kafka_consumer(group_id=None, enable_auto_commit=False)
+            self._pid = os.getpid()
+            self._partitions = []
+        return self._consumer
+
+    def _topic_partitions(self, consumer):
+        if not self._partitions or time.monotonic() - self._partitions_at > KAFKA_PARTITIONS_REFRESH_S:
+            partitions = consumer.partitions_for_topic(self.topic) or set()
+            self._partitions = [TopicPartition(self.topic, p) for p in sorted(partitions)]
+            self._partitions_at = time.monotonic()
+        return self._partitions
+
+    def _read_windows(self, consumer, windows, deadline):
+        """모든 파티션의 [start, end) 를 한 번의 poll 루프로 함께 읽음"""
+        consumer.assign(list(windows))
+        for tp, (start, end) in windows.items():
+            consumer.seek(tp, start)
+        records = {tp: [] for tp in windows}
+        pending = set(windows)
+        while pending and time.monotonic() < deadline:
+            batches = consumer.poll(timeout_ms=200, max_records=sum(end - start for start, end in windows.values()))
+            for tp, messages in batches.items():
+                if tp not in pending:
+                    continue
+                end = windows[tp][1]
+                records[tp].extend(m for m in messages if m.offset < end)
+            for tp in list(pending):
+                # 트랜잭션 마커/압축으로 빈 offset 이 있어도 위치로 완료 판단
+                if consumer.position(tp) >= windows[tp][1]:
+                    pending.discard(tp)
+                    consumer.pause(tp)
+        consumer.resume(*windows)
+        return records
+
+    def scan(self, predicate, limit, start_time=None, end_time=None):
+        """predicate 에 맞는 최신 로그 limit 개 (최신순)"""
+        with self._lock:
+            try:
+                consumer = self._get_consumer()
+                partitions = self._topic_partitions(consumer)
+                if not partitions:
+                    return []
+                lows = consumer.beginning_offsets(partitions)
+                highs = consumer.end_offsets(partitions)
+                lows, highs = kafka_scan_range(
+                    lows, highs,
+                    consumer.offsets_for_times({tp: to_timestamp_ms(start_time) for tp in partitions}) if start_time else None,
+                    # end_time 은 포함이므로 그 다음 밀리초의 첫 offset 까지
+                    consumer.offsets_for_times({tp: to_timestamp_ms(end_time) + 1 for tp in partitions}) if end_time else None
+                )
+                scan = KafkaLogScan(predicate, limit, lows, highs)
+                deadline = time.monotonic() + KAFKA_SCAN_TIMEOUT_S
+                windows = scan.next_windows()
+                while windows and time.monotonic() < deadline:
+                    scan.add(windows, self._read_windows(consumer, windows, deadline))
+                    windows = scan.next_windows()
+                return scan.results()
+            except Exception:
+                # 연결 문제일 수 있으므로 다음 조회에서 새로 연결
+                self._close()
+                raise
+
+    def _close(self):
+        if self._consumer is not None and self._pid == os.getpid():
+            try:
+                self._consumer.close()
+            except Exception as e:
+                print(f"Kafka log reader close error: {str(e)}")
+        self._consumer = None
+        self._pid = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+kafka_log_reader = KafkaLogReader(KAFKA_LOG_TOPIC)
+
 def get_kafka_logs_with_filter(limit=100, endpoint=None, status=None, user_id=None, start_time=None, end_time=None):
-    """필터링된 Kafka 로그 조회"""
+    """필터링된 Kafka 로그 조회 - 최신 로그부터, 날짜 범위는 offsets_for_times 로 바로 이동"""
     try:
-        consumer = KafkaConsumer(
-            'api-logs',
-            bootstrap_servers=os.getenv('KAFKA_SERVERS', 'my-kafka:9092'),
-            value_deserializer=lambda m: json.loads(m.decode('utf-8')),
-            security_protocol='SASL_PLAINTEXT',
-            sasl_mechanism='PLAIN',
-            sasl_plain_username=os.getenv('KAFKA_USERNAME', 'user1'),
-            sasl_plain_password=os.getenv('KAFKA_PASSWORD', ''),
-            group_id='api-logs-viewer',
-            auto_offset_reset='earliest',
-            consumer_timeout_ms=10000
+        return kafka_log_reader.scan(
+            lambda log: kafka_log_matches(log, endpoint, status, user_id, start_time, end_time),
+            limit, start_time, end_time
         )
-        
-        logs = []
-        try:
-            for message in consumer:
-                log_data = message.value
-                
-                # 필터링 적용
-                if endpoint and log_data.get('endpoint') != endpoint:
-                    continue
-                if status and log_data.get('status') != status:
-                    continue
-                if user_id and log_data.get('user_id') != user_id:
-                    continue
-                if start_time:
-                    log_timestamp = datetime.fromisoformat(log_data.get('timestamp', ''))
-                    if log_timestamp < start_time:
-                        continue
-                if end_time:
-                    log_timestamp = datetime.fromisoformat(log_data.get('timestamp', ''))
-                    if log_timestamp > end_time:
-                        continue
-                
-                logs.append({
-                    'timestamp': log_data.get('timestamp'),
-                    'endpoint': log_data.get('endpoint'),
-                    'method': log_data.get('method'),
-                    'status': log_data.get('status'),
-                    'user_id': log_data.get('user_id'),
-                    'message': log_data.get('message')
-                })
-                
-                if len(logs) >= limit:
-                    break
-        finally:
-            consumer.close()
-        
-        # 시간 역순으로 정렬
-        logs.sort(key=lambda x: x['timestamp'], reverse=True)
-        return logs
     except Exception as e:
         print(f"Kafka log retrieval error: {str(e)}")
         return []
 
+# API 통계 롤업 (stats_aggregator.py 가 api-logs 를 증분 소비하며 갱신)
+STATS_SUMMARY_KEY = 'stats:summary'
+STATS_ENDPOINTS_KEY = 'stats:endpoints'
+STATS_STATUS_KEY = 'stats:status'
+STATS_USERS_KEY = 'stats:users'
+STATS_RECENT_ERRORS_KEY = 'stats:recent_errors'
+STATS_HOURLY_KEY_PREFIX = 'stats:hourly:'  # + YYYY-MM-DD, 필드는 HH
+STATS_OFFSETS_KEY = 'stats:offsets'  # 파티션별 다음 소비 offset (카운터와 같은 트랜잭션으로 저장)
+
+def api_statistics_days(now):
+    # 최근 24시간은 오늘과 (23시 이전이면) 어제 버킷에 걸침
+    days = [now.strftime('%Y-%m-%d')]
+    if now.hour < 23:
+        days.insert(0, (now - timedelta(days=1)).strftime('%Y-%m-%d'))
+    return days
+
+def queue_api_statistics_reads(pipe, days):
+    pipe.hget(STATS_SUMMARY_KEY, 'total_calls')
+    pipe.hgetall(STATS_ENDPOINTS_KEY)
+    pipe.hgetall(STATS_STATUS_KEY)
+    pipe.hgetall(STATS_USERS_KEY)
+    pipe.lrange(STATS_RECENT_ERRORS_KEY, 0, 9)
+    for day in days:
+        pipe.hgetall(STATS_HOURLY_KEY_PREFIX + day)
+
+def build_api_statistics(results, days, now):
+    total, endpoints, status_codes, users, recent_errors = results[:5]
+
+    # 최근 24시간 시간대별 호출 수
+    hourly = {}
+    for day, buckets in zip(days, results[5:]):
+        for hour, count in buckets.items():
+            hourly[f"{day}T{hour}"] = int(count)
+    since = (now - timedelta(hours=23)).strftime('%Y-%m-%dT%H')
+    hourly = {bucket: count for bucket, count in sorted(hourly.items()) if bucket >= since}
+
+    return {
+        'total_calls': int(total or 0),
+        'endpoints': {k: int(v) for k, v in endpoints.items()},
+        'status_codes': {k: int(v) for k, v in status_codes.items()},
+        'users': {k: int(v) for k, v in users.items()},
+        'recent_errors': [loads(e) for e in recent_errors],
+        'hourly': hourly
+    }
+
 def get_api_statistics():
-    """API 통계 정보 조회"""
+    """API 통계 정보 조회 - Redis 롤업을 읽기만 하므로 토픽 크기와 무관"""
     try:
-        consumer = KafkaConsumer(
-            'api-logs',
-            bootstrap_servers=os.getenv('KAFKA_SERVERS', 'my-kafka:9092'),
-            value_deserializer=lambda m: json.loads(m.decode('utf-8')),
-            security_protocol='SASL_PLAINTEXT',
-            sasl_mechanism='SCRAM-SHA-256',
-            sasl_plain_username=os.getenv('KAFKA_USERNAME', 'user1'),
-            sasl_plain_password=os.getenv('KAFKA_PASSWORD', ''),
-            group_id='api-stats-viewer',
-            auto_offset_reset='earliest',
-            consumer_timeout_ms=5000
-        )
-        
-        stats = {
-            'total_calls': 0,
-            'endpoints': {},
-            'status_codes': {},
-            'users': {},
-            'recent_errors': []
-        }
-        
-        try:
-            for message in consumer:
-                log_data = message.value
-                stats['total_calls'] += 1
-                
-                # 엔드포인트별 통계
-                endpoint = log_data.get('endpoint', 'unknown')
-                stats['endpoints'][endpoint] = stats['endpoints'].get(endpoint, 0) + 1
-                
-                # 상태 코드별 통계
-                status = log_data.get('status', 'unknown')
-                stats['status_codes'][status] = stats['status_codes'].get(status, 0) + 1
-                
-                # 사용자별 통계
-                user = log_data.get('user_id', 'anonymous')
-                stats['users'][user] = stats['users'].get(user, 0) + 1
-                
-                # 최근 에러 로그
-                if status == 'error' and len(stats['recent_errors']) < 10:
-                    stats['recent_errors'].append({
-                        'timestamp': log_data.get('timestamp'),
-                        'endpoint': endpoint,
-                        'message': log_data.get('message')
-                    })
-        finally:
-            consumer.close()
-        
-        return stats
+        redis_client = get_redis_connection()
+        if not redis_client:
+            return {}
+        now = datetime.now()
+        days = api_statistics_days(now)
+        pipe = redis_client.pipeline(transaction=False)
+        queue_api_statistics_reads(pipe, days)
+        return build_api_statistics(pipe.execute(), days, now)
     except Exception as e:
         print(f"API statistics error: {str(e)}")
         return {}
 
 def search_kafka_logs(query, limit=50):
-    """Kafka 로그에서 키워드 검색"""
+    """Kafka 로그에서 키워드 검색 - 최신 로그부터"""
     try:
-        consumer = KafkaConsumer(
-            'api-logs',
-            bootstrap_servers=os.getenv('KAFKA_SERVERS', 'my-kafka:9092'),
-            value_deserializer=lambda m: json.loads(m.decode('utf-8')),
-            security_protocol='SASL_PLAINTEXT',
-            sasl_mechanism='SCRAM-SHA-256',
-            sasl_plain_username=os.getenv('KAFKA_USERNAME', 'user1'),
-            sasl_plain_password=os.getenv('KAFKA_PASSWORD', ''),
-            group_id='api-search-viewer',
-            auto_offset_reset='earliest',
-            consumer_timeout_ms=8000
-        )
-        
-        results = []
-        try:
-            for message in consumer:
-                log_data = message.value
-                
-                # 키워드 검색
-                searchable_text = f"{log_data.get('endpoint', '')} {log_data.get('message', '')} {log_data.get('user_id', '')}"
-                if query.lower() in searchable_text.lower():
-                    results.append({
-                        'timestamp': log_data.get('timestamp'),
-                        'endpoint': log_data.get('endpoint'),
-                        'method': log_data.get('method'),
-                        'status': log_data.get('status'),
-                        'user_id': log_data.get('user_id'),
-                        'message': log_data.get('message')
-                    })
-                
-                if len(results) >= limit:
-                    break
-        finally:
-            consumer.close()
-        
-        # 시간 역순으로 정렬
-        results.sort(key=lambda x: x['timestamp'], reverse=True)
-        return results
+        return kafka_log_reader.scan(lambda log: kafka_log_contains(log, query), limit)
     except Exception as e:
         print(f"Kafka log search error: {str(e)}")
         return []
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True) 
\ No newline at end of file
+    # 로컬 개발용 서버 - 운영에서는 gunicorn -c gunicorn.conf.py app:app 사용
+    app.run(host='0.0.0.0', port=5000, debug=os.getenv('FLASK_DEBUG', '0') == '1') 
\ No newline at end of file
@@ -0,0 +1,996 @@
+"""
+ASGI 서빙 모드 - 느린 조회 경로를 asyncio 드라이버로 처리
+
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py
+    # 또는 uvicorn asgi_app:application --host 0.0.0.0 --port 5000
+
+메시지/검색 조회, Redis 로그, /logs/kafka* 조회 경로는 aiomysql, redis.asyncio,
+aiokafka 를 쓰는 Quart 앱이 처리하여 워커 하나가 많은 요청을 동시에 기다릴 수 있다.
+대용량 조회 스트리밍(?stream=1, ?format=ndjson)과 실시간 로그 tail(/logs/stream)도
+이벤트 루프에서 처리한다. 그 밖의 경로(로그인, 저장, 캐시 관리 등)는 기존 Flask 앱에
+그대로 위임하며, 요청마다 a2wsgi 스레드 풀의 스레드 하나에서 실행된다.
+세션은 Flask 앱과 같은 Redis 서버 측 세션(서명된 세션 ID 쿠키)을 읽어 공유한다.
+"""
+import asyncio
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import wraps
+
+import aiomysql
+import redis
+import redis.asyncio as aioredis
+from a2wsgi import WSGIMiddleware
+from aiokafka import AIOKafkaConsumer, TopicPartition
+from quart import Quart, request, jsonify, session, has_request_context
+from quart.json.provider import JSONProvider
+from quart.sessions import SessionInterface
+from werkzeug.exceptions import HTTPException
+
+import app as wsgi
+from serialization import dumps, loads, encode_cache_value, decode_cache_value
+
+class FastJSONProvider(JSONProvider):
+    """app.py 와 같은 serialization 계층으로 응답 직렬화"""
+    def dumps(self, obj, **kwargs):
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+quart_app = Quart(__name__)
+quart_app.secret_key = wsgi.app.secret_key
+quart_app.json = FastJSONProvider(quart_app)
+
+# 이벤트 루프 안에서 쓰는 비동기 클라이언트 (before_serving 에서 생성)
+db_pool = None
+replica_router = None  # MYSQL_REPLICA_HOSTS 가 있을 때 AsyncReplicaRouter
+redis_client = None
+redis_binary = None  # 검색 캐시(바이트 값)용
+
+class BreakerAsyncRedis(aioredis.Redis):
+    """명령 실행 결과를 공용 서킷 브레이커에 기록하는 비동기 Redis 클라이언트"""
+    async def execute_command(self, *args, **options):
+        try:
+            result = await super().execute_command(*args, **options)
+        except (redis.ConnectionError, redis.TimeoutError):
+            wsgi.incr_cache_metric('redis_errors')
+            wsgi.redis_breaker.record_failure()
+            raise
+        wsgi.redis_breaker.record_success()
+        return result
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return BreakerAsyncPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+class BreakerAsyncPipeline(aioredis.client.Pipeline):
+    async def execute(self, raise_on_error=True):
+        try:
+            result = await super().execute(raise_on_error)
+        except (redis.ConnectionError, redis.TimeoutError):
+            wsgi.incr_cache_metric('redis_errors')
+            wsgi.redis_breaker.record_failure()
+            raise
+        wsgi.redis_breaker.record_success()
+        return result
+
+class AsyncRedisSessionInterface(SessionInterface):
+    """app.RedisSessionInterface 의 읽기 전용 비동기 버전 - 로컬 검증 캐시와 만료 연장 간격을 공유"""
+    session_class = wsgi.RedisSession
+
+    async def open_session(self, app, request):
+        sessions = wsgi.session_interface
+        sid = sessions.load_sid(app, request.cookies.get(self.get_cookie_name(app)))
+        if sid is None:
+            return self.session_class(sid=None, new=True)
+        data = sessions.cached(sid)
+        if data is not None:
+            return self.session_class(data, sid=sid)
+        try:
+            client = get_redis()
+            stored = await client.get(f"{wsgi.SESSION_KEY_PREFIX}{sid}") if client else None
+        except Exception as e:
+            print(f"Redis session load error: {str(e)}")
+            stored = None
+        if stored is None:
+            return self.session_class(sid=None, new=True)
+        data = loads(stored)
+        sessions.remember(sid, data)
+        return self.session_class(data, sid=sid)
+
+    async def save_session(self, app, session, response):
+        # 세션 변경(로그인/로그아웃)은 Flask 앱 경로에서만 일어나므로 만료 연장만 수행
+        if session.new or not session or not wsgi.session_interface.needs_refresh(session.sid):
+            return
+        try:
+            client = get_redis()
+            if client:
+                pipe = client.pipeline(transaction=False)
+                wsgi.session_interface.queue_refresh(pipe, session.sid, dict(session))
+                await pipe.execute()
+        except Exception as e:
+            print(f"Redis session refresh error: {str(e)}")
+
+quart_app.session_interface = AsyncRedisSessionInterface()
+
+class AsyncReplicaRouter:
+    """app.ReplicaRouter 의 비동기 버전 - 같은 순환 순서, 제외 시간(REPLICA_RETRY_S), 지연 기준 사용
+
+    복제본 풀이 DB_REPLICA_POOL_TIMEOUT 안에 커넥션을 주지 못해도 장애로 보고 primary 로 넘긴다.
+    """
+    def __init__(self, replicas, timeout):
+        self.replicas = replicas
+        self.timeout = timeout
+        self._next = 0
+        self.replica_reads = 0
+        self.fallbacks = 0
+
+    async def acquire(self):
+        """(복제본 풀, 커넥션), 건강한 복제본이 없으면 None (호출자가 primary 사용)"""
+        start = self._next
+        self._next = (self._next + 1) % len(self.replicas)
+        now = time.monotonic()
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            if replica.down_until > now:
+                continue
+            try:
+                conn = await asyncio.wait_for(replica.pool.acquire(), self.timeout)
+            except Exception as e:
+                replica.errors += 1
+                replica.down_until = now + wsgi.REPLICA_RETRY_S
+                print(f"Replica {replica.host} unavailable: {str(e)}")
+                continue
+            if await self._lagging(replica, conn, now):
+                replica.pool.release(conn)
+                continue
+            self.replica_reads += 1
+            return replica.pool, conn
+        self.fallbacks += 1
+        return None
+
+    async def _lagging(self, replica, conn, now):
+        if now - replica.checked_at < wsgi.REPLICA_LAG_CHECK_INTERVAL:
+            return replica.lagging
+        replica.checked_at = now
+        try:
+            cursor = await conn.cursor(aiomysql.DictCursor)
+            await cursor.execute("SHOW SLAVE STATUS")
+            status = await cursor.fetchone()
+            await cursor.close()
+        except Exception as e:
+            # 권한(REPLICATION CLIENT) 부족 등으로 확인할 수 없으면 지연 없음으로 간주
+            print(f"Replica {replica.host} lag check error: {str(e)}")
+            replica.lagging = False
+            return False
+        return replica.record_lag(status)
+
+    async def close(self):
+        for replica in self.replicas:
+            replica.pool.close()
+            await replica.pool.wait_closed()
+
+@quart_app.before_serving
+async def startup():
+    global db_pool, replica_router, redis_client, redis_binary
+    db_pool = await aiomysql.create_pool(
+        host=os.getenv('MYSQL_HOST', 'my-mariadb'),
+        user=os.getenv('MYSQL_USER', 'testuser'),
+        password=os.getenv('MYSQL_PASSWORD') or '',
+        db="testdb",
+        connect_timeout=30,
+        minsize=0,
+        maxsize=wsgi.db_pool.size,
+        pool_recycle=wsgi.db_pool.recycle,
+        autocommit=True
+    )
+    if wsgi.replica_router is not None:
+        # 복제본 목록과 풀 크기/대기 시간은 Flask 앱(위임 경로)의 ReplicaRouter 와 같게
+        replica_router = AsyncReplicaRouter([
+            wsgi.Replica(replica.host, await aiomysql.create_pool(
+                host=replica.host,
+                user=os.getenv('MYSQL_REPLICA_USER', os.getenv('MYSQL_USER', 'testuser')),
+                password=os.getenv('MYSQL_REPLICA_PASSWORD', os.getenv('MYSQL_PASSWORD')) or '',
+                db="testdb",
+                connect_timeout=5,
+                minsize=0,
+                maxsize=replica.pool.size,
+                pool_recycle=replica.pool.recycle,
+                autocommit=True
+            )) for replica in wsgi.replica_router.replicas
+        ], timeout=wsgi.replica_router.replicas[0].pool.timeout)
+    redis_client, redis_binary = [BreakerAsyncRedis(
+        host=os.getenv('REDIS_HOST', 'my-redis-master'),
+        port=6379,
+        password=os.getenv('REDIS_PASSWORD'),
+        decode_responses=decode_responses,
+        db=0,
+        max_connections=int(os.getenv('REDIS_POOL_SIZE', 20)),
+        socket_connect_timeout=5,
+        socket_timeout=5
+    ) for decode_responses in (True, False)]
+
+@quart_app.after_serving
+async def shutdown():
+    if db_pool is not None:
+        db_pool.close()
+        await db_pool.wait_closed()
+    if replica_router is not None:
+        await replica_router.close()
+    for client in (redis_client, redis_binary):
+        if client is not None:
+            await client.connection_pool.disconnect()
+    await kafka_log_reader.close()
+    await log_tail_hub.close()
+
+@quart_app.after_request
+async def add_cors_headers(response):
+    # Flask 앱의 CORS(supports_credentials=True) 와 같은 응답 헤더
+    origin = request.headers.get('Origin')
+    if origin:
+        response.headers['Access-Control-Allow-Origin'] = origin
+        response.headers['Access-Control-Allow-Credentials'] = 'true'
+        response.headers['Vary'] = 'Origin'
+    return response
+
+def get_redis(binary=False):
+    if not wsgi.redis_breaker.allow():
+        wsgi.incr_cache_metric('redis_skipped')
+        return None
+    return redis_binary if binary else redis_client
+
+def primary_required():
+    """app.primary_required 와 같은 규칙 - 최근 쓰기(Flask 경로의 mark_recent_write)가 있으면 primary 사용"""
+    return has_request_context() and session.get('primary_until', 0) > time.time()
+
+@asynccontextmanager
+async def db_connection(read_only=False):
+    """app.get_db_connection 의 비동기 버전 - read_only=True 이면 가능한 경우 복제본에서 대여"""
+    pool, conn = db_pool, None
+    if read_only and replica_router is not None and not primary_required():
+        acquired = await replica_router.acquire()
+        if acquired is not None:
+            pool, conn = acquired
+    if conn is None:
+        conn = await db_pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+async def db_fetchall(sql, params, read_only=False):
+    async with db_connection(read_only=read_only) as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(sql, params)
+            return list(await cursor.fetchall())
+
+# 대용량 조회 스트리밍 - app.iter_query_rows / stream_page_response 의 비동기 버전
+def iter_query_rows(sql, params, read_only=True):
+    """unbuffered 커서(SSDictCursor)로 쿼리를 실행하고 행을 하나씩 돌려주는 비동기 제너레이터 반환
+
+    커넥션은 첫 행을 읽을 때 가져온다. 응답 본문을 읽기 전에 클라이언트가 끊겨 제너레이터가
+    한 번도 시작되지 않아도 커넥션이 풀 밖에 남지 않는다. 실행 오류는 응답 헤더를 보낸 뒤
+    발생하므로 중간 오류와 같이 응답을 끊어 알린다.
+    """
+    # 본문은 요청 컨텍스트가 끝난 뒤 읽히므로 세션의 최근 쓰기 여부는 지금 확인
+    return _iter_query_rows(sql, params, read_only and not primary_required())
+
+async def _iter_query_rows(sql, params, read_only):
+    async with db_connection(read_only=read_only) as conn:
+        completed = False
+        try:
+            cursor = await conn.cursor(aiomysql.SSDictCursor)
+            await cursor.execute(sql, params)
+            while True:
+                rows = await cursor.fetchmany(wsgi.STREAM_FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+            completed = True
+        finally:
+            if completed:
+                await cursor.close()
+            else:
+                # 클라이언트 연결 종료 등으로 중간에 멈추면 읽지 않은 결과를 버리지 않고 커넥션을 닫음
+                conn.close()
+
+def stream_page_response(rows, limit, fmt, transform=None, next_marker=None, marker_key='next_cursor', extra=None):
+    writer = wsgi.StreamPageWriter(limit, fmt, transform, next_marker, marker_key, extra)
+
+    async def generate():
+        try:
+            head = writer.head()
+            if head:
+                yield head
+            async for row in rows:
+                chunk = writer.row(row)
+                if chunk:
+                    yield chunk
+            tail = writer.tail()
+            if tail:
+                yield tail
+        except Exception as e:
+            print(f"Streaming response error: {str(e)}")
+            raise
+        finally:
+            await rows.aclose()
+
+    response = quart_app.response_class(generate(), mimetype=writer.mimetype)
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.timeout = None  # RESPONSE_TIMEOUT(60초) 로 긴 내보내기가 끊기지 않도록
+    return response
+
+async def stream_api_logs(conditions, params, limit, cursor, fmt, extra):
+    sql, params, limit = wsgi.build_api_log_query(conditions, params, limit, cursor, max_limit=wsgi.STREAM_MAX_ROWS)
+    return stream_page_response(
+        iter_query_rows(sql, params), limit, fmt,
+        transform=wsgi.format_api_log_row,
+        next_marker=lambda row: wsgi.encode_cursor(row, time_key='logged_at'),
+        extra=extra
+    )
+
+def login_required(f):
+    @wraps(f)
+    async def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            return jsonify({"status": "error", "message": "로그인이 필요합니다"}), 401
+        return await f(*args, **kwargs)
+    return decorated_function
+
+# 검색 캐시 (app.py 의 L1 → Redis → single-flight 흐름과 동일)
+async def get_search_cache(query, page_key):
+    l1_item = wsgi.search_l1_cache.get((query, page_key))
+    if l1_item is not None:
+        return l1_item[1], l1_item[0]
+    try:
+        client = get_redis(binary=True)
+        if client:
+            pipe = client.pipeline(transaction=False)
+            pipe.get(wsgi.MESSAGES_VERSION_KEY)
+            pipe.hget(f"search:{query}", page_key)
+            version, cached_result = await pipe.execute()
+            version = int(version or 0)
+            if cached_result:
+                cached = decode_cache_value(cached_result)
+                if cached.get('v') == version:
+                    wsgi.incr_cache_metric('search_hits')
+                    wsgi.search_l1_cache.put((query, page_key), version, cached['data'], len(cached_result))
+                    return cached['data'], version
+                wsgi.incr_cache_metric('search_stale')
+            wsgi.incr_cache_metric('search_misses')
+            return None, version
+        return None, None
+    except Exception as e:
+        print(f"Redis cache get error: {str(e)}")
+        return None, None
+
+async def set_search_cache(query, page_key, results, version):
+    if version is None:
+        return
+    try:
+        client = get_redis(binary=True)
+        if client:
+            cache_key = f"search:{query}"
+            payload = encode_cache_value({'v': version, 'data': results})
+            pipe = client.pipeline(transaction=False)
+            pipe.hset(cache_key, page_key, payload)
+            pipe.expire(cache_key, wsgi.SEARCH_CACHE_TTL)
+            await pipe.execute()
+            wsgi.search_l1_cache.put((query, page_key), version, results, len(payload))
+    except Exception as e:
+        print(f"Redis cache set error: {str(e)}")
+
+async def load_search_single_flight(query, page_key, version, loader):
+    if version is None:
+        return await loader()
+    client = get_redis()
+    if not client:
+        return await loader()
+
+    lock_key = f"lock:search:{query}:{page_key}"
+    token = uuid.uuid4().hex
+    try:
+        acquired = await client.set(lock_key, token, nx=True, px=wsgi.SEARCH_LOCK_TTL_MS)
+    except Exception as e:
+        print(f"Redis search lock error: {str(e)}")
+        return await loader()
+
+    if acquired:
+        wsgi.incr_cache_metric('search_loads')
+        try:
+            results = await loader()
+            await set_search_cache(query, page_key, results, version)
+            return results
+        finally:
+            try:
+                await client.eval(wsgi.RELEASE_LOCK_SCRIPT.script, 1, lock_key, token)
+            except Exception as e:
+                print(f"Redis search unlock error: {str(e)}")
+
+    # 다른 요청이 조회 중 - 스레드를 잡지 않고 이벤트 루프에서 대기
+    wsgi.incr_cache_metric('search_singleflight_waits')
+    deadline = time.monotonic() + wsgi.SEARCH_LOCK_WAIT_MS / 1000.0
+    while time.monotonic() < deadline:
+        await asyncio.sleep(wsgi.SEARCH_LOCK_POLL_MS / 1000.0)
+        cached, _ = await get_search_cache(query, page_key)
+        if cached is not None:
+            return cached
+    wsgi.incr_cache_metric('search_singleflight_timeouts')
+    return await loader()
+
+# Kafka 토픽 직접 조회 (source=kafka) - aiokafka 로 처음부터 읽되 이벤트 루프는 막지 않음
+class AsyncKafkaLogReader:
+    """app.KafkaLogReader 의 aiokafka 버전 - 워커(이벤트 루프)당 컨슈머 하나를 그룹 없이 재사용"""
+    def __init__(self, topic):
+        self.topic = topic
+        self._lock = asyncio.Lock()
+        self._consumer = None
+        self._partitions = []
+        self._partitions_at = 0.0
+
+    async def _get_consumer(self):
+        if self._consumer is None:
+            consumer = AIOKafkaConsumer(
+                bootstrap_servers=os.getenv('KAFKA_SERVERS', 'my-kafka:9092'),
+                value_deserializer=loads,
+                security_protocol='SASL_PLAINTEXT',
+                sasl_mechanism='SCRAM-SHA-256',
+                sasl_plain_username=os.getenv('KAFKA_USERNAME', 'user1'),
+                sasl_plain_password=os.getenv('KAFKA_PASSWORD', ''),
+                group_id=None,
+                enable_auto_commit=False
+            )
+            await consumer.start()
+            self._consumer = consumer
+            self._partitions = []
+        return self._consumer
+
+    async def _topic_partitions(self, consumer):
+        if not self._partitions or time.monotonic() - self._partitions_at > wsgi.KAFKA_PARTITIONS_REFRESH_S:
+            await consumer.topics()  # 메타데이터 갱신
+            partitions = consumer.partitions_for_topic(self.topic) or set()
+            self._partitions = [TopicPartition(self.topic, p) for p in sorted(partitions)]
+            self._partitions_at = time.monotonic()
+        return self._partitions
+
+    async def _read_windows(self, consumer, windows, deadline):
+        consumer.assign(list(windows))
+        for tp, (start, end) in windows.items():
+            consumer.seek(tp, start)
+        records = {tp: [] for tp in windows}
+        pending = set(windows)
+        while pending and time.monotonic() < deadline:
+            batches = await consumer.getmany(*pending, timeout_ms=200,
+                                             max_records=sum(end - start for start, end in windows.values()))
+            for tp, messages in batches.items():
+                end = windows[tp][1]
+                records[tp].extend(m for m in messages if m.offset < end)
+            for tp in list(pending):
+                if await consumer.position(tp) >= windows[tp][1]:
+                    pending.discard(tp)
+        return records
+
+    async def scan(self, predicate, limit, start_time=None, end_time=None):
+        async with self._lock:
+            try:
+                consumer = await self._get_consumer()
+                partitions = await self._topic_partitions(consumer)
+                if not partitions:
+                    return []
+                lows = await consumer.beginning_offsets(partitions)
+                highs = await consumer.end_offsets(partitions)
+                lows, highs = wsgi.kafka_scan_range(
+                    lows, highs,
+                    await consumer.offsets_for_times(
+                        {tp: wsgi.to_timestamp_ms(start_time) for tp in partitions}) if start_time else None,
+                    await consumer.offsets_for_times(
+                        {tp: wsgi.to_timestamp_ms(end_time) + 1 for tp in partitions}) if end_time else None
+                )
+                scan = wsgi.KafkaLogScan(predicate, limit, lows, highs)
+                deadline = time.monotonic() + wsgi.KAFKA_SCAN_TIMEOUT_S
+                windows = scan.next_windows()
+                while windows and time.monotonic() < deadline:
+                    scan.add(windows, await self._read_windows(consumer, windows, deadline))
+                    windows = scan.next_windows()
+                return scan.results()
+            except Exception:
+                await self._close()
+                raise
+
+    async def _close(self):
+        if self._consumer is not None:
+            try:
+                await self._consumer.stop()
+            except Exception as e:
+                print(f"Kafka log reader close error: {str(e)}")
+        self._consumer = None
+
+    async def close(self):
+        async with self._lock:
+            await self._close()
+
+kafka_log_reader = AsyncKafkaLogReader(wsgi.KAFKA_LOG_TOPIC)
+
+async def fetch_api_logs(conditions, params, limit, cursor):
+    sql, params, limit = wsgi.build_api_log_query(conditions, params, limit, cursor)
+    rows, next_cursor = wsgi.split_page(await db_fetchall(sql, params, read_only=True), limit, time_key='logged_at')
+    return wsgi.format_api_log_rows(rows), next_cursor
+
+async def get_api_statistics():
+    try:
+        client = get_redis()
+        if not client:
+            return {}
+        now = datetime.now()
+        days = wsgi.api_statistics_days(now)
+        pipe = client.pipeline(transaction=False)
+        wsgi.queue_api_statistics_reads(pipe, days)
+        return wsgi.build_api_statistics(await pipe.execute(), days, now)
+    except Exception as e:
+        print(f"API statistics error: {str(e)}")
+        return {}
+
+def parse_date_range():
+    start_time = None
+    end_time = None
+    if request.args.get('start_date'):
+        start_time = datetime.fromisoformat(request.args.get('start_date'))
+    if request.args.get('end_date'):
+        end_time = datetime.fromisoformat(request.args.get('end_date'))
+    return start_time, end_time
+
+async def load_user_feed_page(user, limit):
+    """app.load_user_feed_page 의 비동기 버전 - 피드를 쓸 수 없으면 None"""
+    if limit >= wsgi.USER_FEED_SIZE:
+        return None
+    client = get_redis()
+    if not client:
+        return None
+    keys = wsgi.user_feed_keys(user)
+    try:
+        rows, version = wsgi.parse_user_feed(
+            await client.eval(wsgi.USER_FEED_READ_SCRIPT.script, 3, *keys, limit + 1))
+    except Exception as e:
+        print(f"User feed read error: {str(e)}")
+        return None
+    if rows is not None:
+        wsgi.incr_cache_metric('feed_hits')
+        return wsgi.split_page(rows, limit)
+    wsgi.incr_cache_metric('feed_misses')
+    if version is None:
+        return None
+
+    # 재구성은 app.load_user_feed_page 와 같이 복제 지연이 없는 primary 기준으로
+    sql, params = wsgi.build_messages_page_query(None, wsgi.USER_FEED_SIZE - 1, user=user)
+    rows = await db_fetchall(sql, params)
+    if rows:
+        try:
+            await client.eval(wsgi.USER_FEED_REBUILD_SCRIPT.script, 3, *keys,
+                              *wsgi.user_feed_rebuild_args(rows, version))
+        except Exception as e:
+            print(f"User feed rebuild error: {str(e)}")
+    return wsgi.split_page(rows[:limit + 1], limit)
+
+@quart_app.route('/db/messages', methods=['GET'])
+@login_required
+async def get_from_db():
+    try:
+        user_id = session['user_id']
+        fmt = wsgi.stream_format(request)
+        if fmt:
+            limit = wsgi.parse_stream_limit(request.args.get('limit'), wsgi.MESSAGES_DEFAULT_PAGE_SIZE)
+        else:
+            limit = wsgi.parse_page_size(request.args.get('limit'))
+        cursor_param = request.args.get('cursor')
+        try:
+            after = wsgi.decode_cursor(cursor_param) if cursor_param else None
+        except (ValueError, UnicodeDecodeError):
+            return jsonify({"status": "error", "message": "잘못된 cursor 값입니다"}), 400
+
+        feed_user = request.args.get('user')
+        if fmt:
+            sql, params = wsgi.build_messages_page_query(after, limit, user=feed_user)
+            response = stream_page_response(iter_query_rows(sql, params), limit, fmt,
+                                            next_marker=wsgi.encode_cursor)
+            wsgi.async_log_api_stats('/db/messages', 'GET', 'success', user_id)
+            return response
+
+        page = await load_user_feed_page(feed_user, limit) if feed_user and after is None else None
+        if page is None:
+            sql, params = wsgi.build_messages_page_query(after, limit, user=feed_user)
+            page = wsgi.split_page(await db_fetchall(sql, params, read_only=True), limit)
+        messages, next_cursor = page
+
+        wsgi.async_log_api_stats('/db/messages', 'GET', 'success', user_id)
+        return jsonify({
+            'status': 'success',
+            'data': messages,
+            'count': len(messages),
+            'next_cursor': next_cursor
+        })
+    except Exception as e:
+        if 'user_id' in session:
+            wsgi.async_log_api_stats('/db/messages', 'GET', 'error', session['user_id'])
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@quart_app.route('/db/messages/search', methods=['GET'])
+@login_required
+async def search_messages():
+    try:
+        query = request.args.get('q', '')
+        user_id = session['user_id']
+        fmt = wsgi.stream_format(request)
+        if fmt:
+            limit = wsgi.parse_stream_limit(request.args.get('limit'), wsgi.MESSAGES_DEFAULT_PAGE_SIZE)
+        else:
+            limit = wsgi.parse_page_size(request.args.get('limit'))
+        try:
+            offset = max(0, int(request.args.get('offset', 0)))
+        except ValueError:
+            offset = 0
+        mode = wsgi.resolve_search_mode(query, request.args.get('mode', 'auto'))
+        page_key = f"{mode}:{offset}:{limit}"
+
+        if fmt:
+            # 대용량 내보내기는 캐시하지 않고 DB 에서 바로 스트리밍
+            sql, params = wsgi.build_search_query(query, mode, limit, offset)
+            response = stream_page_response(
+                iter_query_rows(sql, params), limit, fmt,
+                next_marker=lambda row: offset + limit,
+                marker_key='next_offset',
+                extra={'mode': mode}
+            )
+            wsgi.async_log_api_stats('/db/messages/search', 'GET', 'success', user_id)
+            return response
+
+        cached_results, version = await get_search_cache(query, page_key)
+        if cached_results:
+            wsgi.async_log_api_stats('/db/messages/search', 'GET', 'cache_hit', user_id)
+            return jsonify(cached_results)
+
+        async def load_from_db():
+            sql, params = wsgi.build_search_query(query, mode, limit, offset)
+            return wsgi.build_search_response(await db_fetchall(sql, params), mode, limit, offset)
+
+        response = await load_search_single_flight(query, page_key, version, load_from_db)
+        wsgi.async_log_api_stats('/db/messages/search', 'GET', 'success', user_id)
+        return jsonify(response)
+    except Exception as e:
+        if 'user_id' in session:
+            wsgi.async_log_api_stats('/db/messages/search', 'GET', 'error', session['user_id'])
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@quart_app.route('/logs/redis', methods=['GET'])
+async def get_redis_logs():
+    try:
+        client = get_redis()
+        if client:
+            logs = await client.lrange('api_logs', 0, -1)
+            return jsonify([loads(log) for log in logs])
+        else:
+            return jsonify({"status": "error", "message": "Redis 연결 불가"}), 500
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@quart_app.route('/logs/kafka', methods=['GET'])
+@login_required
+async def get_kafka_logs():
+    try:
+        limit = int(request.args.get('limit', 100))
+        endpoint = request.args.get('endpoint')
+        status = request.args.get('status')
+        user_id = request.args.get('user_id')
+        start_time, end_time = parse_date_range()
+
+        fmt = wsgi.stream_format(request)
+        if fmt and request.args.get('source') != 'kafka':
+            conditions, params = wsgi.api_log_filter_conditions(endpoint, status, user_id, start_time, end_time)
+            return await stream_api_logs(conditions, params, limit, request.args.get('cursor'), fmt, {
+                'filters': {
+                    'endpoint': endpoint,
+                    'status': status,
+                    'user_id': user_id,
+                    'start_date': request.args.get('start_date'),
+                    'end_date': request.args.get('end_date')
+                }
+            })
+
+        next_cursor = None
+        if request.args.get('source') == 'kafka':
+            logs = await kafka_log_reader.scan(
+                lambda log: wsgi.kafka_log_matches(log, endpoint, status, user_id, start_time, end_time),
+                limit, start_time, end_time)
+        else:
+            conditions, params = wsgi.api_log_filter_conditions(endpoint, status, user_id, start_time, end_time)
+            logs, next_cursor = await fetch_api_logs(conditions, params, limit, request.args.get('cursor'))
+
+        return jsonify({
+            'status': 'success',
+            'data': logs,
+            'count': len(logs),
+            'next_cursor': next_cursor,
+            'filters': {
+                'endpoint': endpoint,
+                'status': status,
+                'user_id': user_id,
+                'start_date': request.args.get('start_date'),
+                'end_date': request.args.get('end_date')
+            }
+        })
+    except Exception as e:
+        print(f"Kafka log retrieval error: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@quart_app.route('/logs/kafka/stats', methods=['GET'])
+@login_required
+async def get_kafka_statistics():
+    try:
+        return jsonify({'status': 'success', 'data': await get_api_statistics()})
+    except Exception as e:
+        print(f"Kafka statistics error: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@quart_app.route('/logs/kafka/search', methods=['GET'])
+@login_required
+async def search_kafka_logs_endpoint():
+    try:
+        query = request.args.get('q', '')
+        if not query:
+            return jsonify({"status": "error", "message": "검색어를 입력해주세요"}), 400
+
+        limit = int(request.args.get('limit', 50))
+        next_cursor = None
+        if request.args.get('source') == 'kafka':
+            results = await kafka_log_reader.scan(lambda log: wsgi.kafka_log_contains(log, query), limit)
+        else:
+            start_time, end_time = parse_date_range()
+            conditions, params = wsgi.api_log_search_conditions(query, start_time, end_time)
+            fmt = wsgi.stream_format(request)
+            if fmt:
+                return await stream_api_logs(conditions, params, limit, request.args.get('cursor'), fmt,
+                                             {'query': query})
+            results, next_cursor = await fetch_api_logs(conditions, params, limit, request.args.get('cursor'))
+
+        return jsonify({
+            'status': 'success',
+            'data': results,
+            'count': len(results),
+            'next_cursor': next_cursor,
+            'query': query
+        })
+    except Exception as e:
+        print(f"Kafka log search error: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@quart_app.route('/logs/kafka/endpoints', methods=['GET'])
+@login_required
+async def get_endpoint_statistics():
+    try:
+        endpoint_stats = (await get_api_statistics()).get('endpoints', {})
+        top_endpoints = sorted(endpoint_stats.items(), key=lambda x: x[1], reverse=True)[:10]
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'top_endpoints': top_endpoints,
+                'total_endpoints': len(endpoint_stats)
+            }
+        })
+    except Exception as e:
+        print(f"Endpoint statistics error: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@quart_app.route('/logs/kafka/users', methods=['GET'])
+@login_required
+async def get_user_statistics():
+    try:
+        user_stats = (await get_api_statistics()).get('users', {})
+        top_users = sorted(user_stats.items(), key=lambda x: x[1], reverse=True)[:10]
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'top_users': top_users,
+                'total_users': len(user_stats)
+            }
+        })
+    except Exception as e:
+        print(f"User statistics error: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@quart_app.route('/logs/kafka/errors', methods=['GET'])
+@login_required
+async def get_error_logs():
+    try:
+        limit = int(request.args.get('limit', 20))
+        conditions, params = wsgi.api_log_filter_conditions(status='error')
+        logs, _ = await fetch_api_logs(conditions, params, limit, None)
+        return jsonify({
+            'status': 'success',
+            'data': logs,
+            'count': len(logs)
+        })
+    except Exception as e:
+        print(f"Error logs retrieval error: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+# 실시간 로그 tail (SSE) - app.LogTailHub 의 asyncio 버전, 연결이 스레드를 점유하지 않으므로
+# LOG_TAIL_MAX_CLIENTS 를 gthread 스레드 수로 제한하지 않음
+class AsyncLogTailSubscriber:
+    """SSE 연결 하나의 이벤트 큐 - 가득 차면 오래된 이벤트부터 버리고 개수를 알림"""
+    def __init__(self, types, max_queue):
+        self.types = types
+        self.max_queue = max_queue
+        self.after_id = None
+        self._events = deque()
+        self._dropped = 0
+        self._ready = asyncio.Event()
+
+    def push(self, event):
+        if len(self._events) >= self.max_queue:
+            self._events.popleft()
+            self._dropped += 1
+        self._events.append(event)
+        self._ready.set()
+
+    async def wait(self, timeout):
+        if not self._events:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._ready.clear()
+        events = list(self._events)
+        self._events.clear()
+        dropped, self._dropped = self._dropped, 0
+        return events, dropped
+
+class AsyncLogTailHub:
+    """구독자가 있는 동안만 XREAD 태스크 하나가 돌며 모든 연결에 이벤트를 나눠 줌"""
+    def __init__(self, key, max_clients, client_queue):
+        self.key = key
+        self.max_clients = max_clients
+        self.client_queue = client_queue
+        self._subscribers = set()
+        self._task = None
+        self.delivered = 0
+        self.rejected = 0
+
+    def subscribe(self, types):
+        if len(self._subscribers) >= self.max_clients:
+            self.rejected += 1
+            return None
+        subscriber = AsyncLogTailSubscriber(types, self.client_queue)
+        self._subscribers.add(subscriber)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self._subscribers.discard(subscriber)
+
+    async def _run(self):
+        # 블로킹 XREAD 전용 연결 (공용 클라이언트의 socket_timeout 보다 오래 대기)
+        client = aioredis.Redis(
+            host=os.getenv('REDIS_HOST', 'my-redis-master'),
+            port=6379,
+            password=os.getenv('REDIS_PASSWORD'),
+            decode_responses=True,
+            db=0,
+            socket_connect_timeout=5,
+            socket_timeout=wsgi.LOG_TAIL_BLOCK_MS / 1000.0 + 5
+        )
+        last_id = None
+        try:
+            while self._subscribers:
+                try:
+                    if last_id is None:
+                        latest = await client.xrevrange(self.key, count=1)
+                        last_id = latest[0][0] if latest else '0-0'
+                    response = await client.xread({self.key: last_id}, count=500, block=wsgi.LOG_TAIL_BLOCK_MS)
+                except Exception as e:
+                    print(f"Log tail read error: {str(e)}")
+                    await asyncio.sleep(1)
+                    continue
+                for _, entries in response or []:
+                    for entry_id, fields in entries:
+                        last_id = entry_id
+                        self._fan_out((entry_id, fields.get('type'), fields.get('data')))
+        finally:
+            # 구독자가 모두 떠나면 종료 - await 전에 비워 두어 다음 구독자가 새 태스크를 시작
+            self._task = None
+            await client.aclose()
+
+    def _fan_out(self, event):
+        subscribers = [s for s in self._subscribers if event[1] in s.types]
+        for subscriber in subscribers:
+            subscriber.push(event)
+        self.delivered += len(subscribers)
+
+    async def close(self):
+        self._subscribers.clear()
+        task = self._task
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+log_tail_hub = AsyncLogTailHub(wsgi.LOG_STREAM_KEY, int(os.getenv('LOG_TAIL_MAX_CLIENTS', 50)),
+                               wsgi.LOG_TAIL_CLIENT_QUEUE)
+
+@quart_app.route('/logs/stream', methods=['GET'])
+@login_required
+async def stream_logs():
+    """Redis 작업 로그(redis)와 API 로그(kafka)를 Server-Sent Events 로 실시간 전송"""
+    types = set(filter(None, request.args.get('types', 'redis,kafka').split(',')))
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        after = wsgi.parse_stream_id(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({"status": "error", "message": "잘못된 Last-Event-ID 입니다"}), 400
+
+    subscriber = log_tail_hub.subscribe(types)
+    if subscriber is None:
+        return jsonify({"status": "error", "message": "실시간 로그 연결 수가 한도에 도달했습니다"}), 503
+
+    backfill = []
+    if after:
+        # 재연결 - 구독을 먼저 등록한 뒤 놓친 구간을 스트림에서 읽으므로 빈틈이 없음
+        try:
+            client = get_redis()
+            if client:
+                backfill = await client.xrange(wsgi.LOG_STREAM_KEY, min=f"({last_event_id}",
+                                               count=wsgi.LOG_TAIL_CLIENT_QUEUE)
+        except Exception as e:
+            print(f"Log tail backfill error: {str(e)}")
+        subscriber.after_id = wsgi.parse_stream_id(backfill[-1][0]) if backfill else after
+
+    async def generate():
+        try:
+            yield "retry: 3000\n\n"
+            for entry_id, fields in backfill:
+                if fields.get('type') in types:
+                    yield wsgi.format_sse(entry_id, fields.get('type'), fields.get('data'))
+            while True:
+                events, dropped = await subscriber.wait(wsgi.LOG_TAIL_HEARTBEAT_S)
+                if dropped:
+                    yield f"event: dropped\ndata: {dropped}\n\n"
+                if not events and not dropped:
+                    yield ": keepalive\n\n"
+                for entry_id, event_type, data in events:
+                    if subscriber.after_id and wsgi.parse_stream_id(entry_id) <= subscriber.after_id:
+                        continue
+                    yield wsgi.format_sse(entry_id, event_type, data)
+        finally:
+            log_tail_hub.unsubscribe(subscriber)
+
+    response = quart_app.response_class(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.timeout = None
+    return response
+
+# 나머지 경로는 기존 Flask 앱이 처리 - a2wsgi 가 요청마다 스레드 풀(ASGI_WSGI_THREADS 개)의
+# 스레드 하나에서 실행하므로 느린 요청 하나가 다른 위임 요청을 막지 않음
+flask_asgi = WSGIMiddleware(wsgi.app, workers=int(os.getenv('ASGI_WSGI_THREADS', 16)))
+
+def handled_by_quart(scope):
+    if scope['method'] == 'OPTIONS':
+        # CORS preflight 는 flask-cors 가 응답
+        return False
+    adapter = quart_app.url_map.bind('')
+    try:
+        adapter.match(scope['path'], method=scope['method'])
+        return True
+    except HTTPException:
+        return False
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and not handled_by_quart(scope):
+        await flask_asgi(scope, receive, send)
+    else:
+        await quart_app(scope, receive, send)
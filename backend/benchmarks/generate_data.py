@@ -0,0 +1,181 @@
+"""
+벤치마크 데이터 생성기 - users / messages / api_logs 를 10k ~ 10M 규모로 채움
+
+사용법:
+    docker compose -f benchmarks/docker-compose.yml up -d
+    MYSQL_HOST=127.0.0.1 MYSQL_PASSWORD=benchpass REDIS_HOST=127.0.0.1 \
+        python benchmarks/generate_data.py --users 10000 --messages 1000000 --logs 1000000 --truncate
+
+같은 --seed 면 같은 데이터가 만들어진다. 모든 사용자의 비밀번호는 BENCH_PASSWORD 이다.
+api_logs 는 MariaDB 에 넣고, 같은 로그로 stats_aggregator 의 롤업 코드를 실행해 Redis 통계도 채운다.
+벤치마크 전용 DB 에서만 실행할 것 (--truncate 는 기존 행을 모두 지움).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import mysql.connector
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_PASSWORD = 'bench-password'
+WORDS = [
+    '안녕하세요', '테스트', '메시지', '쿠버네티스', '마이크로서비스', '데모', '샘플',
+    '데이터', '검색', '캐시', 'redis', 'kafka', 'mariadb', 'backend', 'frontend',
+    'deploy', 'cluster', 'service', 'latency', 'throughput'
+]
+ENDPOINTS = [
+    ('/db/messages', 'GET'), ('/db/message', 'POST'), ('/db/messages/search', 'GET'),
+    ('/logs/redis', 'GET'), ('/logs/kafka', 'GET'), ('/logs/kafka/stats', 'GET')
+]
+STATUSES = ['success', 'cache_hit', 'error']
+STATUS_WEIGHTS = [85, 12, 3]
+SPAN_DAYS = 30
+BATCH_SIZE = 5000
+
+def connect():
+    return mysql.connector.connect(
+        host=os.getenv('MYSQL_HOST', 'my-mariadb'),
+        user=os.getenv('MYSQL_USER', 'testuser'),
+        password=os.getenv('MYSQL_PASSWORD'),
+        database="testdb",
+        connect_timeout=30
+    )
+
+def usernames(count):
+    return [f"benchuser{i:07d}" for i in range(count)]
+
+def pick_user(rng, users):
+    # 소수의 사용자가 대부분을 쓰는 분포 (파레토)
+    return users[int(rng.paretovariate(1.2) - 1) % len(users)]
+
+def iter_messages(count, users, rng):
+    base = datetime.now().replace(microsecond=0) - timedelta(days=SPAN_DAYS)
+    step = SPAN_DAYS * 86400 / max(count, 1)
+    for i in range(count):
+        text = ' '.join(rng.choices(WORDS, k=rng.randint(4, 16)))
+        yield text, base + timedelta(seconds=int(i * step)), pick_user(rng, users)
+
+def iter_api_logs(count, users, rng):
+    """async_log_api_stats 가 Kafka 로 보내는 것과 같은 형식의 로그"""
+    base = datetime.now() - timedelta(days=SPAN_DAYS)
+    step = SPAN_DAYS * 86400 / max(count, 1)
+    for i in range(count):
+        endpoint, method = rng.choice(ENDPOINTS)
+        status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+        user_id = pick_user(rng, users)
+        yield {
+            'timestamp': (base + timedelta(seconds=i * step)).isoformat(),
+            'endpoint': endpoint,
+            'method': method,
+            'status': status,
+            'user_id': user_id,
+            'message': f"{user_id}가 {method} {endpoint} 호출 ({status})"
+        }
+
+def insert_batches(db, sql, rows, label):
+    cursor = db.cursor()
+    batch = []
+    total = 0
+    started = time.monotonic()
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            cursor.executemany(sql, batch)
+            db.commit()
+            total += len(batch)
+            batch = []
+            if total % 100000 == 0:
+                print(f"  {label}: {total} rows ({total / (time.monotonic() - started):.0f} rows/s)")
+    if batch:
+        cursor.executemany(sql, batch)
+        db.commit()
+        total += len(batch)
+    cursor.close()
+    print(f"{label}: {total} rows in {time.monotonic() - started:.1f}s")
+
+def seed_mysql(db, users, message_count, log_count, seed, truncate):
+    rng = random.Random(seed)
+    cursor = db.cursor()
+    if truncate:
+        for table in ('messages', 'users', 'api_logs'):
+            cursor.execute(f"TRUNCATE TABLE {table}")
+    cursor.close()
+
+    from password_hashing import hash_password
+    # 사용자마다 해시하면 10k 명에도 몇 분이 걸리므로 같은 해시를 공유
+    password_hash = hash_password(BENCH_PASSWORD)
+    insert_batches(db, "INSERT IGNORE INTO users (username, password) VALUES (%s, %s)",
+                   ((username, password_hash) for username in users), 'users')
+    insert_batches(db, "INSERT INTO messages (message, created_at, user_id) VALUES (%s, %s, %s)",
+                   iter_messages(message_count, users, rng), 'messages')
+    # 파티션 3개짜리 토픽에서 적재된 것처럼 (partition, offset) 부여
+    insert_batches(db, (
+        "INSERT IGNORE INTO api_logs (logged_at, endpoint, method, status, user_id, message, "
+        "kafka_partition, kafka_offset) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
+    ), ((datetime.fromisoformat(log['timestamp']), log['endpoint'], log['method'], log['status'],
+         log['user_id'], log['message'], i % 3, i // 3)
+        for i, log in enumerate(iter_api_logs(log_count, users, rng))), 'api_logs')
+
+def reset_redis_state(truncate):
+    """DB 를 직접 채웠으므로 DB 에서 파생된 Redis 상태(검색 캐시, 사용자 피드, 사용자명 블룸 필터)를 무효화"""
+    import app
+    client = app.redis_client_shared
+    app.bump_messages_version()
+    client.delete(app.USERNAME_BLOOM_KEY, app.USERNAME_BLOOM_READY_KEY)
+    patterns = ['feed:user:*']
+    if truncate:
+        patterns.append('stats:*')
+    for pattern in patterns:
+        for key in client.scan_iter(pattern, count=1000):
+            client.delete(key)
+
+def apply_seed_batch(stats_aggregator, tp, batch):
+    # 가짜 offset 이므로 실행 중인 집계기의 offset 과 비교(WATCH)하지 않고 반영
+    counters, offsets, _ = stats_aggregator.aggregate({tp: batch})
+    stats_aggregator.apply(counters, offsets)
+
+def seed_redis_stats(log_count, user_count, seed):
+    """stats_aggregator 의 aggregate/apply 로 통계 롤업을 채움 (app 의 Redis 연결 사용)"""
+    import stats_aggregator
+    from kafka import TopicPartition
+    from standins import Record
+
+    rng = random.Random(seed + 1)
+    users = usernames(user_count)
+    tp = TopicPartition(stats_aggregator.TOPIC, 0)
+    batch = []
+    for offset, log in enumerate(iter_api_logs(log_count, users, rng)):
+        batch.append(Record(tp.topic, 0, offset, 0, None, log))
+        if len(batch) >= BATCH_SIZE:
+            apply_seed_batch(stats_aggregator, tp, batch)
+            batch = []
+    if batch:
+        apply_seed_batch(stats_aggregator, tp, batch)
+    # 가짜 offset 이 실제 집계기의 시작 위치로 쓰이지 않도록 제거
+    stats_aggregator.redis_client_shared.delete(stats_aggregator.STATS_OFFSETS_KEY)
+    print(f"redis stats: {log_count} logs aggregated")
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 데이터 생성")
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--messages', type=int, default=100000)
+    parser.add_argument('--logs', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--truncate', action='store_true', help="기존 users/messages/api_logs 행 삭제")
+    parser.add_argument('--skip-redis', action='store_true')
+    args = parser.parse_args()
+
+    db = connect()
+    seed_mysql(db, usernames(args.users), args.messages, args.logs, args.seed, args.truncate)
+    db.close()
+    if not args.skip_redis:
+        reset_redis_state(args.truncate)
+        seed_redis_stats(args.logs, args.users, args.seed)
+
+if __name__ == '__main__':
+    main()
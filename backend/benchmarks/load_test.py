@@ -0,0 +1,169 @@
+"""
+HTTP 부하 테스트 - 동시 요청 수별 처리량과 지연시간(p50/p95/p99) 측정
+
+사용법:
+    # 워커 수를 바꿔 가며 서버 실행 후 같은 부하를 걸어 코어 수에 따른 확장성 비교
+    GUNICORN_WORKERS=1 gunicorn -c gunicorn.conf.py app:app
+    python benchmarks/load_test.py --url http://localhost:5000 --path /db/messages \
+        --concurrency 32 --duration 30
+
+    # 여러 경로를 비율대로 섞은 시나리오 (SCENARIOS), 결과 저장 후 다음 실행에서 기준으로 비교
+    python benchmarks/load_test.py --scenario read-heavy --username benchuser0000000 \
+        --password bench-password --json load.json
+    python benchmarks/load_test.py --scenario read-heavy ... --baseline load.json --tolerance 0.2
+
+로그인이 필요한 경로는 --username/--password 로 로그인한 세션 쿠키를 스레드마다 사용한다.
+--baseline 과 비교해 p95 가 tolerance 비율 이상 느려진 요청이 있으면 종료 코드 1 로 끝난다.
+"""
+import argparse
+import http.cookiejar
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+# (가중치, 메서드, 경로, 본문)
+SCENARIOS = {
+    'read-heavy': [
+        (60, 'GET', '/db/messages?limit=20', None),
+        (20, 'GET', '/db/messages/search?q=' + urllib.parse.quote('쿠버네티스 데모'), None),
+        (10, 'GET', '/logs/kafka/stats', None),
+        (10, 'POST', '/db/message', {'message': 'load test message'})
+    ],
+    'write-heavy': [
+        (30, 'GET', '/db/messages?limit=20', None),
+        (70, 'POST', '/db/message', {'message': 'load test message'})
+    ]
+}
+
+def make_opener(base_url, username, password):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    if username:
+        body = json.dumps({'username': username, 'password': password}).encode('utf-8')
+        req = urllib.request.Request(f"{base_url}/login", data=body, headers={'Content-Type': 'application/json'})
+        opener.open(req, timeout=10).read()
+    return opener
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+def summarize(latencies, errors, elapsed):
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'mean_ms': round(statistics.mean(latencies), 2) if latencies else 0.0
+    }
+
+def compare_with_baseline(results, baseline, metric, tolerance):
+    """baseline 보다 metric 이 tolerance 비율 이상 커진 항목 - [(이름, 기준값, 현재값)]"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name) or {}
+        if base.get(metric) and result.get(metric, 0) > base[metric] * (1 + tolerance):
+            regressions.append((name, base[metric], result[metric]))
+    return regressions
+
+def report(results, args, metric):
+    """결과 출력/저장 후 --baseline 이 있으면 비교 - 회귀가 있으면 종료 코드 1"""
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, metric, args.tolerance)
+        for name, base, current in regressions:
+            print(f"REGRESSION {name}: {metric} {base} -> {current}")
+        if regressions:
+            sys.exit(1)
+        print(f"no {metric} regression over {args.tolerance:.0%}")
+
+def build_requests(args):
+    if args.scenario:
+        return SCENARIOS[args.scenario]
+    body = json.loads(args.body) if args.body else None
+    return [(1, args.method, args.path, body)]
+
+def run(args):
+    requests = build_requests(args)
+    names = [f"{method} {path.split('?')[0]}" for _, method, path, _ in requests]
+    weights = [weight for weight, _, _, _ in requests]
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    def worker(seed):
+        opener = make_opener(args.url, args.username, args.password)
+        rng = random.Random(seed)
+        local = {name: [] for name in names}
+        local_errors = {name: 0 for name in names}
+        while time.monotonic() < deadline:
+            index = rng.choices(range(len(requests)), weights)[0]
+            _, method, path, body = requests[index]
+            data = json.dumps(body).encode('utf-8') if body is not None else None
+            req = urllib.request.Request(f"{args.url}{path}", data=data, method=method,
+                                         headers={'Content-Type': 'application/json'})
+            start = time.perf_counter()
+            try:
+                opener.open(req, timeout=30).read()
+            except (urllib.error.URLError, OSError):
+                local_errors[names[index]] += 1
+                continue
+            local[names[index]].append((time.perf_counter() - start) * 1000)
+        with lock:
+            for name in names:
+                latencies[name].extend(local[name])
+                errors[name] += local_errors[name]
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.concurrency)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - started
+
+    results = {}
+    if len(set(names)) > 1:
+        results['total'] = summarize([v for name in latencies for v in latencies[name]],
+                                     sum(errors.values()), elapsed)
+    for name in latencies:
+        results[name] = summarize(latencies[name], errors[name], elapsed)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="백엔드 HTTP 부하 테스트")
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--path', default='/db/messages')
+    parser.add_argument('--method', default='GET')
+    parser.add_argument('--body', default=None, help="요청 본문(JSON 문자열)")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default=None,
+                        help="여러 경로를 가중치대로 섞어 요청 (--path/--method/--body 무시)")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--username', default=None)
+    parser.add_argument('--password', default=None)
+    parser.add_argument('--json', default=None, help="결과를 저장할 JSON 파일")
+    parser.add_argument('--baseline', default=None, help="비교할 이전 결과 JSON 파일")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    report(run(args), args, 'p95_ms')
+
+if __name__ == '__main__':
+    main()
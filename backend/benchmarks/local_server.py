@@ -0,0 +1,42 @@
+"""
+벤치마크용 로컬 서버 - standins 를 설치한 app 을 한 프로세스(다중 스레드)로 실행
+
+사용법:
+    BENCH_REDIS=fakeredis MYSQL_HOST=127.0.0.1 MYSQL_PASSWORD=benchpass \
+        python benchmarks/local_server.py --port 5000
+    python benchmarks/load_test.py --scenario read-heavy --username benchuser0000000 --password bench-password
+
+fakeredis 와 메모리 Kafka 는 프로세스마다 따로이므로 gunicorn 다중 워커로는 띄우지 않는다.
+Redis 를 로컬 redis-server 로 두면 gunicorn -c gunicorn.conf.py 로 운영과 같은 구성도 측정할 수 있다
+(이때 Kafka 는 실제 브로커가 필요하고, 없으면 로그 전송만 실패하고 요청 처리는 계속된다).
+"""
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from werkzeug.serving import run_simple  # noqa: E402
+
+import standins  # noqa: E402
+import app as backend  # noqa: E402
+from generate_data import seed_redis_stats  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 로컬 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--stats-logs', type=int, default=0, help="시작 시 통계 롤업에 넣을 로그 수")
+    args = parser.parse_args()
+
+    standins.install(backend)
+    if args.stats_logs:
+        seed_redis_stats(args.stats_logs, 10000, 42)
+    # 요청마다 찍는 접근 로그가 측정에 섞이지 않도록 끔
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    run_simple(args.host, args.port, backend.app, threaded=True)
+
+if __name__ == '__main__':
+    main()
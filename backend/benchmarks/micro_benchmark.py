@@ -0,0 +1,146 @@
+"""
+핫 패스 마이크로 벤치마크 - search_messages / get_api_statistics / log_to_redis / async_log_api_stats
+
+사용법:
+    # MariaDB 없이 Redis/Kafka 경로만 (프로세스 내 fakeredis, 메모리 Kafka)
+    BENCH_REDIS=fakeredis python benchmarks/micro_benchmark.py \
+        --only get_api_statistics,log_to_redis,async_log_api_stats
+
+    # 전체 - generate_data.py 로 채운 로컬 MariaDB/Redis 사용, 결과 저장
+    MYSQL_HOST=127.0.0.1 MYSQL_PASSWORD=benchpass REDIS_HOST=127.0.0.1 \
+        python benchmarks/micro_benchmark.py --json micro.json
+
+    # 변경 후 같은 조건으로 다시 실행해 비교 - p95 가 tolerance 비율 이상 느려지면 종료 코드 1
+    ... python benchmarks/micro_benchmark.py --baseline micro.json --tolerance 0.2
+
+search_messages 는 Flask 테스트 클라이언트로 라우트 전체(세션, 캐시, 직렬화 포함)를 실행하고,
+나머지는 함수를 직접 호출한다. 시간은 호출 한 번 단위(마이크로초)로 기록한다.
+"""
+import argparse
+import os
+import platform
+import sys
+import time
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import standins  # noqa: E402
+import app as backend  # noqa: E402
+from generate_data import seed_redis_stats, usernames  # noqa: E402
+from load_test import percentile, report  # noqa: E402
+
+BENCHMARKS = ['search_messages', 'get_api_statistics', 'log_to_redis', 'async_log_api_stats']
+
+def measure(fn, iterations, warmup, setup=None):
+    """setup 은 측정 시간에서 제외"""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    timings = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter_ns()
+        fn()
+        timings.append((time.perf_counter_ns() - start) / 1000)
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'ops_per_s': round(iterations / (sum(timings) / 1e6), 1),
+        'p50_us': round(percentile(timings, 50), 1),
+        'p95_us': round(percentile(timings, 95), 1),
+        'p99_us': round(percentile(timings, 99), 1),
+        'max_us': round(timings[-1], 1)
+    }
+
+def logged_in_client(username):
+    client = backend.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = username
+    return client
+
+def bench_search_messages(args):
+    client = logged_in_client(usernames(1)[0])
+    url = f"/db/messages/search?q={quote(args.query)}&limit=20"
+
+    def search():
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url}: {response.status_code} {response.get_data(as_text=True)[:200]}")
+
+    def drop_all_caches():
+        backend.bump_messages_version()
+        backend.search_l1_cache.invalidate()
+
+    results = {
+        'search_messages[db]': measure(search, args.db_iterations, args.warmup, setup=drop_all_caches),
+    }
+    search()
+    results['search_messages[redis_hit]'] = measure(search, args.iterations, args.warmup,
+                                                    setup=backend.search_l1_cache.invalidate)
+    search()
+    results['search_messages[l1_hit]'] = measure(search, args.iterations, args.warmup)
+    return results
+
+def bench_get_api_statistics(args):
+    return {'get_api_statistics': measure(backend.get_api_statistics, args.iterations, args.warmup)}
+
+def bench_log_to_redis(args):
+    results = {
+        'log_to_redis': measure(lambda: backend.log_to_redis('benchmark', 'micro benchmark entry'),
+                                args.iterations, args.warmup)
+    }
+    # 요청 스레드 밖에서 실행되는 배치 기록(LPUSH + LTRIM + XADD 파이프라인) 비용
+    buffer = backend.redis_log_buffer
+    batch = [{'timestamp': '2026-01-01T00:00:00', 'action': 'benchmark', 'details': 'x' * 64}] * buffer.batch_size
+    results[f'log_to_redis[flush {buffer.batch_size}]'] = measure(
+        lambda: buffer._flush(batch), max(1, args.iterations // 100), args.warmup // 100)
+    buffer.close()
+    print(f"redis_log_buffer: {buffer.stats()}")
+    return results
+
+def bench_async_log_api_stats(args):
+    results = {
+        'async_log_api_stats': measure(
+            lambda: backend.async_log_api_stats('/db/messages', 'GET', 'success', 'benchuser0000000'),
+            args.iterations, args.warmup)
+    }
+    backend.kafka_log_shipper.close()
+    print(f"kafka_log_shipper: {backend.kafka_log_shipper.stats()}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="핫 패스 마이크로 벤치마크")
+    parser.add_argument('--only', default=','.join(BENCHMARKS), help="쉼표로 구분한 벤치마크 이름")
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--db-iterations', type=int, default=200, help="DB 를 조회하는(캐시 미스) 측정 횟수")
+    parser.add_argument('--warmup', type=int, default=200)
+    parser.add_argument('--query', default='쿠버네티스 데모')
+    parser.add_argument('--stats-logs', type=int, default=None,
+                        help="통계 롤업에 미리 넣을 로그 수 (기본: fakeredis 이면 100000, 아니면 0)")
+    parser.add_argument('--json', default=None, help="결과를 저장할 JSON 파일")
+    parser.add_argument('--baseline', default=None, help="비교할 이전 결과 JSON 파일")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    standins.install(backend)
+    stats_logs = args.stats_logs
+    if stats_logs is None:
+        stats_logs = 100000 if os.getenv('BENCH_REDIS') == 'fakeredis' else 0
+    if stats_logs:
+        seed_redis_stats(stats_logs, 10000, 42)
+
+    print(f"python {platform.python_version()} on {platform.machine()}, {os.cpu_count()} cpus")
+    results = {}
+    for name in args.only.split(','):
+        name = name.strip()
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+        results.update(globals()[f"bench_{name}"](args))
+    report(results, args, 'p95_us')
+
+if __name__ == '__main__':
+    main()
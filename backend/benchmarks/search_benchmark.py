@@ -0,0 +1,98 @@
+"""
+메시지 검색 벤치마크 - LIKE '%q%' 와 FULLTEXT MATCH ... AGAINST 비교
+
+사용법:
+    MYSQL_HOST=... MYSQL_USER=... MYSQL_PASSWORD=... \
+        python benchmarks/search_benchmark.py --rows 1000000 --iterations 50
+
+운영 테이블을 건드리지 않도록 testdb.messages 와 같은 구조의 messages_bench 테이블을
+만들어 데이터를 채운 뒤 측정한다. (--skip-seed 로 기존 데이터 재사용)
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import mysql.connector
+
+WORDS = [
+    '안녕하세요', '테스트', '메시지', '쿠버네티스', '마이크로서비스', '데모', '샘플',
+    '데이터', '검색', '캐시', 'redis', 'kafka', 'mariadb', 'backend', 'frontend',
+    'deploy', 'cluster', 'service', 'latency', 'throughput'
+]
+QUERIES = ['테스트', '쿠버네티스 데모', 'kafka', 'latency throughput', '캐시']
+
+def connect():
+    return mysql.connector.connect(
+        host=os.getenv('MYSQL_HOST', 'my-mariadb'),
+        user=os.getenv('MYSQL_USER', 'testuser'),
+        password=os.getenv('MYSQL_PASSWORD'),
+        database="testdb",
+        connect_timeout=30
+    )
+
+def seed(db, rows, batch=5000):
+    cursor = db.cursor()
+    cursor.execute("DROP TABLE IF EXISTS messages_bench")
+    cursor.execute("CREATE TABLE messages_bench LIKE messages")
+    base = datetime.now() - timedelta(days=365)
+    sql = "INSERT INTO messages_bench (message, created_at, user_id) VALUES (%s, %s, %s)"
+    for start in range(0, rows, batch):
+        values = []
+        for i in range(start, min(start + batch, rows)):
+            text = ' '.join(random.choices(WORDS, k=random.randint(4, 16)))
+            values.append((text, base + timedelta(seconds=i * 30), f"user{i % 1000}"))
+        cursor.executemany(sql, values)
+        db.commit()
+    cursor.close()
+    print(f"seeded {rows} rows into messages_bench")
+
+def run(db, sql, params, iterations):
+    cursor = db.cursor()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    cursor.close()
+    timings.sort()
+    return {
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(timings[int(len(timings) * 0.95) - 1], 2),
+        'max_ms': round(timings[-1], 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="LIKE vs FULLTEXT 검색 벤치마크")
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--skip-seed', action='store_true')
+    args = parser.parse_args()
+
+    db = connect()
+    if not args.skip_seed:
+        seed(db, args.rows)
+
+    like_sql = ("SELECT id, message, created_at FROM messages_bench WHERE message LIKE %s "
+                "ORDER BY created_at DESC, id DESC LIMIT %s")
+    fulltext_sql = ("SELECT id, message, created_at, MATCH(message) AGAINST (%s IN BOOLEAN MODE) AS score "
+                    "FROM messages_bench WHERE MATCH(message) AGAINST (%s IN BOOLEAN MODE) "
+                    "ORDER BY score DESC, created_at DESC, id DESC LIMIT %s")
+
+    print(f"{'query':<24}{'path':<10}{'p50_ms':>10}{'p95_ms':>10}{'max_ms':>10}")
+    for query in QUERIES:
+        boolean_query = ' '.join(f"+{term}*" for term in query.split())
+        results = {
+            'like': run(db, like_sql, (f"%{query}%", args.limit), args.iterations),
+            'fulltext': run(db, fulltext_sql, (boolean_query, boolean_query, args.limit), args.iterations)
+        }
+        for path, r in results.items():
+            print(f"{query:<24}{path:<10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['max_ms']:>10}")
+    db.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+"""
+벤치마크용 로컬 대체 구성요소 - 클러스터 없이 Linux 머신 한 대에서 app.py 를 측정
+
+    BENCH_REDIS=server     REDIS_HOST 의 redis-server 사용 (기본, docker-compose.yml 의 redis)
+    BENCH_REDIS=fakeredis  프로세스 내 가짜 Redis (fakeredis[lua] 필요, Lua 스크립트 포함)
+    BENCH_KAFKA=memory     프로세스 내 Kafka 어댑터 (기본)
+    BENCH_KAFKA=server     KAFKA_SERVERS 의 실제 브로커 사용
+
+MariaDB 는 대체하지 않고 docker-compose.yml 의 컨테이너(또는 로컬 mariadb)를 MYSQL_HOST 로 지정한다.
+FULLTEXT 검색, 키셋 인덱스, unbuffered 커서처럼 측정하려는 동작 자체가 MariaDB 의 것이라
+SQLite 로 바꾸면 의미 있는 수치가 나오지 않는다.
+
+install(app) 은 app 을 import 한 뒤 첫 Redis/Kafka 사용 전에 호출한다.
+프로세스 내 대체물은 프로세스마다 따로이므로 HTTP 부하 테스트는 local_server.py 한 프로세스로 띄운다.
+"""
+import os
+import time
+from collections import defaultdict, namedtuple
+from threading import Lock
+
+from kafka import TopicPartition
+
+Record = namedtuple('Record', 'topic partition offset timestamp key value')
+RecordMetadata = namedtuple('RecordMetadata', 'topic partition offset')
+OffsetAndTimestamp = namedtuple('OffsetAndTimestamp', 'offset timestamp')
+
+class InMemoryBroker:
+    """토픽마다 파티션 하나짜리 로그 - 값은 직렬화된 바이트로 보관하여 (역)직렬화 비용은 실제와 같게 유지"""
+    def __init__(self):
+        self._lock = Lock()
+        self.topics = defaultdict(list)
+        self.committed = {}
+
+    def append(self, topic, key, value, timestamp_ms=None):
+        with self._lock:
+            log = self.topics[topic]
+            record = Record(topic, 0, len(log), timestamp_ms or int(time.time() * 1000), key, value)
+            log.append(record)
+            return record
+
+    def read(self, topic, start, count):
+        with self._lock:
+            return self.topics[topic][start:start + count]
+
+    def end_offset(self, topic):
+        with self._lock:
+            return len(self.topics[topic])
+
+    def offset_for_time(self, topic, timestamp_ms):
+        with self._lock:
+            for record in self.topics[topic]:
+                if record.timestamp >= timestamp_ms:
+                    return OffsetAndTimestamp(record.offset, record.timestamp)
+        return None
+
+broker = InMemoryBroker()
+
+class _SentFuture:
+    def __init__(self, metadata):
+        self._metadata = metadata
+
+    def add_callback(self, fn, *args, **kwargs):
+        fn(*args, self._metadata, **kwargs)
+        return self
+
+    def add_errback(self, fn, *args, **kwargs):
+        return self
+
+    def get(self, timeout=None):
+        return self._metadata
+
+class InMemoryKafkaProducer:
+    """kafka.KafkaProducer 에서 app 이 쓰는 부분(send/flush/close)만 구현"""
+    def __init__(self, value_serializer=None, key_serializer=None, **config):
+        self.value_serializer = value_serializer
+        self.key_serializer = key_serializer
+
+    def send(self, topic, value=None, key=None, timestamp_ms=None, **kwargs):
+        if self.value_serializer is not None:
+            value = self.value_serializer(value)
+        if key is not None and self.key_serializer is not None:
+            key = self.key_serializer(key)
+        record = broker.append(topic, key, value, timestamp_ms)
+        return _SentFuture(RecordMetadata(topic, record.partition, record.offset))
+
+    def flush(self, timeout=None):
+        pass
+
+    def close(self, timeout=None):
+        pass
+
+class InMemoryKafkaConsumer:
+    """kafka.KafkaConsumer 대체 - 구독(그룹 offset 포함)과 수동 할당/seek/offset 조회 지원
+
+    consumer_timeout_ms 가 있으면 실제 컨슈머처럼 새 레코드를 그만큼 기다린 뒤 반복을 끝낸다.
+    """
+    def __init__(self, *topics, value_deserializer=None, group_id=None, auto_offset_reset='latest',
+                 enable_auto_commit=True, consumer_timeout_ms=None, max_poll_records=500, **config):
+        self.value_deserializer = value_deserializer
+        self.group_id = group_id
+        self.auto_offset_reset = auto_offset_reset
+        self.enable_auto_commit = enable_auto_commit and group_id is not None
+        self.consumer_timeout_ms = consumer_timeout_ms
+        self.max_poll_records = max_poll_records
+        self._positions = {}
+        self._paused = set()
+        if topics:
+            self.assign([TopicPartition(topic, 0) for topic in topics])
+            for tp in self._positions:
+                committed = broker.committed.get((group_id, tp)) if group_id else None
+                if committed is not None:
+                    self._positions[tp] = committed
+                elif auto_offset_reset == 'earliest':
+                    self._positions[tp] = 0
+
+    def partitions_for_topic(self, topic):
+        return {0}
+
+    def assign(self, partitions):
+        self._positions = {tp: broker.end_offset(tp.topic) for tp in partitions}
+        self._paused.intersection_update(self._positions)
+
+    def assignment(self):
+        return set(self._positions)
+
+    def pause(self, *partitions):
+        self._paused.update(partitions)
+
+    def resume(self, *partitions):
+        self._paused.difference_update(partitions)
+
+    def seek(self, partition, offset):
+        self._positions[partition] = offset
+
+    def seek_to_beginning(self, *partitions):
+        for tp in partitions or list(self._positions):
+            self._positions[tp] = 0
+
+    def seek_to_end(self, *partitions):
+        for tp in partitions or list(self._positions):
+            self._positions[tp] = broker.end_offset(tp.topic)
+
+    def position(self, partition):
+        return self._positions[partition]
+
+    def beginning_offsets(self, partitions):
+        return {tp: 0 for tp in partitions}
+
+    def end_offsets(self, partitions):
+        return {tp: broker.end_offset(tp.topic) for tp in partitions}
+
+    def offsets_for_times(self, timestamps):
+        return {tp: broker.offset_for_time(tp.topic, ts) for tp, ts in timestamps.items()}
+
+    def _deserialize(self, record):
+        value = self.value_deserializer(record.value) if self.value_deserializer else record.value
+        return record._replace(value=value)
+
+    def poll(self, timeout_ms=0, max_records=None):
+        remaining = max_records or self.max_poll_records
+        result = {}
+        for tp, position in self._positions.items():
+            if remaining <= 0:
+                break
+            if tp in self._paused:
+                continue
+            records = broker.read(tp.topic, position, remaining)
+            if records:
+                result[tp] = [self._deserialize(r) for r in records]
+                self._positions[tp] = position + len(records)
+                remaining -= len(records)
+        if not result and timeout_ms:
+            time.sleep(timeout_ms / 1000.0)
+        return result
+
+    def _has_pending(self):
+        return any(broker.end_offset(tp.topic) > position for tp, position in self._positions.items())
+
+    def __iter__(self):
+        while True:
+            records = self.poll()
+            for messages in records.values():
+                yield from messages
+            if records or self._has_pending():
+                continue
+            if self.consumer_timeout_ms is None:
+                time.sleep(0.1)
+                continue
+            time.sleep(self.consumer_timeout_ms / 1000.0)
+            if not self._has_pending():
+                return
+
+    def commit(self, offsets=None):
+        if self.group_id is None:
+            return
+        for tp, offset in (offsets or self._positions).items():
+            broker.committed[(self.group_id, tp)] = getattr(offset, 'offset', offset)
+
+    def close(self, autocommit=True):
+        if autocommit and self.enable_auto_commit:
+            self.commit()
+
+def install_fakeredis(app):
+    """app 의 Redis 커넥션 풀이 fakeredis 서버에 연결되도록 교체 (등록된 Lua 스크립트/클라이언트는 그대로)"""
+    import fakeredis
+    server = fakeredis.FakeServer()
+    for pool in (app.redis_pool, app.redis_pool_binary):
+        pool.disconnect()
+        pool.connection_class = fakeredis.FakeConnection
+        pool.connection_kwargs['server'] = server
+    return server
+
+def install_memory_kafka(app):
+    app.KafkaProducer = InMemoryKafkaProducer
+    app.KafkaConsumer = InMemoryKafkaConsumer
+    return broker
+
+def install(app, redis=None, kafka=None):
+    redis = redis or os.getenv('BENCH_REDIS', 'server')
+    kafka = kafka or os.getenv('BENCH_KAFKA', 'memory')
+    if redis == 'fakeredis':
+        install_fakeredis(app)
+    if kafka == 'memory':
+        install_memory_kafka(app)
+    print(f"benchmark stand-ins: redis={redis}, kafka={kafka}, mariadb={os.getenv('MYSQL_HOST', 'my-mariadb')}")
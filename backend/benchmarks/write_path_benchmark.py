@@ -0,0 +1,112 @@
+"""
+메시지 쓰기 경로 벤치마크 - 동기(sync) 저장과 write-behind(async) 저장 비교
+
+사용법:
+    # 서버를 MESSAGES_WRITE_MODE=sync / async 로 각각 띄운 뒤 실행
+    MYSQL_HOST=... MYSQL_PASSWORD=... python benchmarks/write_path_benchmark.py \
+        --url http://localhost:5000 --username <user> --password <pw> --count 2000 --concurrency 16
+
+요청 응답 지연(p50/p95/p99)과 처리량을 측정하고, async 모드에서는 Idempotency-Key 로
+messages 테이블을 조회하여 요청 시점부터 DB 에 보이기까지의 종단 지연도 측정한다.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+
+import mysql.connector
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from load_test import make_opener, percentile  # noqa: E402
+
+import urllib.request  # noqa: E402
+
+def post_messages(args):
+    keys = {}
+    latencies = []
+    lock = threading.Lock()
+    counter = iter(range(args.count))
+
+    def worker():
+        opener = make_opener(args.url, args.username, args.password)
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            key = uuid.uuid4().hex
+            body = json.dumps({'message': f"write-path benchmark {i}"}).encode('utf-8')
+            req = urllib.request.Request(f"{args.url}/db/message", data=body, method='POST',
+                                         headers={'Content-Type': 'application/json', 'Idempotency-Key': key})
+            start = time.perf_counter()
+            opener.open(req, timeout=30).read()
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                keys[key] = time.time()
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return keys, sorted(latencies), time.monotonic() - started
+
+def wait_persisted(keys, timeout):
+    """async 모드 - 각 키가 DB 에 보이는 시각을 폴링으로 측정"""
+    db = mysql.connector.connect(
+        host=os.getenv('MYSQL_HOST', 'my-mariadb'),
+        user=os.getenv('MYSQL_USER', 'testuser'),
+        password=os.getenv('MYSQL_PASSWORD'),
+        database="testdb"
+    )
+    pending = dict(keys)
+    visible_after = []
+    deadline = time.time() + timeout
+    cursor = db.cursor()
+    while pending and time.time() < deadline:
+        batch = list(pending)[:1000]
+        placeholders = ','.join(['%s'] * len(batch))
+        cursor.execute(f"SELECT idempotency_key FROM messages WHERE idempotency_key IN ({placeholders})", batch)
+        now = time.time()
+        for (key,) in cursor.fetchall():
+            visible_after.append((now - pending.pop(key)) * 1000)
+        time.sleep(0.05)
+    cursor.close()
+    db.close()
+    return sorted(visible_after), len(pending)
+
+def main():
+    parser = argparse.ArgumentParser(description="sync vs write-behind 메시지 저장 벤치마크")
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--persist-timeout', type=float, default=60)
+    args = parser.parse_args()
+
+    keys, latencies, elapsed = post_messages(args)
+    result = {
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'request_p50_ms': round(percentile(latencies, 50), 2),
+        'request_p95_ms': round(percentile(latencies, 95), 2),
+        'request_p99_ms': round(percentile(latencies, 99), 2)
+    }
+    visible, missing = wait_persisted(keys, args.persist_timeout)
+    if visible:
+        result.update({
+            'end_to_end_p50_ms': round(percentile(visible, 50), 2),
+            'end_to_end_p95_ms': round(percentile(visible, 95), 2),
+            'end_to_end_p99_ms': round(percentile(visible, 99), 2)
+        })
+    result['not_persisted'] = missing
+    print(json.dumps(result, indent=2))
+
+if __name__ == '__main__':
+    main()
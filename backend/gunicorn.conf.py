@@ -0,0 +1,71 @@
+"""
+gunicorn 설정 - 운영 서빙 진입점
+
+    gunicorn -c gunicorn.conf.py                     # SERVER_MODE=wsgi (기본, app:app)
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py    # asgi_app:application + uvicorn 워커
+
+모든 값은 환경변수로 조정한다. preload_app 으로 마스터에서 앱과 풀 객체를 한 번
+초기화한 뒤 fork 하고, 각 워커는 post_fork 에서 물려받은 커넥션을 버리고
+post_worker_init 에서 자기 DB 커넥션을 미리 연다.
+"""
+import multiprocessing
+import os
+
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi')
+ASGI = SERVER_MODE == 'asgi'
+
+wsgi_app = os.getenv('GUNICORN_APP', 'asgi_app:application' if ASGI else 'app:app')
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'uvicorn.workers.UvicornWorker' if ASGI else 'gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 0))
+backlog = int(os.getenv('GUNICORN_BACKLOG', 2048))
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') == '1'
+accesslog = os.getenv('GUNICORN_ACCESSLOG') or None
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOGLEVEL', 'info')
+
+DB_POOL_WARM = int(os.getenv('DB_POOL_WARM', 2))
+
+PROMETHEUS_MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+
+def on_starting(server):
+    # 워커별 메트릭 파일 디렉터리를 비우고 시작 (이전 실행의 값이 섞이지 않도록)
+    if PROMETHEUS_MULTIPROC_DIR:
+        import shutil
+        shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+        os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+def child_exit(server, worker):
+    if PROMETHEUS_MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+def post_fork(server, worker):
+    # 부모 프로세스의 소켓을 자식이 같이 쓰지 않도록 정리 (Redis 풀은 pid 검사로 자동 재생성)
+    from app import db_pool, replica_router
+    db_pool.reset_after_fork()
+    if replica_router is not None:
+        replica_router.reset_after_fork()
+
+def post_worker_init(worker):
+    from app import db_pool, replica_router, start_username_bloom_build
+    if DB_POOL_WARM > 0:
+        db_pool.warm(DB_POOL_WARM)
+        if replica_router is not None:
+            replica_router.warm(DB_POOL_WARM)
+    # 사용자명 블룸 필터가 없으면 백그라운드에서 생성 (Redis 락으로 워커 하나만 실행)
+    start_username_bloom_build()
+
+def worker_exit(server, worker):
+    # 종료 전 Kafka/Redis 로그 버퍼 flush, Kafka 조회 컨슈머와 비밀번호 해시 프로세스 풀 정리
+    from app import kafka_log_shipper, kafka_log_reader, redis_log_buffer, password_pool
+    kafka_log_shipper.close(timeout=graceful_timeout)
+    kafka_log_reader.close()
+    redis_log_buffer.close()
+    password_pool.shutdown()
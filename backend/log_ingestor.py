@@ -0,0 +1,109 @@
+"""
+API 로그 적재기 - api-logs 토픽을 MariaDB api_logs 테이블(색인 저장소)로 적재
+
+    python log_ingestor.py
+
+컨슈머 그룹 api-logs-indexer 로 소비하며 DB 커밋이 끝난 뒤에만 Kafka offset 을
+커밋한다. (kafka_partition, kafka_offset) UNIQUE 키와 INSERT IGNORE 로
+재전송된 메시지가 중복 저장되지 않는다. 적재한 로그는 실시간 로그 스트림
+(logs:stream, SSE /logs/stream)에도 추가한다.
+"""
+import os
+import signal
+from datetime import datetime
+
+from app import (
+    get_kafka_consumer, get_db_connection, get_redis_connection,
+    queue_log_stream_events, format_kafka_log
+)
+
+TOPIC = 'api-logs'
+GROUP_ID = 'api-logs-indexer'
+POLL_TIMEOUT_MS = int(os.getenv('LOG_INGEST_POLL_TIMEOUT_MS', 1000))
+MAX_POLL_RECORDS = int(os.getenv('LOG_INGEST_MAX_POLL_RECORDS', 1000))
+
+INSERT_SQL = (
+    "INSERT IGNORE INTO api_logs "
+    "(logged_at, endpoint, method, status, user_id, message, kafka_partition, kafka_offset) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
+)
+
+running = True
+
+def _stop(signum, frame):
+    global running
+    running = False
+
+def to_row(message):
+    """Kafka 메시지를 api_logs 행으로 변환 (연결 테스트 메시지는 제외)"""
+    log_data = message.value
+    if not isinstance(log_data, dict) or log_data.get('test'):
+        return None
+    try:
+        logged_at = datetime.fromisoformat(log_data.get('timestamp', ''))
+    except (TypeError, ValueError):
+        # 타임스탬프가 없거나 잘못된 경우 Kafka 레코드 시각 사용
+        logged_at = datetime.fromtimestamp(message.timestamp / 1000.0)
+    return (
+        logged_at,
+        log_data.get('endpoint'),
+        log_data.get('method'),
+        log_data.get('status'),
+        log_data.get('user_id'),
+        log_data.get('message'),
+        message.partition,
+        message.offset
+    )
+
+def publish_live(logs):
+    """실시간 tail 용 스트림에 추가 - 실패해도 적재에는 영향 없음"""
+    try:
+        redis_client = get_redis_connection()
+        if redis_client:
+            pipe = redis_client.pipeline(transaction=False)
+            queue_log_stream_events(pipe, 'kafka', logs)
+            pipe.execute()
+    except Exception as e:
+        print(f"Log stream publish error: {str(e)}")
+
+def main():
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    consumer = get_kafka_consumer(
+        TOPIC,
+        group_id=GROUP_ID,
+        enable_auto_commit=False,
+        auto_offset_reset='earliest',
+        max_poll_records=MAX_POLL_RECORDS
+    )
+    try:
+        while running:
+            records = consumer.poll(timeout_ms=POLL_TIMEOUT_MS)
+            if not records:
+                continue
+            rows = []
+            logs = []
+            for messages in records.values():
+                for message in messages:
+                    row = to_row(message)
+                    if row is not None:
+                        rows.append(row)
+                        logs.append(format_kafka_log(message.value))
+            if rows:
+                with get_db_connection() as db:
+                    cursor = db.cursor()
+                    cursor.executemany(INSERT_SQL, rows)
+                    db.commit()
+                    cursor.close()
+            # DB 반영 후에만 offset 커밋 (실패 시 재전송되어도 INSERT IGNORE 로 안전)
+            consumer.commit()
+            if logs:
+                publish_live(logs)
+            print(f"Ingested {len(rows)} api logs")
+    finally:
+        consumer.close()
+        print("Log ingestor stopped")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+메시지 write-behind 소비자 - messages-ingest 토픽을 큰 배치 트랜잭션으로 messages 에 저장
+
+    python message_ingest_consumer.py
+
+MESSAGES_WRITE_MODE=async 일 때 POST /db/message 가 발행한 레코드를 저장한다.
+messages.idempotency_key UNIQUE 키와 INSERT IGNORE 로 재전송이나 클라이언트
+재시도가 중복 행을 만들지 않으며, DB 커밋 후에만 Kafka offset 을 커밋한다.
+"""
+import os
+import signal
+from datetime import datetime
+
+from app import (
+    get_kafka_consumer, get_db_connection, bump_messages_version, invalidate_user_feeds, log_to_redis,
+    MESSAGES_INGEST_TOPIC
+)
+
+GROUP_ID = 'messages-ingest-writer'
+POLL_TIMEOUT_MS = int(os.getenv('MESSAGE_INGEST_POLL_TIMEOUT_MS', 500))
+MAX_POLL_RECORDS = int(os.getenv('MESSAGE_INGEST_MAX_POLL_RECORDS', 2000))
+
+INSERT_SQL = (
+    "INSERT IGNORE INTO messages (message, created_at, user_id, idempotency_key) "
+    "VALUES (%s, %s, %s, %s)"
+)
+
+running = True
+
+def _stop(signum, frame):
+    global running
+    running = False
+
+def to_row(record):
+    try:
+        created_at = datetime.fromisoformat(record.get('created_at', ''))
+    except (TypeError, ValueError):
+        created_at = datetime.now()
+    return (record.get('message'), created_at, record.get('user_id'), record.get('idempotency_key'))
+
+def write_batch(rows):
+    """한 트랜잭션으로 저장 - 실제로 추가된 행 수 반환"""
+    with get_db_connection() as db:
+        cursor = db.cursor()
+        cursor.executemany(INSERT_SQL, rows)
+        inserted = cursor.rowcount
+        db.commit()
+        cursor.close()
+    return inserted
+
+def main():
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    consumer = get_kafka_consumer(
+        MESSAGES_INGEST_TOPIC,
+        group_id=GROUP_ID,
+        enable_auto_commit=False,
+        auto_offset_reset='earliest',
+        max_poll_records=MAX_POLL_RECORDS
+    )
+    try:
+        while running:
+            records = consumer.poll(timeout_ms=POLL_TIMEOUT_MS)
+            if not records:
+                continue
+            rows = [to_row(message.value) for messages in records.values() for message in messages
+                    if isinstance(message.value, dict) and message.value.get('message')]
+            inserted = write_batch(rows) if rows else 0
+            consumer.commit()
+            if inserted:
+                # 배치마다 한 번만 검색 캐시/사용자 피드 무효화
+                bump_messages_version()
+                invalidate_user_feeds({row[2] for row in rows if row[2]})
+                log_to_redis('db_insert', f"Write-behind batch saved: {inserted} messages")
+            print(f"Write-behind batch: {len(rows)} records, {inserted} inserted")
+    finally:
+        consumer.close()
+        print("Message ingest consumer stopped")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+비밀번호 해시 백엔드 - argon2 / scrypt / pbkdf2 중 설정된 방식으로 해시하고 검증
+
+해시/검증은 CPU 를 많이 쓰므로 요청 스레드 대신 제한된 프로세스 풀에서 실행한다.
+이 모듈은 spawn 된 풀 프로세스가 app.py 전체를 import 하지 않도록 분리되어 있다.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerificationError, InvalidHashError
+except ImportError:  # argon2-cffi 미설치 시 scrypt 사용
+    PasswordHasher = None
+
+PASSWORD_HASH_SCHEME = os.getenv('PASSWORD_HASH_SCHEME', 'argon2')
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 2))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 19456))  # KiB
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', 1))
+SCRYPT_N = int(os.getenv('SCRYPT_N', 2 ** 15))
+SCRYPT_R = int(os.getenv('SCRYPT_R', 8))
+SCRYPT_P = int(os.getenv('SCRYPT_P', 1))
+PBKDF2_ITERATIONS = int(os.getenv('PBKDF2_ITERATIONS', 600000))
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 32))
+
+if PASSWORD_HASH_SCHEME == 'argon2' and PasswordHasher is None:
+    print("argon2-cffi 가 설치되지 않아 scrypt 로 해시합니다")
+    PASSWORD_HASH_SCHEME = 'scrypt'
+
+_argon2 = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST,
+    parallelism=ARGON2_PARALLELISM
+) if PasswordHasher is not None else None
+
+class PasswordHashBusy(Exception):
+    """해시 풀 대기열이 가득 찬 경우"""
+    pass
+
+def werkzeug_method():
+    if PASSWORD_HASH_SCHEME == 'pbkdf2':
+        return f"pbkdf2:sha256:{PBKDF2_ITERATIONS}"
+    return f"scrypt:{SCRYPT_N}:{SCRYPT_R}:{SCRYPT_P}"
+
+def hash_password(password):
+    if PASSWORD_HASH_SCHEME == 'argon2':
+        return _argon2.hash(password)
+    return generate_password_hash(password, method=werkzeug_method())
+
+def verify_password(stored_hash, password):
+    if stored_hash.startswith('$argon2'):
+        if _argon2 is None:
+            return False
+        try:
+            return _argon2.verify(stored_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    # werkzeug 형식 (기존 pbkdf2 해시 포함)
+    return check_password_hash(stored_hash, password)
+
+def needs_rehash(stored_hash):
+    """저장된 해시가 현재 설정(방식/비용)과 다르면 True"""
+    if PASSWORD_HASH_SCHEME == 'argon2':
+        return not stored_hash.startswith('$argon2') or _argon2.check_needs_rehash(stored_hash)
+    return stored_hash.split('$', 1)[0] != werkzeug_method()
+
+def verify_and_rehash(stored_hash, password):
+    """검증 결과와, 필요하면 현재 설정으로 다시 만든 해시를 함께 반환 (풀 왕복 1회)"""
+    if not verify_password(stored_hash, password):
+        return False, None
+    return True, hash_password(password) if needs_rehash(stored_hash) else None
+
+class PasswordHashPool:
+    """워커 프로세스별 제한된 해시 프로세스 풀 - 대기 작업이 max_pending 을 넘으면 바로 거절"""
+    def __init__(self, workers, max_pending):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._pid = None
+        self.rejected = 0
+
+    def _get_executor(self):
+        # fork 된 gunicorn 워커는 부모의 풀을 쓸 수 없으므로 pid 가 바뀌면 새로 생성
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashBusy("비밀번호 해시 대기열이 가득 찼습니다")
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+password_pool = PasswordHashPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
@@ -0,0 +1,89 @@
+"""
+JSON 직렬화 계층 - 검색 캐시, Redis 로그, Kafka 메시지, HTTP 응답이 같은 구현을 사용
+
+orjson 이 설치되어 있으면 orjson, 없으면 표준 json 을 사용한다 (JSON_BACKEND 로 강제 가능).
+datetime 은 두 구현 모두 ISO 8601 문자열로 변환한다.
+
+검색 캐시 값은 encode_cache_value 로 한 글자 태그 + 본문 바이트로 저장한다.
+    j: JSON, m: msgpack, 대문자(J/M)는 zlib 압축본
+태그가 없는 값('{' 로 시작)은 예전 형식의 JSON 으로 읽는다.
+"""
+import json
+import os
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_BACKEND = os.getenv('JSON_BACKEND', 'orjson' if orjson else 'json')
+if JSON_BACKEND == 'orjson' and orjson is None:
+    print("orjson 이 설치되지 않아 표준 json 을 사용합니다")
+    JSON_BACKEND = 'json'
+
+CACHE_CODEC = os.getenv('CACHE_CODEC', 'json')  # json | msgpack
+if CACHE_CODEC == 'msgpack' and msgpack is None:
+    print("msgpack 이 설치되지 않아 캐시를 JSON 으로 저장합니다")
+    CACHE_CODEC = 'json'
+CACHE_COMPRESS_MIN_BYTES = int(os.getenv('CACHE_COMPRESS_MIN_BYTES', 4096))  # 0 이면 압축 안 함
+CACHE_COMPRESS_LEVEL = int(os.getenv('CACHE_COMPRESS_LEVEL', 1))
+
+def json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', 'replace')
+    return str(value)
+
+if JSON_BACKEND == 'orjson':
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj):
+        return orjson.dumps(obj, default=json_default, option=_ORJSON_OPTIONS)
+
+    def dumps(obj):
+        return orjson.dumps(obj, default=json_default, option=_ORJSON_OPTIONS).decode('utf-8')
+
+    def loads(data):
+        return orjson.loads(data)
+else:
+    def dumps(obj):
+        return json.dumps(obj, default=json_default, ensure_ascii=False, separators=(',', ':'))
+
+    def dumps_bytes(obj):
+        return dumps(obj).encode('utf-8')
+
+    def loads(data):
+        return json.loads(data)
+
+def encode_cache_value(obj):
+    """캐시 저장용 바이트 - 설정된 코덱으로 인코딩하고 임계값 이상이면 zlib 압축"""
+    if CACHE_CODEC == 'msgpack':
+        tag, body = b'm', msgpack.packb(obj, default=json_default, use_bin_type=True)
+    else:
+        tag, body = b'j', dumps_bytes(obj)
+    if CACHE_COMPRESS_MIN_BYTES and len(body) >= CACHE_COMPRESS_MIN_BYTES:
+        tag, body = tag.upper(), zlib.compress(body, CACHE_COMPRESS_LEVEL)
+    return tag + body
+
+def decode_cache_value(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    tag, body = data[:1], data[1:]
+    if tag == b'{':
+        return loads(data)
+    if tag in (b'J', b'M'):
+        body = zlib.decompress(body)
+    if tag.lower() == b'm':
+        return msgpack.unpackb(body, raw=False)
+    return loads(body)
@@ -0,0 +1,171 @@
+"""
+API 통계 집계기 - api-logs 토픽을 증분 소비하여 Redis 롤업 해시를 갱신
+
+    python stats_aggregator.py
+
+컨슈머 그룹을 쓰지 않고 파티션을 직접 할당하며, 파티션별 다음 offset 을
+카운터 증가와 같은 Redis 트랜잭션(MULTI/EXEC)에 저장한다. 재시작 시 저장된
+offset 부터 이어서 읽으므로 중복 집계 없이 정확히 한 번 반영된다.
+
+배포 중 이전 파드가 잠시 겹쳐 실행되더라도 offset 해시를 WATCH 하고 저장된 offset 이
+배치의 시작 위치를 넘지 않을 때만 반영하므로, 늦은 인스턴스의 배치는 거절되고 다시 할당한다.
+(보존 기간으로 세그먼트가 지워져 시작 위치가 저장된 offset 보다 앞선 경우는 정상 반영)
+"""
+import os
+import signal
+import time
+from collections import Counter
+
+from kafka import TopicPartition
+from redis.exceptions import WatchError
+
+from serialization import dumps
+from app import (
+    get_kafka_consumer, redis_client_shared,
+    STATS_SUMMARY_KEY, STATS_ENDPOINTS_KEY, STATS_STATUS_KEY, STATS_USERS_KEY,
+    STATS_RECENT_ERRORS_KEY, STATS_HOURLY_KEY_PREFIX, STATS_OFFSETS_KEY
+)
+
+TOPIC = 'api-logs'
+POLL_TIMEOUT_MS = int(os.getenv('STATS_POLL_TIMEOUT_MS', 1000))
+MAX_POLL_RECORDS = int(os.getenv('STATS_MAX_POLL_RECORDS', 1000))
+PARTITION_REFRESH_S = 60
+HOURLY_TTL_S = 8 * 24 * 3600
+RECENT_ERRORS_LIMIT = 10
+
+running = True
+
+class StaleOffsetsError(Exception):
+    """저장된 offset 이 배치 시작 위치보다 앞섬 - 다른 인스턴스가 이미 반영한 구간"""
+    pass
+
+def _stop(signum, frame):
+    global running
+    running = False
+
+def assign_partitions(consumer):
+    """토픽의 모든 파티션을 할당하고 Redis 에 저장된 offset 으로 이동"""
+    partitions = consumer.partitions_for_topic(TOPIC) or set()
+    assigned = [TopicPartition(TOPIC, p) for p in sorted(partitions)]
+    consumer.assign(assigned)
+    stored = redis_client_shared.hgetall(STATS_OFFSETS_KEY)
+    for tp in assigned:
+        offset = stored.get(str(tp.partition))
+        if offset is not None:
+            consumer.seek(tp, int(offset))
+        else:
+            consumer.seek_to_beginning(tp)
+    print(f"Stats aggregator assigned partitions: {[tp.partition for tp in assigned]}")
+    return set(partitions)
+
+def aggregate(records):
+    """poll 결과를 카운터로 합산 - (카운터 묶음, 파티션별 다음 offset, 파티션별 시작 offset)"""
+    totals = Counter()
+    endpoints = Counter()
+    statuses = Counter()
+    users = Counter()
+    hourly = Counter()
+    errors = []
+    offsets = {}
+    start_offsets = {}
+    for tp, messages in records.items():
+        if messages:
+            start_offsets[tp.partition] = messages[0].offset
+        for message in messages:
+            offsets[tp.partition] = message.offset + 1
+            log_data = message.value
+            if not isinstance(log_data, dict) or log_data.get('test'):
+                # 연결 테스트 메시지는 집계하지 않음
+                continue
+            totals['total_calls'] += 1
+            endpoint = str(log_data.get('endpoint') or 'unknown')
+            status = str(log_data.get('status') or 'unknown')
+            endpoints[endpoint] += 1
+            statuses[status] += 1
+            users[str(log_data.get('user_id') or 'anonymous')] += 1
+            timestamp = log_data.get('timestamp') or ''
+            if len(timestamp) >= 13:
+                hourly[(timestamp[:10], timestamp[11:13])] += 1
+            if status == 'error':
+                errors.append({
+                    'timestamp': log_data.get('timestamp'),
+                    'endpoint': endpoint,
+                    'message': log_data.get('message')
+                })
+    return (totals, endpoints, statuses, users, hourly, errors), offsets, start_offsets
+
+def apply(counters, offsets, start_offsets=None):
+    """카운터 증가와 offset 저장을 하나의 트랜잭션으로 반영
+
+    start_offsets 가 있으면 offset 해시를 WATCH 하여 저장된 offset 이 없거나 배치 시작 위치 이하일
+    때만 반영한다. 더 크면 StaleOffsetsError, 확인 후 EXEC 전에 바뀌면 WatchError.
+    """
+    totals, endpoints, statuses, users, hourly, errors = counters
+    with redis_client_shared.pipeline(transaction=True) as pipe:
+        if start_offsets:
+            pipe.watch(STATS_OFFSETS_KEY)
+            partitions = list(start_offsets)
+            stored = pipe.hmget(STATS_OFFSETS_KEY, [str(p) for p in partitions])
+            for partition, value in zip(partitions, stored):
+                if value is not None and int(value) > start_offsets[partition]:
+                    raise StaleOffsetsError(
+                        f"partition {partition}: stored offset {value}, batch starts at {start_offsets[partition]}")
+            pipe.multi()
+        for field, count in totals.items():
+            pipe.hincrby(STATS_SUMMARY_KEY, field, count)
+        for endpoint, count in endpoints.items():
+            pipe.hincrby(STATS_ENDPOINTS_KEY, endpoint, count)
+        for status, count in statuses.items():
+            pipe.hincrby(STATS_STATUS_KEY, status, count)
+        for user, count in users.items():
+            pipe.hincrby(STATS_USERS_KEY, user, count)
+        for (day, hour), count in hourly.items():
+            pipe.hincrby(STATS_HOURLY_KEY_PREFIX + day, hour, count)
+            pipe.expire(STATS_HOURLY_KEY_PREFIX + day, HOURLY_TTL_S)
+        if errors:
+            pipe.lpush(STATS_RECENT_ERRORS_KEY, *[dumps(e) for e in errors[-RECENT_ERRORS_LIMIT:]])
+            pipe.ltrim(STATS_RECENT_ERRORS_KEY, 0, RECENT_ERRORS_LIMIT - 1)
+        pipe.hset(STATS_OFFSETS_KEY, mapping={str(p): o for p, o in offsets.items()})
+        pipe.execute()
+
+def main():
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    consumer = get_kafka_consumer(
+        group_id=None,
+        enable_auto_commit=False,
+        max_poll_records=MAX_POLL_RECORDS
+    )
+    try:
+        partitions = assign_partitions(consumer)
+        last_refresh = time.monotonic()
+        while running:
+            records = consumer.poll(timeout_ms=POLL_TIMEOUT_MS)
+            if records:
+                counters, offsets, start_offsets = aggregate(records)
+                try:
+                    apply(counters, offsets, start_offsets)
+                except (StaleOffsetsError, WatchError) as e:
+                    # 다른 인스턴스가 먼저 반영한 구간 - 배치를 버리고 저장된 offset 부터 다시 읽음
+                    print(f"Stats aggregator batch rejected: {str(e)}")
+                    partitions = assign_partitions(consumer)
+                    continue
+                except Exception as e:
+                    # 반영 실패 시 저장된 offset 으로 되돌아가 다시 집계
+                    print(f"Stats aggregator Redis error: {str(e)}")
+                    time.sleep(1)
+                    partitions = assign_partitions(consumer)
+                    continue
+            if time.monotonic() - last_refresh > PARTITION_REFRESH_S:
+                # 파티션이 늘어난 경우 다시 할당
+                last_refresh = time.monotonic()
+                current = consumer.partitions_for_topic(TOPIC) or set()
+                if current != partitions:
+                    partitions = assign_partitions(consumer)
+    finally:
+        consumer.close()
+        print("Stats aggregator stopped")
+
+if __name__ == '__main__':
+    main()
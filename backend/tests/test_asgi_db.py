@@ -0,0 +1,148 @@
+"""
+ASGI 모드 DB 접근 테스트 - 복제본 라우팅(지연/최근 쓰기 시 primary)과 스트리밍 커넥션 반환 확인
+
+    cd backend && python -m pytest -q tests
+"""
+import asyncio
+import gc
+import os
+import sys
+import time
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault('PASSWORD_HASH_WORKERS', '0')
+
+import app as wsgi  # noqa: E402
+import asgi_app  # noqa: E402
+
+class FakeCursor:
+    """aiomysql 커서 대체 - conn.cursor() 를 await 하거나 async with 로 쓸 수 있음"""
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    def __await__(self):
+        yield from ()
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def execute(self, sql, params=()):
+        if sql == "SHOW SLAVE STATUS":
+            self.rows = [self.conn.pool.slave_status] if self.conn.pool.slave_status else []
+        else:
+            self.rows = [dict(row, source=self.conn.pool.name) for row in self.conn.pool.rows]
+
+    async def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    async def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    async def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    async def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+        self.closed = False
+
+    def cursor(self, cursor_class):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+class FakePool:
+    """aiomysql.Pool 대체 - 풀 밖에 있는 커넥션 수만 센다"""
+    def __init__(self, name, rows=(), slave_status=None):
+        self.name = name
+        self.rows = list(rows)
+        self.slave_status = slave_status
+        self.in_use = 0
+
+    async def acquire(self):
+        self.in_use += 1
+        return FakeConnection(self)
+
+    def release(self, conn):
+        self.in_use -= 1
+
+ROWS = [{'id': i} for i in range(3)]
+
+@pytest.fixture
+def primary(monkeypatch):
+    pool = FakePool('primary', ROWS)
+    monkeypatch.setattr(asgi_app, 'db_pool', pool)
+    monkeypatch.setattr(asgi_app, 'replica_router', None)
+    return pool
+
+def install_replica(monkeypatch, lag):
+    pool = FakePool('replica', ROWS, slave_status={'Seconds_Behind_Master': lag})
+    router = asgi_app.AsyncReplicaRouter([wsgi.Replica('replica-0', pool)], timeout=1)
+    monkeypatch.setattr(asgi_app, 'replica_router', router)
+    return pool
+
+async def read_source(read_only=True):
+    async with asgi_app.db_connection(read_only=read_only) as conn:
+        return conn.pool.name
+
+def test_reads_use_healthy_replica_and_writes_use_primary(primary, monkeypatch):
+    replica = install_replica(monkeypatch, lag=0)
+    assert asyncio.run(read_source()) == 'replica'
+    assert asyncio.run(read_source(read_only=False)) == 'primary'
+    assert asgi_app.replica_router.replica_reads == 1
+    assert replica.in_use == 0 and primary.in_use == 0
+
+def test_lagging_replica_falls_back_to_primary(primary, monkeypatch):
+    replica = install_replica(monkeypatch, lag=wsgi.REPLICA_MAX_LAG_S + 1)
+    assert asyncio.run(read_source()) == 'primary'
+    assert asgi_app.replica_router.fallbacks == 1
+    assert replica.in_use == 0 and primary.in_use == 0
+
+def test_recent_write_reads_from_primary(primary, monkeypatch):
+    install_replica(monkeypatch, lag=0)
+
+    async def run():
+        async with asgi_app.quart_app.test_request_context('/db/messages'):
+            asgi_app.session['primary_until'] = time.time() + wsgi.READ_YOUR_WRITES_S
+            rows = asgi_app.iter_query_rows('SELECT', ())
+            fetched = await asgi_app.db_fetchall('SELECT', (), read_only=True)
+        # 스트리밍 본문은 요청 컨텍스트가 끝난 뒤 읽힘
+        return [row async for row in rows], fetched
+
+    streamed, fetched = asyncio.run(run())
+    assert {row['source'] for row in streamed + fetched} == {'primary'}
+
+def test_unsent_stream_holds_no_connection(primary):
+    async def run():
+        response = asgi_app.stream_page_response(asgi_app.iter_query_rows('SELECT', ()), 2, 'ndjson')
+        # 헤더를 보내기 전에 클라이언트가 끊긴 경우 - 본문은 한 번도 읽히지 않음
+        del response
+        gc.collect()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert primary.in_use == 0
+
+def test_stream_releases_connection_after_last_row(primary):
+    async def run():
+        response = asgi_app.stream_page_response(asgi_app.iter_query_rows('SELECT', ()), 2, 'ndjson')
+        return await response.get_data(as_text=True)
+
+    body = asyncio.run(run())
+    assert body.count('\n') == 2
+    assert primary.in_use == 0
@@ -0,0 +1,69 @@
+"""
+Redis 서킷 브레이커 테스트 - half-open 시험 기회가 결과 없이 사라지지 않는지 확인
+
+    cd backend && python -m pytest -q tests
+"""
+import os
+import sys
+import time
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault('PASSWORD_HASH_WORKERS', '0')
+
+import app as backend  # noqa: E402
+
+COOLDOWN = 0.05
+
+def trip(breaker):
+    for _ in range(breaker.threshold):
+        breaker.record_failure()
+    assert breaker.state == 'open'
+
+def test_trial_granted_without_command_is_granted_again():
+    breaker = backend.CircuitBreaker(threshold=2, cooldown=COOLDOWN)
+    trip(breaker)
+    time.sleep(COOLDOWN)
+
+    # 클라이언트만 받고 명령은 보내지 않음 - 성공/실패가 기록되지 않음
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+
+    time.sleep(COOLDOWN)
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow() is True
+
+def test_failed_trial_reopens():
+    breaker = backend.CircuitBreaker(threshold=2, cooldown=COOLDOWN)
+    trip(breaker)
+    time.sleep(COOLDOWN)
+    assert breaker.allow() is True
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert breaker.allow() is False
+
+@pytest.fixture
+def shared_breaker(monkeypatch):
+    breaker = backend.CircuitBreaker(threshold=1, cooldown=COOLDOWN)
+    monkeypatch.setattr(backend, 'redis_breaker', breaker)
+    return breaker
+
+def test_request_without_redis_command_does_not_wedge_breaker(shared_breaker):
+    trip(shared_breaker)
+    time.sleep(COOLDOWN)
+    backend.app.test_client().get('/no-such-route')
+
+    time.sleep(COOLDOWN)
+    assert shared_breaker.allow() is True
+
+def test_anonymous_request_leaves_trial_for_a_real_command(shared_breaker):
+    trip(shared_breaker)
+    time.sleep(COOLDOWN)
+    # 세션 변경이 없는 요청은 Redis 클라이언트를 가져가지 않음
+    backend.app.test_client().get('/no-such-route')
+    assert shared_breaker.allow() is True
@@ -0,0 +1,154 @@
+"""
+회원가입 동시성 테스트 - 같은 사용자명으로 동시에 가입하면 정확히 한 번만 성공
+
+    cd backend && python -m pytest -q tests
+
+Redis/Kafka 는 benchmarks/standins.py 의 fakeredis·메모리 Kafka 를 쓰고, MariaDB 는
+users.username UNIQUE 인덱스만 흉내 내는 메모리 테이블(UsersTable)로 대체한다.
+"""
+import os
+import sys
+import threading
+import time
+
+import mysql.connector
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'benchmarks'))
+
+# 해시를 요청 스레드에서 바로 실행 (프로세스 풀 없이)
+os.environ.setdefault('PASSWORD_HASH_WORKERS', '0')
+
+import standins  # noqa: E402
+import app as backend  # noqa: E402
+
+class UsersTable:
+    """users 테이블 대체 - username UNIQUE 위반은 MariaDB 와 같은 ER_DUP_ENTRY(1062) 로 알림
+
+    쿼리를 직렬화하는 잠금은 없다. 유일성은 인덱스처럼 삽입 한 번(dict.setdefault)에서만 보장하고,
+    쿼리마다 QUERY_LATENCY_S 만큼 쉬어 조회 후 삽입(check-then-insert) 사이에 다른 요청이 끼어들게 한다.
+    """
+    QUERY_LATENCY_S = 0.005
+
+    def __init__(self):
+        self.rows = {}
+        self.queries = []
+
+    def connect(self, read_only=False):
+        return FakeConnection(self)
+
+class FakeConnection:
+    def __init__(self, table):
+        self.table = table
+
+    def cursor(self, dictionary=False, buffered=None):
+        return FakeCursor(self.table, dictionary)
+
+    def commit(self):
+        pass
+
+    def close(self, discard=False):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+class FakeCursor:
+    def __init__(self, table, dictionary):
+        self.table = table
+        self.dictionary = dictionary
+        self.result = []
+
+    def execute(self, sql, params=()):
+        self.table.queries.append(sql)
+        time.sleep(self.table.QUERY_LATENCY_S)
+        if sql.startswith("INSERT INTO users"):
+            username, password = params
+            row = [password]
+            if self.table.rows.setdefault(username, row) is not row:
+                raise mysql.connector.IntegrityError(
+                    msg=f"Duplicate entry '{username}' for key 'username'", errno=1062)
+        elif sql.startswith("SELECT 1 FROM users WHERE username"):
+            self.result = [(1,)] if params[0] in self.table.rows else []
+        elif sql.startswith("SELECT username FROM users"):
+            names = list(self.table.rows)
+            self.result = [{'username': n} if self.dictionary else (n,) for n in names]
+        else:
+            raise AssertionError(f"unexpected query: {sql}")
+
+    def fetchone(self):
+        return self.result.pop(0) if self.result else None
+
+    def fetchmany(self, size):
+        rows, self.result = self.result[:size], self.result[size:]
+        return rows
+
+    def close(self):
+        pass
+
+@pytest.fixture(scope='module', autouse=True)
+def standin_services():
+    standins.install(backend, redis='fakeredis', kafka='memory')
+    yield
+    backend.redis_log_buffer.close()
+    backend.kafka_log_shipper.close()
+
+@pytest.fixture
+def users(monkeypatch):
+    table = UsersTable()
+    monkeypatch.setattr(backend, 'get_db_connection', table.connect)
+    backend.redis_client_shared.flushall()
+    monkeypatch.setattr(backend, '_username_bloom_next_attempt', 0.0)
+    return table
+
+def test_parallel_registrations_same_username(users, monkeypatch):
+    # 해시 시간(~150ms) 차이로 요청이 흩어지지 않도록 가벼운 해시로 바꿔 동시에 DB 에 도달시킴
+    monkeypatch.setattr(backend, 'hash_password', lambda password: f"hashed:{password}")
+    attempts = 16
+    barrier = threading.Barrier(attempts)
+    results = []
+
+    def register():
+        client = backend.app.test_client()
+        barrier.wait()
+        response = client.post('/register', json={'username': 'racer', 'password': 'pw-1234'})
+        results.append((response.status_code, response.get_json()))
+
+    threads = [threading.Thread(target=register) for _ in range(attempts)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    statuses = [status for status, _ in results]
+    assert statuses.count(200) == 1
+    assert statuses.count(400) == attempts - 1
+    assert all(body['message'] == "이미 존재하는 사용자명입니다" for status, body in results if status == 400)
+    assert list(users.rows) == ['racer']
+
+def test_check_username_falls_back_to_db_until_bloom_is_ready(users):
+    users.rows['alice'] = ['hash']
+    client = backend.app.test_client()
+
+    # 필터가 없으면 인덱스 조회로 응답하고 생성은 백그라운드에서
+    response = client.get('/register/check?username=bob')
+    assert response.get_json()['source'] == 'db'
+    assert response.get_json()['available'] is True
+
+    deadline = time.monotonic() + 5
+    while not backend.redis_client_shared.exists(backend.USERNAME_BLOOM_READY_KEY):
+        assert time.monotonic() < deadline, "bloom filter was not built"
+        time.sleep(0.05)
+
+    users.queries.clear()
+    response = client.get('/register/check?username=bob')
+    assert response.get_json() == {"status": "success", "username": "bob", "available": True, "source": "bloom"}
+    assert users.queries == []
+
+    response = client.get('/register/check?username=alice')
+    assert response.get_json()['available'] is False
@@ -0,0 +1,60 @@
+"""
+통계 집계기 offset 확인 테스트 - 이미 반영된 구간만 거절하고 보존 기간으로 생긴 빈 구간은 반영
+
+    cd backend && python -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+from kafka import TopicPartition
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'benchmarks'))
+
+os.environ.setdefault('PASSWORD_HASH_WORKERS', '0')
+
+import standins  # noqa: E402
+import app as backend  # noqa: E402
+import stats_aggregator  # noqa: E402
+from standins import Record  # noqa: E402
+
+TP = TopicPartition(stats_aggregator.TOPIC, 0)
+
+@pytest.fixture(scope='module', autouse=True)
+def standin_services():
+    standins.install(backend, redis='fakeredis', kafka='memory')
+
+@pytest.fixture(autouse=True)
+def clean_redis():
+    backend.redis_client_shared.flushall()
+
+def batch(start, end):
+    log = {'endpoint': '/db/messages', 'status': 'success', 'timestamp': '2026-01-01T10:00:00'}
+    return {TP: [Record(TP.topic, TP.partition, offset, 0, None, log) for offset in range(start, end)]}
+
+def apply_batch(start, end):
+    stats_aggregator.apply(*stats_aggregator.aggregate(batch(start, end)))
+
+def stored_state():
+    client = backend.redis_client_shared
+    return client.hget(stats_aggregator.STATS_OFFSETS_KEY, '0'), client.hget(stats_aggregator.STATS_SUMMARY_KEY, 'total_calls')
+
+def test_consecutive_batches_are_applied():
+    apply_batch(0, 10)
+    apply_batch(10, 20)
+    assert stored_state() == ('20', '20')
+
+def test_batch_after_retention_gap_is_applied():
+    apply_batch(0, 10)
+    # 집계기가 멈춘 동안 10~99 가 보존 기간으로 삭제되어 100 부터 읽음
+    apply_batch(100, 110)
+    assert stored_state() == ('110', '20')
+
+def test_already_applied_batch_is_rejected():
+    apply_batch(0, 10)
+    apply_batch(10, 20)
+    with pytest.raises(stats_aggregator.StaleOffsetsError):
+        apply_batch(5, 15)
+    assert stored_state() == ('20', '20')
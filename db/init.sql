@@ -3,6 +3,7 @@ USE testdb;
 
 DROP TABLE IF EXISTS messages;
 DROP TABLE IF EXISTS users;
+DROP TABLE IF EXISTS api_logs;
 
 
 CREATE TABLE users (
@@ -15,6 +16,29 @@ CREATE TABLE users (
 CREATE TABLE messages (
     id INT AUTO_INCREMENT PRIMARY KEY,
     message TEXT,
-    created_at DATETIME,
-    user_id VARCHAR(255)
-);
\ No newline at end of file
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    user_id VARCHAR(255),
+    idempotency_key VARCHAR(64) NULL,
+    UNIQUE KEY uq_messages_idempotency (idempotency_key),
+    INDEX idx_messages_created_id (created_at, id),
+    INDEX idx_messages_user_created_id (user_id, created_at, id),
+    FULLTEXT INDEX ft_messages_message (message)
+);
+
+CREATE TABLE api_logs (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    logged_at DATETIME(6) NOT NULL,
+    endpoint VARCHAR(255),
+    method VARCHAR(16),
+    status VARCHAR(32),
+    user_id VARCHAR(255),
+    message TEXT,
+    kafka_partition INT NOT NULL,
+    kafka_offset BIGINT NOT NULL,
+    UNIQUE KEY uq_api_logs_offset (kafka_partition, kafka_offset),
+    INDEX idx_api_logs_time (logged_at),
+    INDEX idx_api_logs_endpoint_time (endpoint, logged_at),
+    INDEX idx_api_logs_status_time (status, logged_at),
+    INDEX idx_api_logs_user_time (user_id, logged_at),
+    FULLTEXT INDEX ft_api_logs_text (endpoint, user_id, message)
+);
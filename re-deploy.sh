@@ -2,4 +2,7 @@ kubectl delete -f k8s/
 kubectl apply -f k8s/db-init-job.yaml
 kubectl apply -f k8s/backend-secret.yaml
 kubectl apply -f k8s/backend-deployment.yaml
+kubectl apply -f k8s/stats-aggregator-deployment.yaml
+kubectl apply -f k8s/log-ingestor-deployment.yaml
+kubectl apply -f k8s/message-ingest-consumer-deployment.yaml
 kubectl apply -f k8s/frontend-deployment.yaml
\ No newline at end of file